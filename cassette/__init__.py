@@ -0,0 +1,3 @@
+from cassette.core import Cassette, CassetteMiss, get_cassette, RECORD, REPLAY, OFF
+from cassette.llm import CassetteAnthropic, CassetteOpenAI, cassette_anthropic, cassette_openai
+from cassette.http import CassetteSession, cassette_session, post
@@ -0,0 +1,142 @@
+# ==========================================
+# 外部呼び出しの記録と再生（カセット）
+# ==========================================
+# app.py は Anthropic・OpenAI・Google Sheets・LINE のどれも本物の鍵（st.secrets）が無いと動かず、
+# 診断 → ポータル → レーダー → 戦略会議の流れを手元や CI で計測できなかった。
+# ここでは各クライアントの外側に1枚はさみ、
+#   record … 本物を呼び、リクエストのキー・応答・所要時間（ストリームは届いた時刻ごと）をファイルへ追記する
+#   replay … 本物は呼ばず（鍵も不要）、記録した応答を記録した時間どおりに返す
+# ようにする。再生時の待ち時間は倍率と固定の上乗せで調整できる（0 倍で待たない）。
+#
+#   TAKE_PLAN_CASSETTE=cassettes/portal_flow.jsonl TAKE_PLAN_CASSETTE_MODE=record streamlit run app.py
+#   TAKE_PLAN_CASSETTE=cassettes/portal_flow.jsonl TAKE_PLAN_CASSETTE_LATENCY=0.5 streamlit run app.py
+#
+# 再生では同じキー（llm.response_cache.cache_key と同じ正規化 / HTTP はメソッド・URL・本文）の記録を記録順に使う。
+# 日時や乱数が入ってキーが変わった呼び出しは、同じ宛先（モデル・URL のパス）の未使用の記録を順に使う。
+# TAKE_PLAN_CASSETTE_STRICT=1 なら代わりに CassetteMiss にする。
+# ※再生の計測では応答キャッシュに当たらないよう TAKE_PLAN_LLM_CACHE_MAX_MB=0 にしておくこと。
+import collections
+import json
+import os
+import threading
+import time
+
+RECORD = "record"
+REPLAY = "replay"
+OFF = "off"
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+class Cassette:
+    def __init__(self, path=None, mode=OFF, latency_scale=1.0, latency_ms=0.0, strict=False):
+        self.path = path
+        self.mode = mode if path else OFF
+        self.latency_scale = latency_scale
+        self.latency_ms = latency_ms
+        self.strict = strict
+        self.meta = {}
+        self.stats = {"recorded": 0, "replayed": 0, "loose": 0, "missed": 0}
+        self._lock = threading.Lock()
+        self._by_key = collections.defaultdict(collections.deque)
+        self._by_route = collections.defaultdict(collections.deque)
+        if self.mode == REPLAY:
+            self._load()
+        elif self.mode == RECORD and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    @property
+    def recording(self):
+        return self.mode == RECORD
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "meta" in entry:
+                    self.meta.update(entry["meta"])
+                    continue
+                entry["used"] = False
+                self._by_key[(entry["kind"], entry["key"])].append(entry)
+                self._by_route[(entry["kind"], entry["route"])].append(entry)
+
+    def _append(self, entry):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def set_meta(self, name, value):
+        # 再生時に必要な設定（スプレッドシートの URL など）を記録しておく
+        if self.recording and self.meta.get(name) != value:
+            self.meta[name] = value
+            self._append({"meta": {name: value}})
+
+    def record(self, kind, key, route, elapsed, **data):
+        self._append({"kind": kind, "key": key, "route": route, "elapsed": round(elapsed, 4), **data})
+        with self._lock:
+            self.stats["recorded"] += 1
+
+    def _next_unused(self, queue):
+        while queue and queue[0]["used"]:
+            queue.popleft()
+        return queue.popleft() if queue else None
+
+    def take(self, kind, key, route):
+        with self._lock:
+            entry = self._next_unused(self._by_key[(kind, key)])
+            if entry is None and not self.strict:
+                entry = self._next_unused(self._by_route[(kind, route)])
+                if entry is not None:
+                    self.stats["loose"] += 1
+            if entry is None:
+                self.stats["missed"] += 1
+                raise CassetteMiss(f"{self.path} に {kind} {route} の記録がありません")
+            entry["used"] = True
+            self.stats["replayed"] += 1
+            return entry
+
+    def delay(self, seconds):
+        # 記録した所要時間を、倍率と固定の上乗せで調整した秒数
+        return max(0.0, seconds * self.latency_scale) + self.latency_ms / 1000
+
+    def wait(self, seconds):
+        delay = self.delay(seconds)
+        if delay > 0:
+            time.sleep(delay)
+
+    def wait_until(self, start, offset):
+        # start（time.monotonic）から、記録上 offset 秒後に当たる時刻まで待つ
+        remaining = start + self.delay(offset) - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    # 設定は環境変数 → secrets の順（storage の設定と同じ読み方）。TAKE_PLAN_CASSETTE が無ければ何もしない
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                from storage.backend import _setting
+                _cassette = Cassette(
+                    _setting("TAKE_PLAN_CASSETTE", "cassette", None),
+                    mode=_setting("TAKE_PLAN_CASSETTE_MODE", "cassette_mode", REPLAY),
+                    latency_scale=float(_setting("TAKE_PLAN_CASSETTE_LATENCY", "cassette_latency", 1.0)),
+                    latency_ms=float(_setting("TAKE_PLAN_CASSETTE_LATENCY_MS", "cassette_latency_ms", 0)),
+                    strict=str(_setting("TAKE_PLAN_CASSETTE_STRICT", "cassette_strict", "")).lower() in ("1", "true", "yes"),
+                )
+                if _cassette.mode != OFF:
+                    print(f"[Cassette] {_cassette.mode}: {_cassette.path}")
+    return _cassette
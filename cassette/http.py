@@ -0,0 +1,93 @@
+# ==========================================
+# カセット：HTTP（Google Sheets の gspread セッション・LINE の push）
+# ==========================================
+# gspread は session.get / post / put … を呼び、requests.Session ではそれが全て request() を通るので、
+# request() だけを差し替える。再生時は本物のセッション（認証情報）を作らない（inner=None）。
+import hashlib
+import json
+import time
+
+import requests
+
+from cassette.core import OFF, get_cassette
+
+# 応答から残すヘッダー（gspread・呼び出し側が見るものだけ）
+KEEP_HEADERS = ("Content-Type", "Retry-After")
+
+
+def _body_text(kwargs):
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], ensure_ascii=False, sort_keys=True)
+    data = kwargs.get("data")
+    if isinstance(data, bytes):
+        return data.decode("utf-8", "replace")
+    return "" if data is None else str(data)
+
+
+def request_key(method, url, kwargs):
+    params = kwargs.get("params") or {}
+    if not isinstance(params, dict):
+        params = dict(params)
+    raw = json.dumps([method.upper(), url, sorted((str(k), str(v)) for k, v in params.items()), _body_text(kwargs)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _route(method, url):
+    return f"{method.upper()} {url.split('?', 1)[0]}"
+
+
+def _build_response(entry, url):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = entry["body"].encode("utf-8")
+    response.headers.update(entry.get("headers") or {})
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+class CassetteSession(requests.Session):
+    def __init__(self, inner, cassette):
+        super().__init__()
+        self._inner = inner
+        self._cassette = cassette
+
+    def request(self, method, url, *args, **kwargs):
+        key = request_key(method, url, kwargs)
+        route = _route(method, url)
+        if self._cassette.replaying:
+            entry = self._cassette.take("http", key, route)
+            self._cassette.wait(entry["elapsed"])
+            return _build_response(entry, url)
+        start = time.monotonic()
+        response = self._inner.request(method, url, *args, **kwargs)
+        self._cassette.record(
+            "http", key, route, time.monotonic() - start,
+            status=response.status_code,
+            headers={h: response.headers[h] for h in KEEP_HEADERS if h in response.headers},
+            body=response.text,
+        )
+        return response
+
+    def close(self):
+        if self._inner is not None:
+            self._inner.close()
+        super().close()
+
+
+def cassette_session(session, cassette):
+    return session if cassette.mode == OFF else CassetteSession(session, cassette)
+
+
+_post_session = None
+
+
+def post(url, **kwargs):
+    # requests.post の代わり（LINE の push など、単発の HTTP 呼び出し用）
+    global _post_session
+    cassette = get_cassette()
+    if cassette.mode == OFF:
+        return requests.post(url, **kwargs)
+    if _post_session is None:
+        _post_session = CassetteSession(None if cassette.replaying else requests.Session(), cassette)
+    return _post_session.post(url, **kwargs)
@@ -0,0 +1,177 @@
+# ==========================================
+# カセット：Anthropic / OpenAI クライアント
+# ==========================================
+# llm.gateway が作る本物のクライアントの内側（応答キャッシュより API 寄り）にはさむ。
+# 再生時は本物のクライアントを作らない（inner=None）ので、API キーが無くても動く。
+import time
+from types import SimpleNamespace
+
+from cassette.core import OFF
+from llm.response_cache import cache_key
+
+
+class _Proxy:
+    def __init__(self, inner):
+        self._inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+def _load_message(body):
+    from anthropic.types import Message
+    return Message.model_validate_json(body)
+
+
+class _RecordingStream:
+    # 本物のストリームを流しながら、届いた文字（text / input_json）と時刻を控え、最後に1件として記録する
+    def __init__(self, manager, cassette, key, route):
+        self._manager = manager
+        self._cassette = cassette
+        self._key = key
+        self._route = route
+        self._stream = None
+        self._start = None
+        self._chunks = []
+
+    def __enter__(self):
+        self._start = time.monotonic()
+        self._stream = self._manager.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._manager.__exit__(*exc)
+
+    def _mark(self, kind, text):
+        self._chunks.append([round(time.monotonic() - self._start, 4), kind, text])
+
+    @property
+    def text_stream(self):
+        for text in self._stream.text_stream:
+            self._mark("text", text)
+            yield text
+
+    def __iter__(self):
+        for event in self._stream:
+            if event.type == "text":
+                self._mark("text", event.text)
+            elif event.type == "input_json":
+                self._mark("input_json", event.partial_json)
+            yield event
+
+    def get_final_message(self):
+        message = self._stream.get_final_message()
+        self._cassette.record(
+            "anthropic.messages", self._key, self._route, time.monotonic() - self._start,
+            response=message.model_dump_json(), chunks=self._chunks,
+        )
+        return message
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _ReplayStream:
+    # messages.stream() と同じ使い方で、記録した文字を記録した時刻どおりに返す
+    def __init__(self, entry, cassette):
+        self._entry = entry
+        self._cassette = cassette
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _replay(self, kinds):
+        for offset, kind, text in self._entry.get("chunks") or []:
+            if kind in kinds:
+                self._cassette.wait_until(self._start, offset)
+                yield kind, text
+
+    @property
+    def text_stream(self):
+        for _, text in self._replay(("text",)):
+            yield text
+
+    def __iter__(self):
+        for kind, text in self._replay(("text", "input_json")):
+            if kind == "text":
+                yield SimpleNamespace(type="text", text=text)
+            else:
+                yield SimpleNamespace(type="input_json", partial_json=text)
+
+    def get_final_message(self):
+        self._cassette.wait_until(self._start, self._entry["elapsed"])
+        return _load_message(self._entry["response"])
+
+
+class _CassetteMessages(_Proxy):
+    def __init__(self, inner, cassette):
+        super().__init__(inner)
+        self._cassette = cassette
+
+    def _request(self, params):
+        return cache_key("anthropic", "messages", params), f"anthropic {params.get('model')}"
+
+    def create(self, **params):
+        key, route = self._request(params)
+        if self._cassette.replaying:
+            entry = self._cassette.take("anthropic.messages", key, route)
+            self._cassette.wait(entry["elapsed"])
+            return _load_message(entry["response"])
+        start = time.monotonic()
+        message = self._inner.create(**params)
+        self._cassette.record("anthropic.messages", key, route, time.monotonic() - start, response=message.model_dump_json())
+        return message
+
+    def stream(self, **params):
+        key, route = self._request(params)
+        if self._cassette.replaying:
+            return _ReplayStream(self._cassette.take("anthropic.messages", key, route), self._cassette)
+        return _RecordingStream(self._inner.stream(**params), self._cassette, key, route)
+
+
+class CassetteAnthropic(_Proxy):
+    def __init__(self, client, cassette):
+        super().__init__(client)
+        self.messages = _CassetteMessages(client.messages if client is not None else None, cassette)
+
+
+class _CassetteCompletions(_Proxy):
+    def __init__(self, inner, cassette):
+        super().__init__(inner)
+        self._cassette = cassette
+
+    def create(self, **params):
+        from openai.types.chat import ChatCompletion
+        key = cache_key("openai", "chat.completions", params)
+        route = f"openai {params.get('model')}"
+        if self._cassette.replaying:
+            entry = self._cassette.take("openai.chat", key, route)
+            self._cassette.wait(entry["elapsed"])
+            return ChatCompletion.model_validate_json(entry["response"])
+        if params.get("stream"):
+            # ストリームの記録には対応していない（app.py では使っていない）
+            return self._inner.create(**params)
+        start = time.monotonic()
+        completion = self._inner.create(**params)
+        self._cassette.record("openai.chat", key, route, time.monotonic() - start, response=completion.model_dump_json())
+        return completion
+
+
+class CassetteOpenAI(_Proxy):
+    def __init__(self, client, cassette):
+        super().__init__(client)
+        completions = _CassetteCompletions(client.chat.completions if client is not None else None, cassette)
+        self.chat = SimpleNamespace(completions=completions)
+
+
+def cassette_anthropic(client, cassette):
+    return client if cassette.mode == OFF else CassetteAnthropic(client, cassette)
+
+
+def cassette_openai(client, cassette):
+    return client if cassette.mode == OFF else CassetteOpenAI(client, cassette)
@@ -0,0 +1,2 @@
+from fortune.period import get_date_kanshi, calculate_period_score
+from fortune.daily import SYSTEM_PROMPT_TEMPLATE, DAILY_FORTUNE_SCHEMA, get_daily_science_weapon, get_daily_fortune_json, generate_daily_content, profile_for_ai
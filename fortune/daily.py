@@ -0,0 +1,1060 @@
+# ==========================================
+# デイリー機能：今日の武器・システムプロンプト・AI生成
+# ==========================================
+# 画面（波乗りダッシュボードの「今日」タブ）と夜間バッチ（fortune.pregenerate）の両方から使う。
+# Streamlit に依存しないよう、Anthropic のクライアントは呼び出し元から受け取る
+import datetime
+
+from storage.schema import BIG5_KEYS
+from llm import LLMJSONError, cached_system, is_complete, route_structured, object_field, text_field
+
+JST = datetime.timezone(datetime.timedelta(hours=+9), 'JST')
+
+# ==========================================
+# デイリー機能：システムプロンプトテンプレート
+# ==========================================
+SYSTEM_PROMPT_TEMPLATE = """
+あなたは、ユーザーの心に寄り添う「占い×科学」の専属ナビゲーターです。
+ユーザーの「今日の運勢スコアと精神テーマ」と「ビッグファイブの性格特性」、そして「現在フォーカスしている悩み」に基づき、daily_fortune の形（スキーマ）で出力してください。
+
+【🚨絶対遵守のルール🚨】
+1. 出力は必ず daily_fortune の形のデータのみ。マークダウンや余計な挨拶は一切含めない。
+2. 【NGワードの完全禁止】「カフェ」「深呼吸」「散歩」等の陳腐な表現や、「Big5」「O」「C」「E」「A」「N」といった性格診断の専門用語・アルファベットは【絶対に使用禁止】。
+3. 【UXライティングの絶対要件（最重要）】
+   指定された変数（[WEAPON_NAME]や[WEAPON_THEORY]など）を代入する際、専門用語や人名、理論の核となる意味を削ることは【絶対NG】です。
+   ただし、そのまま代入して日本語が不自然になる場合（例：「聴き続けるを試してみましょう」「〜休ませる。」など）は、LLMであるあなたの高い文章力を活かし、必ず「聴き続けることを試してみましょう」「〜休ませてくれます。」のように、自然で滑らかな「です・ます調」に書き換えてから出力してください。機械的な直訳や、辞書形の語尾の放置はシステムエラーとみなします。
+
+【⚔️本日の固定変数（意味・用語の省略禁止）】
+・スキル名: [WEAPON_NAME]
+・ミッション名: [MISSION_TITLE]
+・トリガー: [TRIGGER_CONTEXT]
+・逃げ道: [TINY_HABIT]
+・理論: [WEAPON_THEORY]
+
+【構成指定】
+・"summary": "[MISSION_TITLE]" の日本語を自然に整えて出力。
+・"action": "毎日必ずすること、たとえば「[TRIGGER_CONTEXT]」などのタイミングで、[MISSION_TITLE]を試してみませんか？もし疲れていてできなくても、[TINY_HABIT]で立派なクリアです。" をベースにするが、名詞と動詞が直接ぶつかる不自然な日本語にならないよう、必ず自然な対話文（です・ます調）に意訳・調整して出力すること。
+・"benefit": "これは心理学の『[WEAPON_NAME]』という手法をアレンジした魔法です。[WEAPON_THEORY]" をベースに出力。[WEAPON_THEORY]の語尾が「〜である」「〜する」となっている場合は、全体のトーンに合わせて必ず「〜です」「〜ます」等に変換すること。ただし意味や専門用語は絶対に削らないこと。
+・"closing": "今日1日、本当にお疲れ様でした。[ユーザーの職業や悩みに寄り添う労いと共感の一言]。もちろん、この魔法を使うかどうかはあなたの自由です。準備ができたら、ぜひ試してみてくださいね。"
+
+【出力】
+daily_fortune の形で1回だけ出力し、各項目の内容はスキーマの説明に従うこと。
+"""
+
+# 出力の形（llm.router 経由で、Anthropic はツール入力・OpenAI は json_schema として、この形だけを返させる）
+DAILY_FORTUNE_SCHEMA = object_field({
+    "thought_process": text_field("ここでユーザーの悩みと固定変数をどう自然に結びつけるか、語尾やてにをはをどう整えるか思考する", 400),
+    "fortunes": object_field({
+        "relation": text_field("人間関係運のアドバイス（30文字以内の一言）", 30),
+        "work": text_field("仕事運のアドバイス（30文字以内の一言）", 30),
+        "love": text_field("恋愛＆結婚運のアドバイス（30文字以内の一言）", 30),
+        "money": text_field("金運のアドバイス（30文字以内の一言）", 30),
+        "health": text_field("健康運のアドバイス（30文字以内の一言）", 30),
+        "family": text_field("家族・親子運のアドバイス（30文字以内の一言）", 30),
+    }),
+    "aura_focus": text_field("本日のフォーカス。今日の運勢とユーザーの悩みを結びつけ、自己肯定感が上がるように解説（約150文字）", 200),
+    "mission": object_field({
+        "summary": text_field("ミッションのタイトル（構成指定の summary）", 60),
+        "action": text_field("クエスト内容（構成指定の action）", 300),
+        "benefit": text_field("この魔法を使うとどうなる？（構成指定の benefit）", 300),
+        "closing": text_field("結びの言葉（構成指定の closing）", 200),
+    }),
+})
+
+def get_daily_science_weapon(mind_reason, user_id, target_date=None):
+    """
+    ハイブリッド算命学の五行属性に合わせて、100個の武器庫から
+    ハルシネーションなしの科学的メソッドを日替わりで1つ抽出する関数
+    """
+    if mind_reason is None:
+        mind_reason = ""
+        
+    # 1. 五行の判定（最も強い属性をベースにする）
+    element = "土"  # デフォルトは日常・グラウンディングの土
+    if any(x in mind_reason for x in ["貫索", "石門"]): element = "木"
+    elif any(x in mind_reason for x in ["鳳閣", "調舒"]): element = "火"
+    elif any(x in mind_reason for x in ["禄存", "司禄"]): element = "土"
+    elif any(x in mind_reason for x in ["車騎", "牽牛"]): element = "金"
+    elif any(x in mind_reason for x in ["龍高", "玉堂"]): element = "水"
+
+# 2. 100個の科学的武器庫（各属性20個、計100個の完全版）
+    weapons_db = {
+        "木": [
+            {
+                "name": "ツァイガルニク効果",
+                "mission_title": "気になっている「未完了の小さなタスク」を1つだけスマホのメモに書き出す",
+                "trigger_context": "PCを閉じる時 / 退勤する時",
+                "tiny_habit": "メモ帳アプリを1秒だけ開く",
+                "theory": "B.ツァイガルニク（ゲシュタルト心理学）。人間は完了したタスクよりも「未完了のタスク」を強く記憶し、それが脳のワーキングメモリ（メモリ容量）を圧迫し続けるという現象。外部に書き出して脳から追い出すことでメモリを解放する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】タスクを「完了させる」「実際に作業を進める」提案は認知負荷が高いため絶対NG。あくまで「書き出すだけ」に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "If-Thenプランニング",
+                "mission_title": "「今日帰りの電車に乗ったら（If）、〇〇をする（Then）」と1つだけ決めてメモする",
+                "trigger_context": "朝、靴を履く時 / 玄関を出る時",
+                "tiny_habit": "「スマホを見たら深呼吸」と1回つぶやくだけ",
+                "theory": "P.ゴルヴィツァー（ニューヨーク大）が提唱。行動を起こすための「条件（If）」と「行動（Then）」を事前にセットで決めておくことで、脳にプログラムが書き込まれ、モチベーションに頼らず自動的に実行できるようになる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】複雑な計画や重いタスクのThen（行動）は絶対NG。数秒で確実に終わるアクションにすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "2分間ルール",
+                "mission_title": "部屋のゴミを捨てる、靴を揃えるなど「2分以内で終わる作業」を今すぐ1つだけやる",
+                "trigger_context": "家に帰って上着を脱いだ時",
+                "tiny_habit": "目の前のゴミを1つだけゴミ箱に入れる",
+                "theory": "D.アレン（GTD理論）。タスクの着手にかかる心理的ハードルを極限まで減らすメソッド。「2分で終わる」と脳に認識させることで大脳基底核の抵抗を突破し、作業興奮を引き起こす。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「2分間全力で掃除する」等エネルギーを持続的に使う提案は絶対NG。一瞬で終わる物理動作に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "認知的オフローディング",
+                "mission_title": "今頭の中にある「やらなきゃいけないこと」を箇条書きで3つだけ書き出す",
+                "trigger_context": "デスクに座った瞬間 / 手帳を開いた時",
+                "tiny_habit": "紙の上にペンを1秒置くだけ",
+                "theory": "脳科学のアプローチ。脳（ワーキングメモリ）は情報を「記憶する」ことと「処理する」ことを同時に行うとパニックを起こすため、情報を外部（メモ等）に出力（オフロード）して処理能力を取り戻す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「全ての悩みを整理して解決策を練る」等の重い認知作業は絶対NG。ただ書き出す（排出する）ことだけを促すこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "チャンキング",
+                "mission_title": "明日の大きな予定を「3つの小さな手順」に分解して書き出してみる",
+                "trigger_context": "仕事終わりのカバンを閉じる時",
+                "tiny_habit": "最初のステップを1行だけ書く",
+                "theory": "G.ミラー（認知心理学）。人間が一度に処理できる情報の塊（チャンク）は限られているため、巨大で複雑なタスクを脳が処理しやすい小さな手順の塊に分割することで、心理的抵抗をなくす。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「全体の計画を綿密に立ててスケジュールに落とす」等の重い作業は絶対NG。箇条書きレベルの分解に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "メンタル・コントラスティング",
+                "mission_title": "今日の最大の目標と、それを邪魔しそうな「最大の誘惑・障害」を1つだけメモに書き出す",
+                "trigger_context": "朝の通勤中 / デスクについた直後",
+                "tiny_habit": "最大の誘惑（スマホ等）を1秒だけ頭に思い浮かべる",
+                "theory": "G.エッティンゲン（心理学）。目標を思い描くだけでなく、それが現実になるのを阻む「自分の中の障害」を事前に対比（コントラスト）させることで、脳が現実的な実行ルートを構築しやすくなる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「詳細なリスク分析と回避策の立案」は絶対NG。「障害を認識する」という認知プロセスのみを促すこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "パーキンソンの法則の逆利用",
+                "mission_title": "今日やるべき最も小さなタスクの「締め切り時間」を、あえて本来の半分の時間に設定して挑む",
+                "trigger_context": "時計を見た時 / スケジュールを確認した時",
+                "tiny_habit": "タイマーアプリを開いて時間をセットするだけ（開始しなくてよい）",
+                "theory": "C.N.パーキンソンの法則「仕事は与えられた時間をすべて満たすまで膨張する」を逆手に取り、人為的に締め切りを短く設定することで、脳の集中力を強制的に引き上げ、無駄な完璧主義を排除する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「半分の時間で全力で完璧に終わらせる」等のプレッシャーをかける指示は絶対NG。ゲーム感覚のタイムアタックとして提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "認知再構成法（白黒思考の打破）",
+                "mission_title": "「絶対」「すべて」「いつも」という言葉を使ってしまったら、「今回は」という言葉に脳内で置き換える",
+                "trigger_context": "イラッとしてため息をついた瞬間",
+                "tiny_habit": "心の中で『今回は』と1回だけつぶやく",
+                "theory": "A.ベック（認知行動療法）。極端な認知の歪み（全か無か、常に失敗する等）を、「今回の一部分だけだ」と限定的な表現に修正することで、過剰なストレス反応を即座に鎮める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「ポジティブに考え直す」等の無理な感情の操作は絶対NG。あくまで「言葉の置き換え」というロジカルな作業に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "デフォルト・バイアス",
+                "mission_title": "仕事や勉強を始める前に、スマホを「別の部屋」または「カバンの一番奥」に強制隔離する",
+                "trigger_context": "作業をする机に向かった時",
+                "tiny_habit": "スマホの画面を裏返して置く",
+                "theory": "R.セイラー（行動経済学）。人間は初期設定（デフォルト）の行動を選びやすいという特性があるため、誘惑へのアクセスを初期設定で「面倒」にしておくことで、意志力を使わずに悪習慣を防ぐ。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「誘惑を完全に断ち切る」「電源を切る」等の意志力に頼る提案は絶対NG。物理的な摩擦（面倒くささ）を少し増やす提案とすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "オヴシアンキナ効果",
+                "mission_title": "手をつけたくない作業のファイルを開き、タイトルだけ入力して一度閉じる（あえて中途半端にする）",
+                "trigger_context": "PCを立ち上げた瞬間",
+                "tiny_habit": "ファイルを開いて1秒ですぐ閉じる",
+                "theory": "M.オヴシアンキナ（心理学）。完了した作業よりも、あえて中断された（中途半端な）作業の方が「再開したくなる強い欲求」が生じるという人間の行動面の現象を利用し、着手ハードルを破壊する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「そのまま作業を少し進める」等のタスク着手は絶対NG。必ず「一瞬で中断させる」ことを強調すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "決断疲れ（Decision Fatigue）の回避",
+                "mission_title": "今日のうちに、明日の「どうでもいい小さな選択（着る服、朝食など）」を1つだけ固定化してメモする",
+                "trigger_context": "夜、歯を磨く時 / 着替える時",
+                "tiny_habit": "明日の靴下だけを机に出しておく",
+                "theory": "J.ティアニー等。決断を繰り返すことで脳が疲労し、午後には判断の質が落ちる現象。重要ではない決断を前日のうちに自動化（固定化）しておくことで、明日の脳のエネルギーを温存する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「1日のスケジュールを全て固定する」等は絶対NG。1つだけの無害な決断に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ブレイン・ダンプ",
+                "mission_title": "今頭を占めている「気がかりなこと」を、内容の大小を問わず1分間だけ箇条書きで全てスマホに書き出す",
+                "trigger_context": "電車やバスの待ち時間",
+                "tiny_habit": "メモ帳の新規作成ボタンを1回押すだけ",
+                "theory": "D.アレン（GTD） / N.コーワン（認知心理学）。頭の中でリソースを食い潰している未処理のタスクや不安を、紙やデジタルに全て「ダンプ（排出）」することで、ワーキングメモリの容量制限を回避する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「書き出した悩みを完全に整理・分類する」等は絶対NG。単なる排出作業のみを提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "スモールステップの原理",
+                "mission_title": "今日やらなければならない重いタスクの「最初の1分でできること」だけを書き出し、それ以外は一旦忘れる",
+                "trigger_context": "仕事前のコーヒーを飲む時",
+                "tiny_habit": "PCの電源を入れるだけ（ペンを握るだけ）",
+                "theory": "B.F.スキナー（行動分析学）。巨大な目標を極小化し、達成の「強化（報酬）」を即座に与え続けることで、脳の抵抗をなくし行動を確実に定着させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「タスクを半分終わらせる」等の成果を求めるのは絶対NG。「筋肉を動かすだけの最初の動作」にフォーカスすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "破局視の修正",
+                "mission_title": "不安に思っていることに対し、「実際に起こり得る最も現実的なシナリオ」を1行だけ書き出す",
+                "trigger_context": "不安で胸がざわざわした時",
+                "tiny_habit": "「最悪死ぬわけじゃない」と心の中で1回つぶやく",
+                "theory": "A.ベック（認知行動療法）。「最悪の事態が起きる」という極端な認知の歪み（破局視）に対し、冷静な確率論や事実に基づいた反証を行うことで、大脳辺縁系のパニックを鎮める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「論理的な解決策を綿密に考える」等は絶対NG。現実的な着地点を1行認識するだけに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ポモドーロ・テクニック",
+                "mission_title": "タイマーを「25分」に設定し、その時間内はスマホを裏返して1つの作業だけに完全に没頭する",
+                "trigger_context": "重い作業に取り掛かる直前",
+                "tiny_habit": "タイマーアプリを開いて25分にセットするだけ（開始はしなくてよい）",
+                "theory": "F.シリロ考案。着手の心理的ハードルを下げる短時間のタイムボックス手法。25分という明確な終わりがあることで、脳は「それくらいなら」と集中状態に入りやすくなる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「絶対に25分間フルスピードで集中する」というプレッシャーは絶対NG。途中で休んでもいいので時間を区切ることに主眼を置くこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ホフスタッターの法則の適用",
+                "mission_title": "今からやるタスクの「完了予定時間」を見積もり、その数字に強制的に「1.5倍」を掛けて再設定する",
+                "trigger_context": "今日のスケジュールを立てる時",
+                "tiny_habit": "カレンダーアプリを1秒開くだけ",
+                "theory": "D.ホフスタッター（認知科学）。「作業は常に予想以上の時間を要する」という法則。脳の楽観的な見積もりを強制補正することで、計画倒れの自己嫌悪を防ぎ余裕をもたらす。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「正確なスケジュールを引き直す」等は絶対NG。単に計算上のバッファを設けるだけの提案にすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "損失回避性（プロスペクト理論）",
+                "mission_title": "サボりたくなった時、「今日やらないと今まで積み上げた〇〇の時間が無駄になる」とメモに書く",
+                "trigger_context": "ソファに横になりたくなった瞬間",
+                "tiny_habit": "「今日やらないと無駄になる」と脳内で1回つぶやく",
+                "theory": "Kahneman & Tversky（行動経済学）。人は「利益を得る」より「損失を避ける」ことに約2倍強く動機づけられる現象を利用し、行動しないことの「損失」を強調して脳に警告を出す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「損失を綿密にお金に換算して計算する」等は絶対NG。一瞬のハッとする気づきに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "認知的フリクション（摩擦）の追加",
+                "mission_title": "集中したい時間の前に、スマホの電源を切るか、リモコンを「引き出しの一番奥」に隠す",
+                "trigger_context": "勉強や作業の準備をする時",
+                "tiny_habit": "スマホを裏返して置く",
+                "theory": "行動デザインの技術。悪い習慣を減らすため、物理的・認知的な「手間（摩擦）」を意図的に1ステップ増やすことで、無意識の行動（自動操縦）にエラーを起こさせて防ぐ。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「アプリを全て消去する」等のハードルが高い行動は絶対NG。数秒で復元可能な極小の物理的摩擦を提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "間隔効果（分散学習）",
+                "mission_title": "新しいことを学ぶのではなく、1〜2日前に読んだ本やメモの「ハイライト（重要な1文）」だけを30秒見直す",
+                "trigger_context": "電車での移動中 / トイレに入った時",
+                "tiny_habit": "本を机の上に出すだけ（メモを1秒視界に入れるだけ）",
+                "theory": "H.エビングハウス（記憶心理学）。一度に集中して学習するより、脳が忘れかけた絶妙な間隔を空けて復習する方が、記憶の定着率が飛躍的に高まるという学習法則。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「テキストを1ページ丸ごと復習する」等の認知負荷は絶対NG。30秒以内で終わる極小のインプットに限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "パレートの法則（80:20の法則）",
+                "mission_title": "今日のTODOリストのうち「最も成果に直結する重要な2割（1〜2個）」だけを赤いペンで丸で囲む",
+                "trigger_context": "朝一番、手帳やリストを見た時",
+                "tiny_habit": "TODOリストを開くだけ（赤ペンを手に持つだけ）",
+                "theory": "V.パレート / J.ジュラン。全体の8割の成果は、2割の重要な要素（タスク）によって生み出されるという経験則。すべてをやろうとする完璧主義を破壊し、重要度でタスクをトリアージする。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「タスクの優先順位を完璧に分析・整理する」等は絶対NG。直感で1〜2個に印をつけるだけの物理動作に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            }
+        ],
+        "火": [
+            {
+                "name": "エクスプレッシブ・ライティング",
+                "mission_title": "今感じているネガティブな感情を、誰にも見せないメモに1分間だけそのまま書き殴る",
+                "trigger_context": "イライラして息が浅くなった時",
+                "tiny_habit": "メモ帳アプリを1秒だけ開く",
+                "theory": "J.ペネベーカー（テキサス大）。感情を言語化して書き出すことで、脳の扁桃体の暴走が鎮まり、ストレスホルモンが低下してワーキングメモリが回復する心理療法。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「長文で感情を綺麗に整理する」等の認知負荷が高い提案は絶対NG。汚い言葉でもいいので排出することに重きを置く。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "表情フィードバック仮説",
+                "mission_title": "トイレや誰もいない場所で、2秒間だけ無理やりにでも口角を上げて笑顔を作る",
+                "trigger_context": "トイレで鏡の前に立った時",
+                "tiny_habit": "頬の筋肉を1回指で触る",
+                "theory": "F.ストラック等（心理学）。脳が楽しいから笑うだけでなく、「笑顔の筋肉の動き」を脳が検知して後追いで楽しい感情を作り出すという逆のフィードバック現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「常に人前で笑顔でいるようにする」等の持続的な感情労働は絶対NG。一人で一瞬行う物理的ハックとして提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "パワーポーズ（身体化された認知）",
+                "mission_title": "立ち上がり、胸を張って両手を腰に当てる「スーパーマンのポーズ」を10秒間とる",
+                "trigger_context": "重要な会議やプレゼンの直前",
+                "tiny_habit": "背筋を1センチだけ伸ばす",
+                "theory": "A.カディ等（心理学）。姿勢を大きく広げるなどの身体的動作が、テストステロン（自信ホルモン）を分泌させ、コルチゾール（ストレスホルモン）を低下させる現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「自信を持つよう意識する」等の内面への精神論的アプローチは絶対NG。物理的なポーズの指示のみに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "アサーティブネス",
+                "mission_title": "「本当はこう言いたかった」という自分の本音を、自分を責めずに1行だけ書き出す",
+                "trigger_context": "人に気を遣って疲れた帰り道",
+                "tiny_habit": "メモに「私は」と3文字だけ書く",
+                "theory": "臨床心理学。相手を攻撃せず、かつ自分も我慢しない自他尊重の自己表現手法。まずは「自分が本当に求めていた権利」を言語化して認めることで自己肯定感を取り戻す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「実際に相手に意見を言いに行く」等の高負荷な対人タスクは絶対NG。自分の中での本音の承認に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ラベリング（感情の言語化）",
+                "mission_title": "今の自分の感情に「イライラ」「焦り」など、ピタッとくる名前を1つだけつける",
+                "trigger_context": "パニックになりそうな瞬間",
+                "tiny_habit": "「あ」と1文字だけメモする（または深呼吸を1回する）",
+                "theory": "M.リーバーマン（UCLA）。感情に名前をつける（言語化する）だけで、感情を司る扁桃体の興奮が鎮まり、理性を司る前頭前野が活性化する脳科学現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「感情の原因を過去に遡って深く分析する」等の重い認知作業は絶対NG。単語を1つ貼り付ける作業に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ネーム・イット・トゥ・テイム・イット",
+                "mission_title": "モヤモヤした時、「私は今、〇〇について圧倒されている」と声に出して自分に実況中継する",
+                "trigger_context": "理不尽なことを言われてフリーズした時",
+                "tiny_habit": "心の中で『モヤモヤ』と1回つぶやくだけ",
+                "theory": "D.シーゲル（脳科学）。暴走する感情（右脳）に、言語・論理（左脳）を使って名前をつけることで、左右の脳を統合し、扁桃体の暴走を飼いならす（Tame）技術。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「感情を相手に論理的に伝える」等の対人タスクは絶対NG。自分自身への実況中継（セルフケア）に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "意図的表情表出",
+                "mission_title": "トイレの鏡の前で、目尻にシワが寄るほどの「全力の笑顔の形」を3秒間だけキープする",
+                "trigger_context": "重い空気の会議が終わった後",
+                "tiny_habit": "鏡を1秒見るだけ（目尻を1回指で触るだけ）",
+                "theory": "P.エクマン等（心理学）。特定の表情筋（眼輪筋と大頬骨筋など）を意図的かつ強力に動かすことで、その表情に対応する生理的変化（リラックス）を人工的に引き起こす。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「人前で明るく振る舞って空気を変える」等の感情労働は絶対NG。一人で一瞬行う顔の筋トレとして提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "セルフ・アファメーション理論",
+                "mission_title": "「自分が人生で大切にしている価値観（優しさ、誠実さ等）」を1つ選び、なぜ大切かを1行で書く",
+                "trigger_context": "自分の能力に自信がなくなった時",
+                "tiny_habit": "「誠実」など好きな単語を1つ頭に浮かべるだけ",
+                "theory": "C.スティール（社会心理学）。自分の「中核となる価値観」を再確認することで、自我の防衛壁が強固になり、外部からの脅威や批判への心理的耐性が劇的に高まる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「人生の目標を壮大に語り決意表明する」等は絶対NG。あくまで自分の中の静かな価値観の確認に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "思考の廃棄（Thought Discarding）",
+                "mission_title": "いらない紙の切れ端にイライラを書き込み、ビリビリに細かく破いてからゴミ箱に捨てる",
+                "trigger_context": "嫌な記憶がフラッシュバックした時",
+                "tiny_habit": "いらない紙を1枚用意するだけ",
+                "theory": "川合伸幸等（認知科学）。怒りを書き出した紙を「物理的に破棄・処分する」という行為が、脳内で「怒りそのものの消去」とリンクし、感情を鎮静化させる現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「怒りの原因を根本から解決するために動く」等は絶対NG。物理的な「捨てる」アクションのみに限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "感謝の表明（プロソーシャル行動）",
+                "mission_title": "今日、誰か（お店の人でも家族でも）に、普段より1トーン明るい声で「ありがとう」と伝える",
+                "trigger_context": "レジでお釣りを受け取る時 / エレベーターを降りる時",
+                "tiny_habit": "心の中で『ありがとう』と1回つぶやくだけ",
+                "theory": "R.エモンズ（ポジティブ心理学）。他者への感謝の表現（向社会行動）を行うことで、オキシトシンが分泌され、相手だけでなく自分自身の幸福度と自己肯定感が直接的に高まる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「長文の感謝の手紙を書く」「大げさにお礼を言う」等は絶対NG。一言の軽い会釈レベルの行動にすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ポリヴェーガル理論（迷走神経刺激）",
+                "mission_title": "息を吐くときに「フー」とハミングのような音を出しながら、10秒間だけ長く息を吐く",
+                "trigger_context": "常に気が張っていてリラックスできない時",
+                "tiny_habit": "息を1秒だけ長く吐く（口をすぼめるだけ）",
+                "theory": "S.ポージェス（生理心理学）。発声や長時間の呼気によって腹側迷走神経複合体を刺激し、交感神経の暴走を抑え、自律神経に「ここは安全だ」という信号を強制送信する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「本格的な瞑想を10分する」等の時間は絶対NG。喉や呼吸を使った物理的な極小動作に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "非暴力コミュニケーション（NVC）",
+                "mission_title": "誰かへの不満を「私は〇〇を大切にしたいから（ニーズ）、今〇〇と感じている」という構文でメモに書く",
+                "trigger_context": "相手の行動にカチンときた時",
+                "tiny_habit": "『私は』という主語を1回思い浮かべる",
+                "theory": "M.ローゼンバーグ（臨床心理学）。相手を評価・批判せず、自分の純粋な「ニーズ（願い）」と「感情」にフォーカスすることで、被害者意識を脱し自己への共感を深める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「実際に相手にその構文で話し合う」等の高負荷タスクは絶対NG。自分の中での言語化・整理に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "感謝の恩恵（Gratitude Letter）",
+                "mission_title": "実際に送らなくてもいいので、身近な誰かへの「〇〇してくれて助かった」という2行の感謝の手紙をメモに書く",
+                "trigger_context": "一人で一息ついている時",
+                "tiny_habit": "送る相手の顔を1秒思い浮かべる（宛名だけ書く）",
+                "theory": "M.セリグマン（ポジティブ心理学）。他者への具体的な感謝を言語化することで、脳がポジティブな記憶のネットワークにアクセスしやすくなり、自分自身の幸福度が向上する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「実際に手紙を送る」等のハードルの高い行動は絶対NG。あくまで送らないメモ（ジャーナリング）として提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "自己開示の返報性",
+                "mission_title": "今日、信頼できる人に「実は最近〇〇で少し悩んでいて」と、小さな弱音を1つだけ言葉にして伝えてみる",
+                "trigger_context": "雑談の合間 / チャットを返信する時",
+                "tiny_habit": "「疲れた」と心の中でつぶやく（LINEの入力画面を1秒開く）",
+                "theory": "S.ジュラード（対人心理学）。自分の弱さや本音を少しだけ見せることで、相手も同様のレベルの自己開示を返しやすくなり、結果として心理的距離が急激に縮まる現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「重いトラウマや深刻な相談を打ち明ける」等は絶対NG。相手が笑って流せるか、一言で返せるレベルの微小な弱音に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "アクティブ・コンストラクティブ・レスポンディング",
+                "mission_title": "今日、誰かの小さな成功や嬉しい話を聞いたら、いつもより1段階高いテンションで「それはすごい！」と反応する",
+                "trigger_context": "人から報告を受けた瞬間",
+                "tiny_habit": "心の中で『いいね』と1回つぶやく（少しだけ声のトーンを上げる）",
+                "theory": "S.ゲーブル（社会心理学）。他者の「良い出来事」に対して、積極的かつ建設的（Active-Constructive）に反応することが、ネガティブな時のサポート以上に人間関係を最も強化する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「常にハイテンションで明るく振る舞う」等の感情労働は絶対NG。報告を受けたその一瞬のリアクションのみに限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ピグマリオン効果",
+                "mission_title": "今日、部下や家族、または自分自身に対して「あなたなら絶対に乗り越えられると知っている」と一言だけ明確に伝える",
+                "trigger_context": "朝の挨拶の時 / 鏡を見た時",
+                "tiny_habit": "心の中で『大丈夫』と1回念じるだけ",
+                "theory": "Rosenthal & Jacobson（教育心理学）。他者からの「心からの期待」を受けると、その期待に沿うように無意識の行動が変化し、パフォーマンスが向上する心理現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「相手を熱血指導して監視する」等の重い関わりは絶対NG。プレッシャーにならない短い一言の伝達に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "自己決定理論（SDT）",
+                "mission_title": "どうしてもやりたくない仕事に対して、「いつやるか」「どのペンを使うか」など、自分が100%決定権を持つ部分を1つ探す",
+                "trigger_context": "面倒な仕事に取り掛かる直前",
+                "tiny_habit": "使うペンを1秒で選ぶ（作業場所を10センチずらす）",
+                "theory": "Deci & Ryan（心理学）。内発的動機づけには「自律性（自分で決めた感覚）」が必要不可欠。他人からやらされている仕事の中に、ごく僅かな自己決定権を見出すことでやらされ感を減らす。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「仕事の進め方や内容を勝手に根底から変える」等のルール違反の推奨は絶対NG。自分の手元だけで完結する無害な自己決定にすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "カクテルパーティー効果",
+                "mission_title": "会議や会話の前に「今日は『〇〇』というキーワードが出たら必ず反応する」と1つだけ決めておく",
+                "trigger_context": "ミーティングが始まる直前",
+                "tiny_habit": "キーワードを1つ頭に浮かべるだけ",
+                "theory": "C.チェリー（認知心理学）。音声の洪水の中でも、自分に必要な情報だけは無意識に選択的注意が向く現象。事前に脳にアンテナ（キーワード）を張っておくことで、集中力を節約する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「会議の内容を一言一句完璧にメモする」等の高負荷タスクは絶対NG。脳の自動フィルター機能に頼る極小アクションとすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ミラーニューロンの活性化",
+                "mission_title": "自分がこれからやらなければならない作業を「楽しそうにやっている人の動画」を1分間だけ見る",
+                "trigger_context": "作業が億劫でスマホを触ってしまった時",
+                "tiny_habit": "YouTubeアプリを1秒開く（サムネイルを1つ見るだけ）",
+                "theory": "G.リゾラッティ等（脳神経科学）。他者の行動を見るだけで、自分が同じ行動をしているかのように脳の神経細胞が発火する。他人の作業興奮を利用して自分の脳のスイッチを入れる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「長時間の動画で完璧に学習する」等は絶対NG。1分以内の視覚刺激（起爆剤）としてのみ提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ペーシング",
+                "mission_title": "次に会話する相手の「声の大きさ」または「話すスピード」に、最初の1分間だけ意図的に合わせてみる",
+                "trigger_context": "誰かに話しかけられた瞬間",
+                "tiny_habit": "相手の呼吸のペースを1回だけ見る",
+                "theory": "M.エリクソン（臨床心理学）。相手の非言語的特徴（呼吸、声のトーン、波長）を合わせることで、相手の無意識の警戒心を解き、短時間で安心感（ラポール）を築く技術。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「相手の行動や言葉を完璧にコピーする（オウム返し）」等の不自然で相手を不快にさせる高負荷タスクは絶対NG。波長やリズムを少し合わせるだけに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            }
+        ],
+        "土": [
+            {
+                "name": "スリー・グッド・シングス",
+                "mission_title": "今日あった「ちょっと良かったこと」をどんな些細なことでもいいので3つ書き出す",
+                "trigger_context": "寝る前に布団に入った時",
+                "tiny_habit": "「ご飯が美味しかった」と心で1回つぶやくだけ（メモ帳アプリを1秒開く）",
+                "theory": "M.セリグマン（ポジティブ心理学）。脳の「ネガティブばかり探すアラート機能」を書き換え、1日の終わりに感謝のワークを行うことで、幸福度を永続的に高めることができる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「長文で日記を書く」等の高い認知負荷は絶対NG。生きているだけで発生するレベルの些細なプラスを探させること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "マインドフル・イーティング",
+                "mission_title": "次の食事や飲み物の「最初の一口」だけ、目を閉じて味覚と温度に全集中する",
+                "trigger_context": "食事の最初の一口を食べる瞬間",
+                "tiny_habit": "最初の一口の1秒だけ目を閉じる（箸を一度置くだけ）",
+                "theory": "ジョン・カバット・ジン（マインドフルネス）。今この瞬間に意識を向けることで、過去の後悔や未来の不安による脳の浪費を防ぎ、自律神経を安定させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「食事中ずっと意識を集中する」等の持続的な努力は絶対NG。あくまで「最初の一口」の物理動作に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "サボアリング（味わい）",
+                "mission_title": "身の回りの一番お気に入りのアイテムを10秒間見つめ、魅力を再確認する",
+                "trigger_context": "仕事や家事の合間のふとした瞬間",
+                "tiny_habit": "お気に入りのペンを1秒触るだけ（写真を1回見るだけ）",
+                "theory": "F.ブライアント（ポジティブ心理学）。ポジティブな経験や対象に意識的に注意を向け、その喜びを意図的に増幅・延長させることで、慢性的なストレスへの防波堤を作る。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「長時間をかけて鑑賞する」等は絶対NG。10秒以内の視覚・触覚の確認に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "習慣のスタッキング",
+                "mission_title": "毎日必ずやっている行動の直後にやる「新しい小さな行動」を1つ決める",
+                "trigger_context": "歯を磨く時 / お風呂に入る時",
+                "tiny_habit": "本を机の上に置くだけ（靴を履く前に深呼吸を1回するだけ）",
+                "theory": "S.J.スコット / B.J.フォッグ。既存の強固な習慣（すでに脳の神経回路ができているもの）をトリガーにして、新しい微小な行動を紐付けることで、意志力を使わずに習慣を定着させる行動デザイン手法。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「30分の勉強を追加する」等の重い習慣は絶対NG。数秒で終わる物理動作を提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "プライミング効果",
+                "mission_title": "一番最初に目に入る場所に「気分を高める好きな言葉や写真」を置く",
+                "trigger_context": "デスクやテーブルの片付けをした時",
+                "tiny_habit": "スマホの待ち受けを1枚変えるだけ（机に好きな写真を1枚置くだけ）",
+                "theory": "J.バーグ等（認知心理学）。先行して見聞きした刺激（環境）が、その後の無意識の思考や感情、行動の方向性を決定づける現象。環境に仕掛けをしておくことで自動的にモチベーションを引き上げる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「部屋の模様替えをする」等の重い作業は絶対NG。極小の環境設定の変更にすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "5-4-3-2-1 グラウンディング",
+                "mission_title": "目に見えるものを5つ、触れるものを4つ、聞こえる音を3つと五感をカウントダウンする",
+                "trigger_context": "パニックや強い不安を感じた時",
+                "tiny_habit": "目の前にある『青いもの』を1つ探すだけ（机の冷たさを1秒触るだけ）",
+                "theory": "トラウマケア・不安緩和療法。過去の後悔や未来の不安で暴走する大脳辺縁系を鎮めるため、五感（物理的な現実）に意識を向け、安全な「今ここ」に意識を強制帰還させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「目を閉じて内面を見つめる」等の表現は絶対NG。グラウンディングの目的は外部の物理的な現実への接続である。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "単純接触効果",
+                "mission_title": "リラックスできる風景や好きなものの写真をスマホで開き、10秒間ただじっと眺める",
+                "trigger_context": "通勤中や移動中の電車の中",
+                "tiny_habit": "スマホのアルバムを1秒開くだけ（画像をウィジェットに置くだけ）",
+                "theory": "R.ザイアンス（心理学）。人間は、繰り返し接するもの（視覚刺激）に対して無意識に好意や安心感を抱く現象。好きなビジュアルに触れる回数を増やし、安全基地を作る。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「毎日何十分も見る」等は絶対NG。10秒以内の無意識レベルの極小アクションとすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "マイクロ・ドーパミン・デトックス",
+                "mission_title": "1時間だけスマホの画面設定を「白黒（モノクローム）モード」に変更する",
+                "trigger_context": "スマホを触りすぎて疲れた時",
+                "tiny_habit": "スマホを1分間だけ裏返す（設定画面を開くだけ）",
+                "theory": "A.レンブケ（精神医学）。過剰なデジタル刺激（ドーパミン）を遮断し、脳の報酬系をリセットすることで、焦燥感を減らし集中力のベースラインを回復させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「1日中スマホを見ない」等の非現実的な提案は絶対NG。一時的な画面の彩度低下や裏返しに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "プログレスの法則",
+                "mission_title": "今日終わらせたどんな些細なことでも1つ書き出して丸で囲む",
+                "trigger_context": "一日の仕事を終える直前",
+                "tiny_habit": "TODOリストに1つだけチェックを入れる（「完了」と1単語メモするだけ）",
+                "theory": "T.アマビール（組織心理学）。日々の「小さな進捗（前に進んでいる感覚）」の認識が、人間のモチベーションを最も高く保つ。できなかったことではなく、完了したことに目を向ける。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「詳細な日報や反省を書く」等は絶対NG。完了したものにチェックを入れるという快感の付与に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "マインドフル・ウォーキング",
+                "mission_title": "移動中の「最初の10歩」だけ足の裏が地面に触れる感覚に全集中する",
+                "trigger_context": "立ち上がって歩き出した瞬間",
+                "tiny_habit": "立ち上がった時の最初の1歩だけ意識する（足の裏の感覚を1秒感じる）",
+                "theory": "マインドフルネス（歩行瞑想）。「次は何をしよう」と自動操縦モードになっている脳を休ませ、足の裏の物理的な身体感覚に意識を向けることで、思考のノイズを強制終了させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「30分間歩き続ける」等の運動提案は絶対NG。最初の10歩という極めて短い時間に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ノスタルジアの心理的効用",
+                "mission_title": "スマホのアルバムを遡り「楽しかった旅行や友人の写真」を1枚選び10秒間眺める",
+                "trigger_context": "孤独感や虚しさを感じた時",
+                "tiny_habit": "写真アプリを1秒開くだけ（楽しかった記憶のキーワードを1つ浮かべるだけ）",
+                "theory": "C.ルートレッジ（心理学）。過去の温かい記憶（ノスタルジア）を呼び起こすことで、孤独感や不安が減少し、自分の人生の意味への感覚（自己肯定感）が回復する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「過去にすがって現実逃避する」等のネガティブなニュアンスは絶対NG。温かい記憶からのエネルギー補給として描くこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "タクティカル・ブリージング",
+                "mission_title": "「4秒吸う、4秒止める、4秒吐く、4秒止める」四角形の呼吸を3セット行う",
+                "trigger_context": "心拍数が上がり緊張している時",
+                "tiny_habit": "ただ1回だけ深くため息をつく（息を4秒吸うだけ）",
+                "theory": "生理学。特殊部隊等でも使われる手法。吸う・止める・吐く・止めるの秒数を均等にすることで、心拍数を強制的に下げ、自律神経のパニックを物理的に鎮める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「何セットも完璧に行う」等のプレッシャーは絶対NG。呼吸という筋肉を少し動かすだけのアクションに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "プラセボ睡眠",
+                "mission_title": "睡眠不足でも「今日の自分の脳は十分休めた」と鏡に向かって1度だけ声に出す",
+                "trigger_context": "朝起きて鏡の前に立った時",
+                "tiny_habit": "「とりあえず寝た」と1回心でつぶやくだけ（鏡を1秒見るだけ）",
+                "theory": "A.クラム（スタンフォード大）。「自分は十分な休息を取った」と思い込む（プラセボ）だけで、脳は安心し、実際の認知機能の低下が有意に防げるという現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「無理に思い込ませて過労状態のまま働き続ける」等のブラックな提案は絶対NG。今日の不安を取り除くための応急処置として提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ナッジ",
+                "mission_title": "やりたい良い習慣のアイテムを「自分の利き手に一番近い位置」に配置する",
+                "trigger_context": "机の上を整頓する時",
+                "tiny_habit": "水を10センチ手前に置くだけ（本を開いて机に置くだけ）",
+                "theory": "R.セイラー（行動経済学）。物理的な環境を少し変える（ナッジ：そっと後押しする）だけで、人間の選択は劇的に望ましい方向へ誘導される。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「部屋の配置を完璧にする」等は絶対NG。10センチ動かすだけ等の数秒で終わる物理的配置を代替案にすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ボディスキャン瞑想",
+                "mission_title": "目を閉じ、つま先から頭まで順番に「今の重さや温度」を10秒間観察する",
+                "trigger_context": "寝転がった時 / 座って目を閉じた時",
+                "tiny_habit": "右足のつま先だけ1秒意識する（肩を1回だけ落とす）",
+                "theory": "J.カバットジン（マインドフルネス）。意識を身体の各部位に順番に向けることで、思考へ向かっていた脳の過活動を鎮め、深い休息状態へと導く。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「全身を30分かけてスキャンする」等の高負荷タスクは絶対NG。10秒で終わる身体の物理的スキャンに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "サンクコストの誤謬の認識",
+                "mission_title": "惰性で続けていることに対し「もし今日ゼロからなら始めるか？」と自問する",
+                "trigger_context": "サブスクの更新日や片付けの時",
+                "tiny_habit": "「もしゼロからならやるか？」と1回心で自問するだけ",
+                "theory": "Arkes & Blumer（行動経済学）。人間は、回収不可能なコスト（時間やお金）に引きずられ不合理な継続をしてしまう。思考を「今の価値」のみにリセットする。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「今すぐ全てを捨てる決断をする」等の心理的抵抗が強い提案は絶対NG。自問する（認識する）ことのみをタスクとすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ピーク・エンドの法則",
+                "mission_title": "今日の仕事の「一番最後」に最も簡単で気持ちよく終わるタスクを意図的に持ってくる",
+                "trigger_context": "今日のスケジュールを確認する時",
+                "tiny_habit": "一番簡単な作業を1つだけ最後に残す（PCを閉じる時だけ深呼吸する）",
+                "theory": "D.カーネマン（行動経済学）。人間の経験の記憶は、その出来事の「絶頂時（ピーク）」と「終了時（エンド）」の感情だけで決定される。終わりを良くすることで1日全体の疲労感を消す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「最後を完璧に仕上げるために残業する」等は絶対NG。最も簡単なタスクをエンドに配置するロジックを強調すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "環境エンコーディング",
+                "mission_title": "明日の朝思い出したことを付箋に書き「確実に最初に見る場所」に貼る",
+                "trigger_context": "夜、明日の準備をする時",
+                "tiny_habit": "付箋を1枚鏡に貼るだけ（メモアプリを1秒開いておく）",
+                "theory": "Godden & Baddeley（認知心理学）。情報を記憶した時と同じ環境（物理的な場所）にいると、脳はその情報を圧倒的に思い出しやすくなる現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「完璧な暗記術を実践する」等は絶対NG。付箋を貼る等の極小の物理的アクションを代替案として含めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "習慣の逆転法",
+                "mission_title": "イライラして悪い癖が出そうになったら代わりに「両手を10秒間強く握りしめる」",
+                "trigger_context": "悪い癖（スマホいじりや爪噛み等）が出そうになった瞬間",
+                "tiny_habit": "両手を1秒だけ強く握る（ペンを1回置く）",
+                "theory": "Azrin & Nunn（行動療法）。無意識の悪い癖が出そうになった瞬間、それと同時に物理的にできない「拮抗反応（別の身体動作）」を行うことで、悪習慣のサイクルを上書きする。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「悪い癖を意志の力で完全にやめる」等の精神論は絶対NG。簡単な筋肉の動作での上書きを提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "マインドセット効果",
+                "mission_title": "ただの水を飲む時に「これは自律神経をリセットする水だ」と強く念じてから飲む",
+                "trigger_context": "コップに水やお茶を注いだ時",
+                "tiny_habit": "飲む前に「これは効く」と1回だけ心でつぶやく",
+                "theory": "A.クラム（スタンフォード大）。主観的な思い込み（マインドセット）がプラセボとして機能し、現実の生理的反応（満腹感や疲労回復）を実際に変える現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「常に全てをポジティブに思い込む」等は絶対NG。水を飲む瞬間だけの数秒の脳内ハックを代替案として含めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            }
+        ],
+        "金": [
+            {
+                "name": "5秒ルール",
+                "mission_title": "心の中で「5、4、3、2、1」とカウントダウンしゼロになった瞬間に立ち上がる（または最小の動作をする）",
+                "trigger_context": "ダラダラして行動したくない時",
+                "tiny_habit": "心の中で「5、4、3、2、1」とカウントダウンするだけ（1ミリだけ指を動かすだけ）",
+                "theory": "M.ロビンズ。脳が「やらない言い訳」を考える前にカウントダウンで思考を強制終了させ、行動のトリガーを自ら引く手法。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「そのまま重い作業を始める」等の高いハードルは絶対NG。立ち上がる、指を動かす等の極小アクションを代替案として含めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "行動活性化療法",
+                "mission_title": "気分が乗らなくてもあえて「歩くスピードを少しだけ上げる」など行動を先にする",
+                "trigger_context": "移動中や作業開始時",
+                "tiny_habit": "その場で1回だけ背伸びする（次の1歩だけ歩幅を広げる）",
+                "theory": "認知行動療法（CBT）。気分ではなく「行動」を先に行うことで、後からドーパミン（やる気）を誘発し、抑うつや無気力のループを断ち切る。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「1時間運動する」等の負担の大きい行動は絶対NG。物理的な極小アクションを代替案として含めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "プレマックの原理",
+                "mission_title": "「これを5分やったらあの動画を見る」という小さなご褒美ルールを1つ設定してメモする",
+                "trigger_context": "気が重い作業を始める前",
+                "tiny_habit": "「PCを開いたらコーヒーを1口飲む」という数秒のルールを1つ頭に浮かべるだけ",
+                "theory": "D.プレマック（行動心理学）。「自分がやりたいこと（報酬）」を「やらなければならないこと」の直後に配置することで、行動の確率を劇的に高める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「1時間の勉強を条件にする」等の重いタスクは絶対NG。5分以内の行動を条件とすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "コントロールの所在（内的統制）",
+                "mission_title": "今抱えている問題のうち「自分ではどうにもならないこと」を1つ諦め、手放す宣言をする",
+                "trigger_context": "問題に直面して頭がパンクしそうな時",
+                "tiny_habit": "「これは私の管轄外だ」と心の中で1回つぶやくだけ",
+                "theory": "J.ロッター（心理学）。自分でコントロールできる事にのみ集中し、外部要因への執着を手放すことで、無力感を防ぎ精神的なエネルギーを節約する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「全ての問題の解決策を練る」等は絶対NG。自分以外の要素を諦める（切り捨てる）ことに主眼を置くこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "選択回避の法則",
+                "mission_title": "明日着る服や次食べるメニューなど「どうでもいい決断」を今1つだけ固定化する",
+                "trigger_context": "夜寝る前や一息ついた時",
+                "tiny_habit": "明日の靴下だけ出しておく（次飲むお茶の種類を1秒で決める）",
+                "theory": "S.アイエンガー（コロンビア大）。選択肢が多すぎると脳は決断できず現状維持を選んでしまう。小さな決断を前もって潰しておくことで脳のリソースを重要事項に残す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「1週間の予定を全て決める」等は絶対NG。極小の決断1つを固定化する代替案を含めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "テンプテーション・バンドリング",
+                "mission_title": "「好きな音楽を聴くのは〇〇の作業中だけ」というマイルールを今日1つ作る",
+                "trigger_context": "お気に入りのエンタメに触れる前",
+                "tiny_habit": "「好きな曲を聴きながら靴を履く」というルールを1秒思い浮かべるだけ",
+                "theory": "K.ミルクマン（行動経済学）。「やりたいこと（誘惑）」と「やるべきこと」をセット（バンドル）にすることで、悪習慣を防ぎつつ良い習慣のモチベーションを生み出す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「過酷な作業とセットにする」等は絶対NG。日常生活の小さな作業と結びつけること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "タイムボックス手法",
+                "mission_title": "タイマーを「15分間」にセットし、時間が来たら作業の途中でも絶対に手を止める箱を作る",
+                "trigger_context": "作業時間が間延びしている時",
+                "tiny_habit": "タイマーアプリを1秒開くだけ（「次は5分だけやる」と心で決めるだけ）",
+                "theory": "ソフトウェア開発から生まれた手法。時間を厳格に区切り、パーキンソンの法則（時間はあればあるだけ使う）を防ぎ、集中力の密度を強制的に上げる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「何時間も連続してスケジュールを組む」等は絶対NG。15分という短い箱に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "プレモルテム（事前の検死）",
+                "mission_title": "今日の計画が全て台無しになるとしたら「何が原因か」を1つだけ想定し、対策を1行メモする",
+                "trigger_context": "計画を立てた直後",
+                "tiny_habit": "最大の失敗原因を1単語だけメモに書く（1秒だけ最悪の事態をイメージする）",
+                "theory": "G.クライン（認知心理学）。計画がすでに「大失敗した」と未来からの視点で仮定することで、通常の計画時には見落としがちな致命的リスク（自分の怠惰など）を炙り出す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「何十個もリスクを書き出して完璧な対策を練る」等の高負荷タスクは絶対NG。1つのリスク抽出に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "最適多様性",
+                "mission_title": "利き手と逆の手でドアを開けるなど、日常に1つだけ違和感を作る",
+                "trigger_context": "ドアを開ける時 / マウスを触る時",
+                "tiny_habit": "利き手と逆の手でマグカップを1回持つだけ（マウスを1センチずらすだけ）",
+                "theory": "脳科学のアプローチ。脳はマンネリに弱く、安全な範囲の「新しい刺激（多様性）」を検知するとドーパミンを分泌し、失われた集中力を回復させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「旅行に行く」「仕事のやり方を全く変える」等の大きな変化の提案は絶対NG。身体的で極小の違和感に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "バッチ処理",
+                "mission_title": "今から短時間だけ「メールの返信だけ」など同種の作業に絞って一気に片付ける",
+                "trigger_context": "色々なタスクが散乱している時",
+                "tiny_habit": "同じアプリを2回連続で開く（「今はこれだけ」と1秒つぶやくだけ）",
+                "theory": "生産性工学。異なる種類の作業を切り替える際に脳が消費する「コンテキスト・スイッチ」の疲労を排除するため、同種のタスクをひとまとめ（バッチ）にして処理する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「1日中バッチ処理で働く」等は絶対NG。今からの数分間の集中提案に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "目標勾配仮説",
+                "mission_title": "今日やるべきタスクをあえて「細かいチェックリスト」にし、終わったものから勢いよく線を引いて消す",
+                "trigger_context": "タスク一覧を見た時",
+                "tiny_habit": "TODOリストに1つだけチェックボックスを書く（「終わった」と1文字書くだけ）",
+                "theory": "C.ハル（行動心理学）。動物はゴールが近づくにつれてモチベーションが加速度的に高まる現象。意図的にゴールを細かくし、達成感を連続発生させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「100個のリストを作る」等は絶対NG。既存のタスクを少し細かくする程度のアクションに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "10分間ルール",
+                "mission_title": "ずっと後回しにしている作業に「10分経ったら絶対にやめていい」という免罪符を与え着手する",
+                "trigger_context": "「面倒だ」と感じたその瞬間",
+                "tiny_habit": "「10分でやめる」と1回声に出すだけ（ファイルを開いてすぐ閉じるだけ）",
+                "theory": "認知行動療法。不安な課題に対し逃げ道（免罪符）を与えて着手させ、いざ始めてみると作業興奮のドーパミンが出てそのまま続けられるという脳の性質を利用する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「そのまま1時間やり続ける」事を強要するのは絶対NG。本当に10分でやめても良いという前提を持たせること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "コーピング・プランニング",
+                "mission_title": "「今日もし〇〇（サボる誘惑）が起きたら、××をして回避する」というルールを1つだけメモに書く",
+                "trigger_context": "朝一番や外出前",
+                "tiny_habit": "「スマホを見たら深呼吸」と1行だけ書く（誘惑を1つ思い浮かべるだけ）",
+                "theory": "行動科学。「障害が起きた時の対処法」を事前にIf-Thenで決めておくことで、いざ誘惑に直面した時に意志力を使わず自動的に回避ルートに入ることができる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「複雑なマニュアルを作る」等は絶対NG。1つの誘惑と1つの回避行動に限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ソマティック・マーカー仮説",
+                "mission_title": "迷っている選択肢でコインを投げ、舞っている瞬間の「自分の直感（どっちが出てほしいか）」を探る",
+                "trigger_context": "AかBかで迷っている時",
+                "tiny_habit": "コインを1回投げるだけ（「AかBか」と1秒だけ目を閉じて直感を感じるだけ）",
+                "theory": "A.ダマシオ（脳神経科学）。人間の身体的反応（直感・情動）が、論理的思考よりも早く正しい意思決定を導くという理論。コインの結果ではなく、その時の自分の感情をモニタリングする。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「直感だけで重大な決断をさせる」等は絶対NG。あくまで自分の深層心理を探るためのアクションとして提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "作業興奮の誘発",
+                "mission_title": "迷って動けない時、考えるのをやめて「資料のファイルを新規作成するだけ」等の物理的な第一歩を踏む",
+                "trigger_context": "思考がフリーズした時",
+                "tiny_habit": "ペンを1回握るだけ（PCの電源を入れるだけ）",
+                "theory": "E.クレペリン（心理学）。やる気が出ない時、感情を待つのではなく、着手のハードルを極限まで下げて「まず筋肉を動かす」ことでドーパミンを出し、モチベーションを後追いさせる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「そのまま作業を完了させる」等の高いハードルは絶対NG。純粋な筋肉運動（第一歩）のみを代替案として含めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "限界効用逓減の法則",
+                "mission_title": "「完璧」を目指して長引いている作業に対し「ここから先は労力に見合わない」と判断し今すぐ終わらせる",
+                "trigger_context": "作業が長引いて疲労を感じた時",
+                "tiny_habit": "「もう十分だ」と1回声に出すだけ（保存ボタンを1回押すだけ）",
+                "theory": "H.ゴッセン等（経済学）。作業量が増えるにつれ、1単位あたりの追加的な価値（クオリティの向上）は次第に減少していくため、完璧を求めず適切なポイントで損切りをする。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「すべての作業を適当に終わらせる」等は絶対NG。すでに十分時間を使ったタスクの切り上げに限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "サティスファイシング",
+                "mission_title": "今日のランチ等を選ぶ際、「〇〇であればOK」という最低基準を決め、それを満たす最初に出たものに即決する",
+                "trigger_context": "メニューや選択肢を見る前",
+                "tiny_habit": "「何でもいい」と1回つぶやくだけ（一番上のメニューを1秒で指差すだけ）",
+                "theory": "H.サイモン（行動経済学）。最大化（マキシマイザー）を求めず、事前に決めた「十分な基準」を満たした最初の選択肢で決断を終えることで、決断疲れと後悔を防ぐ。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「仕事の重大な決断を適当にする」等は絶対NG。日常のどうでもいい決断においての即決を提案すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "コミットメント・デバイス",
+                "mission_title": "誰かに「15時までに〇〇を送ります」と先に宣言し、自分自身に逃げられないプレッシャーをかける",
+                "trigger_context": "チャットやメールを打つ時",
+                "tiny_habit": "チャットの入力欄を開くだけ（「〇時までにやる」と自分のメモに1行書くだけ）",
+                "theory": "行動経済学。将来サボってしまう自分の行動を縛るために、今のうちに社会的プレッシャーや制限を自ら課すことで、現在バイアスに打ち勝つ仕組み。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「絶対に達成できない過酷な宣言をする」等は絶対NG。日常の小さな約束の宣言に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ストレスの再評価介入",
+                "mission_title": "緊張で心臓がドキドキした時「体が酸素を送り込んで、私を助けようとしている」と声に出して実況する",
+                "trigger_context": "プレッシャーを感じて動悸がした時",
+                "tiny_habit": "「心臓が動いている」と1回心でつぶやくだけ（胸に1回手を当てるだけ）",
+                "theory": "A.クラム（スタンフォード大）。ストレス反応を「悪いもの」ではなく「パフォーマンスを上げるための体の支援」と肯定的に捉え直すことで、血管が拡張しパフォーマンスが実際に向上する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「無理にテンションを上げて興奮状態にする」等は絶対NG。事実の再解釈という静かなアプローチに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ラピッド・プロトタイピング",
+                "mission_title": "何から手をつければいいか分からないタスクに対し、メモ帳に「世界一雑でひどい構成案（箇条書き3つ）」を1分で作る",
+                "trigger_context": "タスクの全体像が見えずに立ち止まった時",
+                "tiny_habit": "「あ」と1文字だけメモに書く（白紙のノートを1秒眺めるだけ）",
+                "theory": "デザイン思考 / ソフトウェア工学。最初から完成品を目指さず、即座に低解像度の試作品（プロトタイプ）を作ることで心理的ハードルを下げ、フィードバックのサイクルを最速で回す。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「そのまま完璧な資料を作る」等は絶対NG。「雑でひどい出来でいい」という逃げ道を強調すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            }
+        ],
+        "水": [
+            {
+                "name": "認知的脱フュージョン",
+                "mission_title": "ネガティブな自動思考に「名札」をつける",
+                "trigger_context": "鏡を見た時",
+                "tiny_habit": "「あ、今不安が浮かんだ」と一瞬気づくだけ",
+                "theory": "S.ヘイズ（ACT）の理論。「私はダメだ」という思考に対し、「私はダメだ【と思った】」と語尾に名札をつけることで、思考と自分自身を物理的に切り離し、感情の暴走を防ぐことができる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「ポジティブに考え直す」等の無理な認知操作は絶対NG。あくまで「観察するだけ」の距離感を保つこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "セルフ・コンパッション",
+                "mission_title": "親友にかけるような優しい言葉を自分にかける",
+                "trigger_context": "手を洗う時",
+                "tiny_habit": "自分の肩を1秒だけ優しく撫でる",
+                "theory": "K.ネフ（テキサス大）の理論。失敗した時、自分を厳しく責めるのではなく、大切な親友が落ち込んでいる時と同じような「受容的で優しい言葉」をかけることで、自己肯定感と立ち直る力（レジリエンス）が高まる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「問題から完全に逃げて自分を甘やかす」ような無責任な表現は絶対NG。事実の受容と優しさを両立させること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "自己距離化（フライ・オン・ザ・ウォール）",
+                "mission_title": "「天井に止まったハエ」の視点から自分を観察する",
+                "trigger_context": "天井を見上げた時",
+                "tiny_habit": "「一匹のハエ」を頭の中に1秒だけ思い浮かべる",
+                "theory": "E.クロス（ミシガン大）の研究。今の自分を「天井に止まっているハエ」の視点から第三者のように見下ろして観察することで、感情に飲み込まれるのを防ぎ、冷静なメタ認知を取り戻すことができる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「感情を完全に殺して冷酷になる」ようなロボット的な表現は絶対NG。あくまで客観的な視点を提供するに留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ラディカル・アクセプタンス",
+                "mission_title": "「今日は疲れている」という現状を一切否定せずに受け入れる",
+                "trigger_context": "ベッドやソファに腰掛けた時",
+                "tiny_habit": "「今はこういう状態だ」と1回だけ声に出す",
+                "theory": "弁証法的行動療法（DBT）の手法。変えられない現実やネガティブな状態を、「良い・悪い」でジャッジせず、ただ「事実としてそこに存在する」と徹底的に受け入れることで、無駄な心理的抵抗（苦悩）をストップさせる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「人生に絶望し無気力になる」等の学習性無力感を促す表現は絶対NG。受容＝諦めではないことを意識すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "リフレーミング",
+                "mission_title": "嫌だった出来事を「〇〇を学ぶテストだった」と言い換える",
+                "trigger_context": "靴を脱ぐ時",
+                "tiny_habit": "「まあいいか」と1回だけつぶやく",
+                "theory": "認知心理学の手法。物事の枠組み（フレーム）を変えて別の視点から意味づけを行うことで、ネガティブな記憶の解釈を変え、前向きな教訓へと変換することができる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「無理やり素晴らしい経験だったと思い込む」ような有毒なポジティブ（トキシック・ポジティビティ）は絶対NG。現実的な教訓に落とし込むこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ソクラテス式問答法",
+                "mission_title": "自分の「絶対に無理だ」という思い込みに反証する",
+                "trigger_context": "PCやノートを閉じた時",
+                "tiny_habit": "「本当にそうか？」と心で1回だけ問う",
+                "theory": "A.ベック等の認知療法。自分が無意識に信じ込んでいるネガティブな結論に対し、「その証拠は100%確実か？」「他の解釈はないか？」と自問自答することで、認知の歪み（思い込み）に気づくことができる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「証拠を何時間も探して自己分析する」等の高負荷タスクは絶対NG。一瞬の自問自答による気づきにフォーカスすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "マインドフル・リスニング",
+                "mission_title": "環境音だけをジャッジせずに1分間聴き続ける",
+                "trigger_context": "イヤホンやヘッドホンを外した時",
+                "tiny_habit": "一番近くの音を1つだけ認識する",
+                "theory": "マインドフルネスの基本技法。「この音はうるさい」などの評価や判断を交えず、ただ今聞こえてくる環境音に意識を集中することで、脳の自動操縦状態（マインドワンダリング）をストップさせ、脳を休ませる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「10分間本格的な瞑想をする」等の高いハードルは絶対NG。あくまで日常の数秒〜1分程度の極小アクションとすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "オーバービュー・エフェクト",
+                "mission_title": "「この宇宙の中で自分の悩みはどれくらいのサイズか」を考える",
+                "trigger_context": "空を見上げた時（または地図アプリを開いた時）",
+                "tiny_habit": "空の広さを1秒だけ感じる",
+                "theory": "F.ホワイトが提唱した概念。宇宙飛行士が地球を外から見て価値観が変わる現象を応用し、自分の視座を日常のスケールから宇宙規模へと強制的に引き上げることで、目の前のストレスを極小化するメタ認知手法。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「自分の存在価値は無意味だ」と虚無主義（ニヒリズム）に陥らせる表現は絶対NG。悩みからの解放感だけを強調すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "拡張形成理論",
+                "mission_title": "動物の癒やされる動画や自然の風景を意図的に見る",
+                "trigger_context": "スマホのロックを解除した時",
+                "tiny_habit": "癒やされる画像を1秒だけ見る",
+                "theory": "B.フレドリクソンが提唱。ポジティブな感情（喜びや安らぎ）を意図的に引き起こすことで、一時的に思考や行動の選択肢（視野）が広がり、問題解決の新しいアプローチを思いつきやすくなる現象。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「動画を何時間も見て現実逃避する」等の浪費行動は絶対NG。数十秒程度の限定的な気分転換とすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ジョハリの盲点の窓の解放",
+                "mission_title": "人からよく指摘される「自分のポジティブなクセや特徴」を1つ書き出す",
+                "trigger_context": "手帳やノートを開いた時",
+                "tiny_habit": "過去に褒められた単語を1つだけ思い浮かべる",
+                "theory": "J.ルフトとH.インガムの対人心理学モデル。自分では気づいていないが他人は知っている「盲点の窓」にフォーカスし、他者からのポジティブなフィードバックを再認識することで、自己受容を深める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「他人に長文のフィードバックを求める」等の対人ハードルは絶対NG。過去の記憶からの抽出（一人で完結する作業）に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "イレイシズム（三人称の自己対話）",
+                "mission_title": "悩んでいることに対し、心の中で「（自分の名前）はどうするべきか？」と問う",
+                "trigger_context": "一人で歩き出した時",
+                "tiny_habit": "心の中で自分の名前を1回呼ぶだけ",
+                "theory": "E.クロス（ミシガン大）の研究。心の中の独り言の主語を「私」から「自分の名前（三人称）」に変えるだけで、他人の問題を解決するように客観的で論理的な思考回路が働き、感情の暴走を抑えられる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「声に出して長文の独り言を言う」等の不自然な行動は絶対NG。あくまで脳内のサイレントな対話に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "グロース・マインドセットの意識化",
+                "mission_title": "「自分にはできない」と思った瞬間、最後に「…今のところは（まだ）」と付け足す",
+                "trigger_context": "ため息をついた時",
+                "tiny_habit": "メモに「まだ」と2文字書くだけ",
+                "theory": "C.ドゥエック（スタンフォード大）の理論。能力は固定されているという思い込み（硬直マインドセット）に対し、否定的な自己評価の語尾に「Yet（まだ）」をつけることで、未来の成長の余地を脳に認識させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「今すぐできるようになるため猛特訓する」等のプレッシャーは絶対NG。「今はできなくて当然」という安心感をベースにすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "葉っぱの上の思考",
+                "mission_title": "頭に浮かんだ不安を「川を流れる葉っぱ」の上に乗せ、通り過ぎるのをイメージする",
+                "trigger_context": "顔を洗う時",
+                "tiny_habit": "「流れた」と心で1回唱えるだけ",
+                "theory": "S.ヘイズ（ACT）の代表的なメタファー。思考を自分と同一化させず、ただ脳という川を流れていく「現象」として観察することで、ネガティブな思考への執着（フュージョン）を解除する。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「不安を完全に消し去るまで瞑想する」等は絶対NG。思考を「消す」のではなく「ただ眺める」という本来のACTの目的から逸脱しないこと。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "知的謙遜",
+                "mission_title": "分からない言葉や事象に対して「私はこれについてまだ知らない」と声に出して認める",
+                "trigger_context": "ニュースや新しい情報を見た時",
+                "tiny_habit": "「知らない」と1回心でつぶやくだけ",
+                "theory": "認知科学の概念。自分の知識の限界を恐れずに認める態度（知的謙遜）を持つことで、防衛本能による知的な盲点が外れ、新しい情報を正確に学習・吸収する能力が飛躍的に高まる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「自分は無能だと激しく落ち込む」等の自己卑下は絶対NG。知らないことを「成長の伸びしろ」として肯定的に捉える表現にすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "メタ認知の意識化",
+                "mission_title": "強い感情を感じた時、「なぜ私は今この感情を抱いているのか？」ともう一人の自分が質問する",
+                "trigger_context": "イラッとした瞬間（または焦った瞬間）",
+                "tiny_habit": "「なぜ？」と心の中で1回疑問符を浮かべるだけ",
+                "theory": "J.フラベルの心理学理論。「自分の認知活動（怒っている等）そのものを、一段上から認知する」ことで、大脳辺縁系（感情）の暴走にブレーキをかけ、前頭葉（理性）を起動させる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「なぜなぜ分析を延々と繰り返す」等の泥沼化は絶対NG。最初の1回の「気づき」だけに留め、脳のモードを切り替えることを目的とすること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "ダニング＝クルーガー効果のメタ認知",
+                "mission_title": "自分が自信満々に判断したことに対し、「私がまだ見落としている前提条件は何か？」と疑う",
+                "trigger_context": "仕事のメールを送信する直前",
+                "tiny_habit": "「何か見落としは？」と1秒自問するだけ",
+                "theory": "Kruger & Dunningの認知心理学モデル。人は能力が低い時ほど自己評価を過大に見積もるというバイアスを防ぐため、あえて自分の「完璧だ」という確信に冷や水を浴びせ、致命的なミスを防ぐ。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「自分の決断を全て疑って行動をやめる（フリーズする）」等は絶対NG。確認したらすぐに行動に移る前提を持たせること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "確証バイアスの意図的打破",
+                "mission_title": "自分が「絶対に正しい」と思っている意見に対し、あえて真逆の意見（反対派の論理）を検索して読む",
+                "trigger_context": "ブラウザ（検索エンジン）を開いた時",
+                "tiny_habit": "検索窓に「〇〇 デメリット」と入力するだけ",
+                "theory": "P.ウェイソンの認知心理学理論。人は無意識に「自分の仮説を支持する情報（都合のいい情報）」ばかりを集める傾向があるため、意図的に反証データを探すことで視野狭窄を打ち破る。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「反対意見に完全に服従し意見を変える」等は絶対NG。あくまで「違う視点も取り入れる」というフラットな情報収集に留めること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "マインドワンダリングの許容",
+                "mission_title": "次の休憩の2分間、スマホを一切見ずに窓の外の風景等をただぼーっと眺める",
+                "trigger_context": "一息つくためにコーヒー等を淹れた時",
+                "tiny_habit": "窓の外を1秒見るだけ",
+                "theory": "M.コーバリス等（脳科学）の研究。意識的な思考（タスク処理）を手放し、「心がさまよう（ぼーっとする）」状態を作ることで、デフォルト・モード・ネットワーク（DMN）が活性化し、創造的なアイデアが閃きやすくなる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「スマホを見ながらダラダラ休憩する」等のドーパミン浪費行動は絶対NG。必ず『情報の入力（インプット）がない状態』を作るよう指示すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "セルフ・コンパッション・ブレイク",
+                "mission_title": "失敗した時、胸に手を当てて「これは苦しい瞬間だ」「誰もが同じように苦しむ」「私は私に優しくしよう」と唱える",
+                "trigger_context": "ミスをして落ち込んだ瞬間",
+                "tiny_habit": "胸に手を1秒当てるだけ",
+                "theory": "K.ネフ（ポジティブ心理学）の3ステップ介入。自分の苦痛を否定せず（マインドフルネス）、それを人類共通の体験として捉え（共通の人間性）、自分に優しさを向けることで、即座にオキシトシンを分泌させ心を鎮める。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「長時間瞑想して完璧に心を癒やす」等の高負荷な要求は絶対NG。数秒で完結する物理的・音声的なアプローチに限定すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            },
+            {
+                "name": "処理流暢性のヒューリスティック",
+                "mission_title": "複雑なタスクの名前を「資料を完成させる」ではなく「キーボードを5分叩く」等の簡単な言葉に書き換える",
+                "trigger_context": "TODOリストを確認した時",
+                "tiny_habit": "タスクの名前をメモ上で1文字だけ書き換える",
+                "theory": "Alter & Oppenheimer（認知心理学）の研究。人間は、情報が処理しやすい（流暢である・簡単な言葉である）ほど、そのタスク自体を「簡単だ」「安全だ」と錯覚しやすい現象を利用し、着手のハードルを下げる。",
+                "ai_guardrail": "【翻訳時の絶対ルール】「タスクを完全に終わらせる」というプレッシャーは絶対NG。あくまで「見え方（ラベル）を変えるだけ」という認知のハックに徹すること。",
+                "rule": "【生成ルール】以下のフォーマットにJSONの各変数を厳格に代入して出力せよ。文章のトーンはユーザーに優しく寄り添う形とし、最後は必ずBYAF法（この魔法を使うかどうかはあなたの自由です）で締めくくること。"
+            }
+        ]
+    } # ← 🚨ここで weapons_db を閉じます
+
+    # 3. 日替わりローテーション（毎日違う武器を選出）
+    # サーバーのタイムゾーンに依存せず、強制的に日本時間(JST)を取得する
+    # target_date を渡すと、その日の武器を選ぶ（夜間バッチで翌日分を作る時）
+    target_date = target_date or datetime.datetime.now(JST).date()
+    today_str = target_date.strftime("%Y%m%d")
+    seed_string = f"{user_id}_{today_str}"
+    
+    # Pythonのhash()は実行毎に変わるため、安定したハッシュとして簡易的に文字コード合計を使う
+    hash_val = sum(ord(c) for c in seed_string)
+    
+    category_weapons = weapons_db.get(element, weapons_db["土"])
+    selected_weapon = category_weapons[hash_val % len(category_weapons)]
+
+    return selected_weapon
+
+# ==========================================
+# デイリー機能：AIからJSONデータを取得する関数
+# ==========================================
+def get_daily_fortune_json(client, user_traits, daily_data, mind_reason, user_id, target_date=None):
+    # 1. 今日の武器をシステム（Python）が決定する
+    today_weapon = get_daily_science_weapon(mind_reason, user_id, target_date)
+    
+    # 2. 決定した武器の情報は、テンプレート（全員共通・キャッシュ対象）の後ろに固定変数スロットの値として渡す
+    weapon_values = "【⚔️本日の固定変数の値】上記の各スロットには、以下の値をそのまま（意味・用語を省略せずに）代入すること。\n"
+    weapon_values += f"[WEAPON_NAME] = {today_weapon.get('name', '')}\n"
+    weapon_values += f"[WEAPON_THEORY] = {today_weapon.get('theory', '')}\n"
+    weapon_values += f"[MISSION_TITLE] = {today_weapon.get('mission_title', '')}\n"
+    weapon_values += f"[TRIGGER_CONTEXT] = {today_weapon.get('trigger_context', '')}\n"
+    weapon_values += f"[TINY_HABIT] = {today_weapon.get('tiny_habit', '')}\n"
+
+    # 3. LLMに「安全な自由」を与えて美しいUXライティングを生成させる（出力の形はスキーマで固定する）
+    #    claude-sonnet-4-6 が遅い・落ちている時は gpt-4o にヘッジ・切り替えする（llm.router）
+    #    結果は1日分キャッシュされるので、打ち切られた・欠けた出力は使わずにエラーにする（次の表示で作り直す）
+    data = route_structured(
+        "daily", "daily_fortune", DAILY_FORTUNE_SCHEMA,
+        system=cached_system(SYSTEM_PROMPT_TEMPLATE, weapon_values),
+        messages=[
+            {"role": "user", "content": f"ユーザー特性: {user_traits}, 今日のデータ: {daily_data}"}
+        ],
+        description="今日の運勢・本日のフォーカス・今日のミッションを出力する",
+        clients={"anthropic": client},
+        partial_ok=False,
+        temperature=0.7,
+    )
+    if not is_complete(data, DAILY_FORTUNE_SCHEMA):
+        raise LLMJSONError("今日の運勢の出力に空の項目があります")
+    return data
+
+def generate_daily_content(client, user_data_for_ai, scores_for_ai, today_res, user_id, target_date=None):
+    user_traits_str = f"職業:{user_data_for_ai.get('Job')}, 悩み:{user_data_for_ai.get('Pains')}, O:{scores_for_ai['O']}, C:{scores_for_ai['C']}, E:{scores_for_ai['E']}, A:{scores_for_ai['A']}, N:{scores_for_ai['N']}"
+    
+    # ▼ 修正：好転させられる含みを持たせる
+    defense_prompt = ""
+    if today_res['score'] <= 3:
+        defense_prompt = "【特殊条件: 防衛戦】今日は運勢（環境負荷）が悪いですが、やり方次第で運勢を好転させられるという含みを持たせてください。無理に攻めず、自分を守る防御的なミッション（ノイズ遮断、休息、内省、ダメージコントロール等）を提案すること。"
+        
+    daily_data_str = f"今日の波:{today_res['title']}, 環境:{today_res['env_reason']}, 精神:{today_res['mind_reason']} {defense_prompt}"
+    
+    return get_daily_fortune_json(client, user_traits_str, daily_data_str, today_res.get('mind_reason', ''), user_id, target_date)
+
+def profile_for_ai(user):
+    # AIパーソナライズ用データ（職業・悩み・北極星と Big5）。読めない値は標準値にする
+    user_data_for_ai = {k: user.get(k) for k in ("Job", "Pains", "Free_Text")}
+    scores_for_ai = {k: 3.0 for k in BIG5_KEYS}
+    try: scores_for_ai = {k: float(user.get(k)) for k in BIG5_KEYS}
+    except (TypeError, ValueError): pass
+    return user_data_for_ai, scores_for_ai
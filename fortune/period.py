@@ -0,0 +1,135 @@
+# ==========================================
+# 算命学：日・月・年の運勢スコア
+# ==========================================
+# app.py（画面）と fortune.pregenerate（夜間バッチ）の両方から使うので、Streamlit に依存しない形でここに置く
+import datetime
+
+def get_date_kanshi(target_date):
+    elapsed = (target_date - datetime.date(1900, 1, 1)).days
+    day_kanshi_num = (10 + elapsed) % 60 + 1
+    day_stem = (day_kanshi_num - 1) % 10 + 1
+    day_branch = (day_kanshi_num - 1) % 12 + 1
+    
+    stems_str = ["", "甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
+    branches_str = ["", "子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+    
+    solar_m = target_date.month if target_date.day >= 5 else target_date.month - 1
+    solar_y = target_date.year
+    if solar_m == 0:
+        solar_m = 12
+        solar_y -= 1
+    if solar_m == 1:
+        solar_y -= 1
+        
+    month_branch = (solar_m + 1) % 12
+    if month_branch == 0: month_branch = 12
+    year_branch = (solar_y - 3) % 12
+    if year_branch == 0: year_branch = 12
+    
+    month_stem = ((solar_y % 10) * 2 + solar_m) % 10
+    if month_stem == 0: month_stem = 10
+    year_stem = (solar_y - 3) % 10
+    if year_stem == 0: year_stem = 10
+    
+    return {
+        "day": stems_str[day_stem] + branches_str[day_branch],
+        "month": stems_str[month_stem] + branches_str[month_branch],
+        "year": stems_str[year_stem] + branches_str[year_branch],
+        "day_stem_idx": day_stem, "day_branch_idx": day_branch,
+        "month_stem_idx": month_stem, "month_branch_idx": month_branch,
+        "year_stem_idx": year_stem, "year_branch_idx": year_branch
+    }
+
+def calculate_period_score(user_nikkanshi, target_date, period_type="day"):
+    target = get_date_kanshi(target_date)
+    stems_str = ["", "甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
+    branches_str = ["", "子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+    
+    user_stem_str = user_nikkanshi[0]
+    user_branch_str = user_nikkanshi[1]
+    user_stem = stems_str.index(user_stem_str)
+    user_branch = branches_str.index(user_branch_str)
+    
+    if period_type == "day":
+        target_stem = target["day_stem_idx"]
+        target_branch = target["day_branch_idx"]
+    elif period_type == "month":
+        target_stem = target["month_stem_idx"]
+        target_branch = target["month_branch_idx"]
+    elif period_type == "year":
+        target_stem = target["year_stem_idx"]
+        target_branch = target["year_branch_idx"]
+    
+    env_score = 3
+    env_reason = "安定した通常期"
+    
+    tenchusatsu_map = {0: [11, 12], 2: [9, 10], 4: [7, 8], 6: [5, 6], 8: [3, 4], 10: [1, 2]}
+    diff = (user_branch - user_stem) % 12
+    t_branches = tenchusatsu_map.get(diff, [])
+    
+    if target_branch in t_branches:
+        env_score = 1
+        env_reason = "天中殺（リセット・向かい風）"
+    else:
+        if abs(user_branch - target_branch) == 6:
+            env_score = 1
+            env_reason = "冲（衝突・リセット）"
+        elif abs(user_branch - target_branch) in [4, 8]:
+            if user_stem == target_stem:
+                env_score = 5
+                env_reason = "大半会（異常な追い風）"
+            else:
+                env_score = 4
+                env_reason = "半会（スムーズな前進）"
+        elif (user_branch + target_branch) % 12 in [3, 5]:
+            env_score = 4
+            env_reason = "支合（結びつき・前進）"
+        elif abs(user_branch - target_branch) in [3, 9, 2, 10]:
+            env_score = 2
+            env_reason = "刑・害（調整・ノイズ）"
+            
+    mind_score = 3
+    mind_reason = "通常の精神状態"
+    
+    me_el = (user_stem - 1) // 2
+    other_el = (target_stem - 1) // 2
+    rel = (other_el - me_el) % 5
+    same_parity = (user_stem % 2) == (target_stem % 2)
+    
+    stars_matrix = [
+        ["貫索星(独立/守り)", "石門星(協調/政治)"],
+        ["鳳閣星(表現/伝達)", "調舒星(孤独/芸術)"],
+        ["禄存星(引力/回転財)", "司禄星(蓄積/家庭)"],
+        ["車騎星(攻撃/前進)", "牽牛星(責任/名誉)"],
+        ["龍高星(変化/忍耐)", "玉堂星(伝統/静寂)"]
+    ]
+    star_name = stars_matrix[rel][0 if same_parity else 1]
+    
+    if "車騎星" in star_name or "禄存星" in star_name: mind_score = 5; mind_reason = star_name
+    elif "貫索星" in star_name or "鳳閣星" in star_name: mind_score = 4; mind_reason = star_name
+    elif "石門星" in star_name or "司禄星" in star_name: mind_score = 3; mind_reason = star_name
+    elif "龍高星" in star_name or "調舒星" in star_name: mind_score = 2; mind_reason = star_name
+    else: mind_score = 1; mind_reason = star_name
+
+    total_score = env_score + mind_score
+    safe_score = max(1, min(10, total_score))
+    
+    action_dict = {
+        10: {"sym": "🌈", "title": "超幸運の波", "desc": "限界を超えて物事が予想以上の規模で大きく広がる奇跡的なタイミングです。", "points": ["限界を決めずにスケールの大きな目標を立てる", "直感を信じて、普段なら躊躇する大勝負に出る", "周囲を巻き込みながら、リーダーシップを発揮する"]},
+        9: {"sym": "⭐️", "title": "最高にツイてる波", "desc": "パズルのピースがピタッとハマるように物事が計画通りに進みます。", "points": ["夢の実現に向けて思い切って行動する", "自分の意見や感覚を大事にする", "ここで決めた目標や内容は、簡単には諦めない"]},
+        8: {"sym": "🔴", "title": "迷わず動く波", "desc": "心の奥底から情熱が湧き上がり、スピーディーに物事を前進させられる時です。", "points": ["頭で考える前に、まずは第一歩を踏み出す", "自分の思いやアイデアを積極的に発信する", "多少の失敗は気にせず、スピードを最優先する"]},
+        7: {"sym": "⚪️", "title": "思い切って決断する波", "desc": "これまでの曖昧な状態に白黒をつけ、新しいステージへ進むためのエネルギーに満ちています。", "points": ["先延ばしにしていた問題に明確な決断を下す", "不要な人間関係や悪習慣を思い切って断ち切る", "自分の信念を曲げず、毅然とした態度を貫く"]},
+        6: {"sym": "🟡", "title": "基礎を固める波", "desc": "派手な動きよりも、足元を固めて実力を蓄えることで運気が安定します。", "points": ["新しいことよりも、今あるタスクを丁寧に仕上げる", "周囲への感謝や手助けを惜しまない", "資産運用や貯蓄など、現実的な管理を見直す"]},
+        5: {"sym": "🟢", "title": "味方が増える波", "desc": "あなたの魅力が自然と伝わり、周囲との調和が生まれやすい時です。", "points": ["積極的に人と会い、コミュニケーションを楽しむ", "困っている人がいれば、損得抜きで手を差し伸べる", "新しいコミュニティや学びの場に参加してみる"]},
+        4: {"sym": "🔵", "title": "頭の中を整理する波", "desc": "外に向かって動くよりも、内省し、知識を吸収することで運気が研ぎ澄まされます。", "points": ["一人の時間を確保し、静かに自分と向き合う", "読書や勉強などで、新しい知識をインプットする", "現状のやり方に固執せず、柔軟な視点を取り入れる"]},
+        3: {"sym": "🟪", "title": "無理をしない波", "desc": "思い通りに進まないことや、人間関係での小さな摩擦が起きやすい調整期です。", "points": ["スケジュールに余白を持たせ、時間に余裕を行動する", "意見が対立した時は、一歩引いて相手を立てる", "ストレスを感じたら、無理せず早めに休息をとる"]},
+        2: {"sym": "⬜️", "title": "不要なものを手放す波", "desc": "物事がぶつかり合い、変化を余儀なくされる時です。不要なものを捨てる儀式です。", "points": ["執着している過去の栄光やネガティブな感情を捨てる", "部屋の掃除やデジタルデータの断捨離を徹底する", "予定が急に変わっても、焦らず流れに身を任せる"]},
+        1: {"sym": "⚫️", "title": "心と体を休ませる波", "desc": "現実の枠組みが外れ、コントロールが効かない「完全な休息とリセット」の期間です。", "points": ["新しい挑戦、大きな決断、高価な買い物は避ける", "損得勘定を捨て、ボランティアや人のために尽くす", "スマホやPCから離れ、たっぷりと睡眠をとる"]}
+    }
+    action_data = action_dict[safe_score]
+        
+    return {
+        "score": safe_score, "symbol": action_data["sym"], "title": action_data["title"],
+        "desc": action_data["desc"], "points": action_data["points"],
+        "env_reason": env_reason, "mind_reason": mind_reason, "date_str": target_date.strftime("%Y/%m/%d")
+    }
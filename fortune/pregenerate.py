@@ -0,0 +1,111 @@
+# ==========================================
+# 翌日分の「今日の運勢」を前日の夜に作っておくバッチ
+# ==========================================
+# 「今日」タブの AI 文章はその日最初に開いた時に Sonnet で作っていたため、朝一番の表示が1回の生成分待たされていた。
+# 必要な入力（翌日の calculate_period_score・翌日の武器・保存済みの職業/悩み/Big5）は前日に全部そろうので、
+# 最近使っているユーザーの分をまとめて作り、翌日分の置き場（翌日判定日・Blobs の翌日判定結果）へ入れておく。
+# 当日最初の表示で storage の cached_period が当日の置き場（日次判定日・日次判定結果）へ移して返す。
+# 当日の置き場に直接書かないのは、日付が変わるまでの利用で今日の分が作り直され、翌日分を上書きしてしまうため。
+#
+#   python -m fortune.pregenerate                    # 明日（JST）の分を作る（cron で毎晩）
+#   python -m fortune.pregenerate --date 2026-10-19  # 日付を指定する（今日以前なら当日の置き場へ直接書く）
+#   python -m fortune.pregenerate --dry-run          # 対象の人数だけ表示する
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from fortune.daily import JST, generate_daily_content, profile_for_ai
+from fortune.period import calculate_period_score
+from storage.backend import PERIOD_CACHE_COLUMNS, STAGED_PERIOD_COLUMNS
+from storage.rate_limit import BACKGROUND, request_priority
+from storage.schema import BIG5_KEYS
+
+# 同時に投げる生成の数（Anthropic のレート上限と Sheets の書き込み上限の両方に収まる程度）
+DEFAULT_CONCURRENCY = 4
+# この日数以内に「今日」タブを開いたか、ミッションをクリアした人を対象にする
+DEFAULT_ACTIVE_DAYS = 7
+
+DATE_FORMAT = "%Y/%m/%d"
+FIELDS = ["LINE_ID", "日干支", "Job", "Pains", "Free_Text", *BIG5_KEYS, "日次判定日", "最終EXP獲得日", "翌日判定日"]
+
+
+def _parse_date(text):
+    try: return datetime.datetime.strptime(text or "", DATE_FORMAT).date()
+    except ValueError: return None
+
+
+def is_active(user, today, active_days):
+    seen = [d for d in (_parse_date(user.get(c)) for c in ("日次判定日", "最終EXP獲得日")) if d]
+    return bool(seen) and (today - max(seen)).days <= active_days
+
+
+def find_targets(storage, target_date, active_days=DEFAULT_ACTIVE_DAYS):
+    # 戻り値: (全ユーザー数, 作る対象の UserRow のリスト)。対象日の分が既にある人は除く
+    today = datetime.datetime.now(JST).date()
+    key = target_date.strftime(DATE_FORMAT)
+    date_col = PERIOD_CACHE_COLUMNS["daily"][0]
+    staged_col = STAGED_PERIOD_COLUMNS["daily"][0]
+    users = storage.list_users(FIELDS)
+    targets = [
+        u for u in users
+        if u.get("日干支") and is_active(u, today, active_days) and key not in (u.get(date_col), u.get(staged_col))
+    ]
+    return len(users), targets
+
+
+def pregenerate_user(storage, client, user, target_date):
+    # プールのスレッドには優先度が引き継がれないので、ここで裏方の優先度にする（画面の読み書きを先に通す）
+    with request_priority(BACKGROUND):
+        line_id = user.get("LINE_ID")
+        user_data_for_ai, scores_for_ai = profile_for_ai(user)
+        day_res = calculate_period_score(user.get("日干支"), target_date, period_type="day")
+        payload = generate_daily_content(client, user_data_for_ai, scores_for_ai, day_res, line_id, target_date)
+        key = target_date.strftime(DATE_FORMAT)
+        if target_date <= datetime.datetime.now(JST).date():
+            storage.put_period_cache(line_id, "daily", key, payload)
+        else:
+            storage.stage_period_cache(line_id, "daily", key, payload)
+
+
+def pregenerate(storage, client, target_date, concurrency=DEFAULT_CONCURRENCY, active_days=DEFAULT_ACTIVE_DAYS, dry_run=False):
+    with request_priority(BACKGROUND):
+        total, targets = find_targets(storage, target_date, active_days)
+    stats = {"users": total, "targets": len(targets), "generated": 0, "failed": 0}
+    if dry_run or not targets:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pregenerate") as pool:
+        futures = {pool.submit(pregenerate_user, storage, client, u, target_date): u.get("LINE_ID") for u in targets}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                stats["generated"] += 1
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"[Pregenerate] {futures[future]}: {e}")
+    print(f"[Pregenerate] {target_date:%Y/%m/%d} 分: {stats['generated']}/{stats['targets']}人を作成（失敗 {stats['failed']}）")
+    return stats
+
+
+def main():
+    from llm import get_anthropic_client
+    from storage.backend import create_backend
+
+    parser = argparse.ArgumentParser(description="翌日分の「今日の運勢」を前もって作っておく")
+    parser.add_argument("--date", help="対象日（YYYY-MM-DD、省略時は JST の明日）")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="同時に投げる生成の数")
+    parser.add_argument("--active-days", type=int, default=DEFAULT_ACTIVE_DAYS, help="この日数以内に使った人を対象にする")
+    parser.add_argument("--dry-run", action="store_true", help="対象の人数だけ表示する")
+    args = parser.parse_args()
+
+    if args.date:
+        target_date = datetime.date.fromisoformat(args.date)
+    else:
+        target_date = datetime.datetime.now(JST).date() + datetime.timedelta(days=1)
+    storage = create_backend(cache=False)
+    stats = pregenerate(storage, get_anthropic_client(), target_date, args.concurrency, args.active_days, args.dry_run)
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from llm.streaming import stream_text, render_html, trim_partial_html
+from llm.parallel import get_executor, start_generation
+from llm.single_flight import SingleFlight, GenerationAborted, get_single_flight, WAIT_TIMEOUT_SEC
+from llm.prompt_cache import cached_block, cached_system, record_usage, usage_metrics
+from llm.telemetry import TelemetryStore, track, get_telemetry_store
+from llm.response_cache import ResponseCache, get_response_cache, cache_key
+from llm.gateway import CachedAnthropic, CachedOpenAI, cached_anthropic, cached_openai, get_anthropic_client, get_openai_client
+from llm.json_stream import IncrementalJSONParser, LLMJSONError, parse_llm_json
+from llm.structured import text_field, list_field, object_field, max_tokens_for, is_complete, create_structured, stream_structured, openai_structured, RequestCancelled
+from llm.router import RouteFailed, route_structured, router_metrics
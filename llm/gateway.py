@@ -0,0 +1,204 @@
+# ==========================================
+# LLM クライアントの入口（応答キャッシュを前に挟む）
+# ==========================================
+# app.py の anthropic_client / openai_client はこのラッパー越しに呼ぶ。使い方は元のクライアントと同じで、
+#   anthropic_client.messages.create(...) / anthropic_client.messages.stream(...)
+#   openai_client.chat.completions.create(...)
+# が同じ入力なら応答キャッシュ（llm.response_cache）から返る。
+# 対人レーダーや戦略会議のように、同じ入力でも毎回その人のために生成し直すべき呼び出しは cache=False を付ける。
+# 途中で打ち切られた応答（max_tokens 等）は保存しない。
+import threading
+
+from llm.response_cache import cache_key, get_response_cache
+from llm.telemetry import note_cache_hit
+
+# キャッシュに残してよい終了理由
+_ANTHROPIC_COMPLETE = {"end_turn", "stop_sequence"}
+_OPENAI_COMPLETE = {"stop"}
+# キャッシュから返すストリームの1回あたりの文字数（画面の描画を本物の生成と同じ経路で通すため）
+REPLAY_CHUNK_CHARS = 400
+
+
+class _Proxy:
+    # ラップしていない属性（models / beta など）はそのまま元のクライアントへ
+    def __init__(self, inner):
+        self._inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+def _replayed_message(body):
+    from anthropic.types import Message, Usage
+    message = Message.model_validate_json(body)
+    # キャッシュから返した分は API のトークンを使っていない
+    return message.model_copy(update={"usage": Usage(input_tokens=0, output_tokens=0)})
+
+
+class _ReplayStream:
+    # messages.stream() と同じ使い方（with ... as stream: / text_stream / get_final_message）で保存済みの応答を返す
+    def __init__(self, message):
+        self._message = message
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        # イベント単位で読む呼び出し（llm.structured のツール入力など）には、最後の get_final_message で全体を渡す
+        return iter(())
+
+    @property
+    def text_stream(self):
+        text = "".join(block.text for block in self._message.content if block.type == "text")
+        for i in range(0, len(text), REPLAY_CHUNK_CHARS):
+            yield text[i:i + REPLAY_CHUNK_CHARS]
+
+    def get_final_message(self):
+        return self._message
+
+
+class _RecordingStream:
+    # 本物のストリームをそのまま流し、最後まで受け取れたら保存する
+    def __init__(self, manager, cache, key):
+        self._manager = manager
+        self._cache = cache
+        self._key = key
+        self._stream = None
+
+    def __enter__(self):
+        self._stream = self._manager.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._manager.__exit__(*exc)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    @property
+    def text_stream(self):
+        return self._stream.text_stream
+
+    def get_final_message(self):
+        message = self._stream.get_final_message()
+        if message.stop_reason in _ANTHROPIC_COMPLETE:
+            self._cache.put(self._key, message.model_dump_json(), message.model)
+        return message
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _CachedMessages(_Proxy):
+    def __init__(self, inner, cache):
+        super().__init__(inner)
+        self._cache = cache
+
+    def create(self, cache=True, **params):
+        if not cache or self._cache is None:
+            return self._inner.create(**params)
+        key = cache_key("anthropic", "messages", params)
+        body = self._cache.get(key)
+        if body is not None:
+            note_cache_hit()
+            return _replayed_message(body)
+        message = self._inner.create(**params)
+        if message.stop_reason in _ANTHROPIC_COMPLETE:
+            self._cache.put(key, message.model_dump_json(), message.model)
+        return message
+
+    def stream(self, cache=True, **params):
+        if not cache or self._cache is None:
+            return self._inner.stream(**params)
+        key = cache_key("anthropic", "messages", params)
+        body = self._cache.get(key)
+        if body is not None:
+            note_cache_hit()
+            return _ReplayStream(_replayed_message(body))
+        return _RecordingStream(self._inner.stream(**params), self._cache, key)
+
+
+class CachedAnthropic(_Proxy):
+    def __init__(self, client, cache=None):
+        super().__init__(client)
+        self.messages = _CachedMessages(client.messages, cache)
+
+
+class _CachedCompletions(_Proxy):
+    def __init__(self, inner, cache):
+        super().__init__(inner)
+        self._cache = cache
+
+    def create(self, cache=True, **params):
+        if not cache or self._cache is None or params.get("stream"):
+            return self._inner.create(**params)
+        from openai.types.chat import ChatCompletion
+        key = cache_key("openai", "chat.completions", params)
+        body = self._cache.get(key)
+        if body is not None:
+            note_cache_hit()
+            completion = ChatCompletion.model_validate_json(body)
+            return completion.model_copy(update={"usage": None})
+        completion = self._inner.create(**params)
+        if completion.choices and all(c.finish_reason in _OPENAI_COMPLETE for c in completion.choices):
+            self._cache.put(key, completion.model_dump_json(), completion.model)
+        return completion
+
+
+class _CachedChat(_Proxy):
+    def __init__(self, inner, cache):
+        super().__init__(inner)
+        self.completions = _CachedCompletions(inner.completions, cache)
+
+
+class CachedOpenAI(_Proxy):
+    def __init__(self, client, cache=None):
+        super().__init__(client)
+        self.chat = _CachedChat(client.chat, cache)
+
+
+def cached_anthropic(client):
+    return CachedAnthropic(client, get_response_cache())
+
+
+def cached_openai(client):
+    return CachedOpenAI(client, get_response_cache())
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _client(name, factory):
+    if name not in _clients:
+        with _clients_lock:
+            if name not in _clients:
+                _clients[name] = factory()
+    return _clients[name]
+
+
+def get_anthropic_client():
+    # 画面と夜間バッチで共有するクライアント（API キーは環境変数 → secrets の順で読む）
+    def factory():
+        import anthropic
+        from cassette import cassette_anthropic, get_cassette
+        from storage.backend import _setting
+        cassette = get_cassette()
+        # カセットの再生中は本物のクライアントを作らない（API キーが無くても動くように）
+        inner = None if cassette.replaying else anthropic.Anthropic(api_key=_setting("ANTHROPIC_API_KEY", "ANTHROPIC_API_KEY", None))
+        return cached_anthropic(cassette_anthropic(inner, cassette))
+    return _client("anthropic", factory)
+
+
+def get_openai_client():
+    def factory():
+        from openai import OpenAI
+        from cassette import cassette_openai, get_cassette
+        from storage.backend import _setting
+        cassette = get_cassette()
+        inner = None if cassette.replaying else OpenAI(api_key=_setting("OPENAI_API_KEY", "OPENAI_API_KEY", None))
+        return cached_openai(cassette_openai(inner, cassette))
+    return _client("openai", factory)
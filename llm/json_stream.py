@@ -0,0 +1,248 @@
+# ==========================================
+# LLM が返す JSON の取り出し（ストリームの途中から少しずつ読む・壊れた所を直す）
+# ==========================================
+# 今日の運勢・トリアージは re.search(r'\{.*\}') で、戦略会議は find('{') / rfind('}') と '"}' の付け足し、
+# 改行のエスケープでの再挑戦で JSON を取り出していたため、どこか1文字崩れるだけで高価な生成が丸ごと無駄になっていた。
+# ここでは受け取った文字列を先頭から1回だけ読み進め、
+#   ・前後の挨拶やコードフェンス（```json）は読み飛ばす
+#   ・文字列の中のエスケープされていない " は、後ろに , } ] : が続かなければ本文の一部として扱う
+#   ・文字列の中の生の改行・タブはそのまま受け付ける
+#   ・途中で切れた（max_tokens 等）場合は、閉じていない文字列・配列・オブジェクトを閉じる
+#   ・足りないキーは呼び出し側が渡した既定値で埋める
+# 一番外側のオブジェクトの値は、閉じた時点で completed に入る（戦略会議の章ごとの表示に使う）。
+import copy
+import json
+
+# 引用符を閉じたと見なしてよい、直後の文字
+_CLOSERS = ",:}]"
+# カンマの後に来てよい文字（本文中の「"大丈夫", と言った」のような " を閉じと取り違えないため）
+_VALUE_STARTS = '"{[-0123456789tfn}]'
+_ESCAPABLE = '"\\/bfnrtu'
+
+
+class LLMJSONError(ValueError):
+    pass
+
+
+class IncrementalJSONParser:
+    def __init__(self, defaults=None):
+        # defaults: {キー: 既定値}。最後まで出てこなかったキーはこの値（のコピー）で埋める
+        self.defaults = defaults or {}
+        self.completed = {}
+        self.text = ""
+        self.done = False
+        self._out = []  # 直した後の文字列（1文字ずつ）
+        self._pos = 0  # text のどこまで読んだか
+        self._started = False
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"  # 一番外側のオブジェクトで次に来るもの: key / colon / value / comma
+        self._key = None
+        self._token_start = None  # 一番外側のキー・値が _out のどこから始まったか
+
+    def feed(self, chunk):
+        # 受け取った分を足して読み進める。新しく閉じた一番外側のキーのリストを返す
+        self.text += chunk
+        return self._scan(final=False)
+
+    def update(self, text):
+        # stream_text の render のように、それまでの全文を毎回渡される場合はこちら（増えた分だけ読む）
+        return self.feed(text[len(self.text):])
+
+    def _lookahead(self, start):
+        # start 以降で最初の空白でない文字の位置。読み終わっていなければ None
+        i = start
+        while i < len(self.text) and self.text[i].isspace():
+            i += 1
+        return i if i < len(self.text) else None
+
+    def _closes_string(self, pos, final):
+        # pos の " が文字列の終わりか。まだ判断できない（後ろが届いていない）時は None
+        i = self._lookahead(pos + 1)
+        if i is None:
+            return True if final else None
+        c = self.text[i]
+        if c not in _CLOSERS:
+            return False
+        if c != ",":
+            return True
+        j = self._lookahead(i + 1)
+        if j is None:
+            return True if final else None
+        return self.text[j] in _VALUE_STARTS
+
+    def _finish_value(self, end, newly):
+        raw = "".join(self._out[self._token_start:end]).strip()
+        value = _loads(raw)
+        if value is not _MISSING:
+            self.completed[self._key] = value
+            newly.append(self._key)
+        self._key = None
+        self._token_start = None
+        self._expect = "comma"
+
+    def _scan(self, final):
+        newly = []
+        text = self.text
+        while self._pos < len(text) and not self.done:
+            c = text[self._pos]
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                    self._stack.append("}")
+                    self._out.append(c)
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    if c not in _ESCAPABLE:
+                        # 「\ 」のような JSON にないエスケープは、\ そのものを本文として残す
+                        self._out.append("\\")
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    closes = self._closes_string(self._pos, final)
+                    if closes is None:
+                        break
+                    if not closes:
+                        self._out.append('\\"')
+                        self._pos += 1
+                        continue
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._out.append(c)
+                        self._pos += 1
+                        if self._expect == "key":
+                            raw_key = "".join(self._out[self._token_start:])
+                            key = _loads(raw_key)
+                            self._key = raw_key.strip('"') if key is _MISSING else key
+                            self._token_start = None
+                            self._expect = "colon"
+                        elif self._expect == "value":
+                            self._finish_value(len(self._out), newly)
+                        continue
+                self._out.append(c)
+                self._pos += 1
+                continue
+
+            depth = len(self._stack)
+            if c == '"':
+                self._in_string = True
+                if depth == 1 and self._expect in ("key", "value"):
+                    self._token_start = len(self._out)
+            elif c in "{[":
+                if depth == 1 and self._expect == "value" and self._token_start is None:
+                    self._token_start = len(self._out)
+                self._stack.append("}" if c == "{" else "]")
+            elif c in "}]":
+                if depth == 1 and self._expect == "value" and self._token_start is not None:
+                    # 数値・true などの値がそのまま閉じ括弧に続いた
+                    self._finish_value(len(self._out), newly)
+                self._stack.pop()
+                if not self._stack:
+                    self._out.append(c)
+                    self._pos += 1
+                    self.done = True
+                    break
+                if len(self._stack) == 1 and self._expect == "value":
+                    self._out.append(c)
+                    self._pos += 1
+                    self._finish_value(len(self._out), newly)
+                    continue
+            elif depth == 1:
+                if c == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif c == ",":
+                    if self._expect == "value" and self._token_start is not None:
+                        self._finish_value(len(self._out), newly)
+                    self._expect = "key"
+                elif not c.isspace() and self._expect == "value" and self._token_start is None:
+                    self._token_start = len(self._out)
+            self._out.append(c)
+            self._pos += 1
+        return newly
+
+    def partial(self):
+        # 書きかけの一番外側の値（文字列なら途中までの本文）。無ければ (None, None)
+        if self.done or self._expect != "value" or self._token_start is None:
+            return None, None
+        value = _close_partial("".join(self._out[self._token_start:]))
+        return (self._key, None) if value is _MISSING else (self._key, value)
+
+    def snapshot(self):
+        # completed に書きかけの値を足したもの（表示用。既定値では埋めない）
+        data = dict(self.completed)
+        key, value = self.partial()
+        if key is not None and value is not None:
+            data[key] = value
+        return data
+
+    def result(self):
+        # 残りを読み切り、途中で切れていれば閉じて、足りないキーを既定値で埋めた dict を返す
+        self._scan(final=True)
+        if not self._started:
+            raise LLMJSONError(f"JSON が見つかりません: {self.text[:80]!r}")
+        data = self.snapshot()
+        for key, default in self.defaults.items():
+            if key not in data:
+                data[key] = copy.deepcopy(default)
+        return data
+
+
+_MISSING = object()
+
+
+def _loads(raw):
+    try: return json.loads(raw, strict=False)
+    except ValueError: return _MISSING
+
+
+def _open_state(raw):
+    # raw の末尾で、文字列の中か・直前がエスケープか・閉じていない括弧（閉じる順）を返す
+    stack, in_string, escape = [], False, False
+    for c in raw:
+        if in_string:
+            if escape: escape = False
+            elif c == "\\": escape = True
+            elif c == '"': in_string = False
+        elif c == '"': in_string = True
+        elif c in "{[": stack.append("}" if c == "{" else "]")
+        elif c in "}]" and stack: stack.pop()
+    return in_string, escape, "".join(reversed(stack))
+
+
+def _close_partial(raw):
+    # 途中で切れた値を閉じて読む。入れ子の最後の要素が読めなければ、読める所まで削ってから閉じる
+    while raw:
+        in_string, escape, closing = _open_state(raw)
+        candidate = raw[:-1] if escape else raw
+        if in_string:
+            # 「\u30」のような書きかけのエスケープは落とす
+            cut = candidate.rfind("\\u")
+            if cut != -1 and len(candidate) - cut < 6:
+                candidate = candidate[:cut]
+            candidate += '"'
+        value = _loads(candidate + closing)
+        if value is not _MISSING:
+            return value
+        trimmed = raw.rstrip().rstrip(",:")
+        if trimmed != raw:
+            raw = trimmed
+            continue
+        # 最後のキー・要素を1つ落としてやり直す
+        head = raw[:-1]
+        cut = max(head.rfind(","), head.rfind("{"), head.rfind("["))
+        if cut <= 0:
+            break
+        raw = raw[:cut + 1] if raw[cut] in "{[" else raw[:cut]
+    return _MISSING
+
+
+def parse_llm_json(text, defaults=None):
+    # ストリームでない応答の全文から1回で取り出す
+    parser = IncrementalJSONParser(defaults)
+    parser.feed(text)
+    return parser.result()
@@ -0,0 +1,30 @@
+# ==========================================
+# AI生成の同時実行（スレッドプール）
+# ==========================================
+# ポータルを開いた日の最初の1回は、日次の運勢（Anthropic）・15ヶ月の月間解説・年間ロードマップ（gpt-4o-mini）が
+# タブの描画順に1つずつ生成され、待ち時間が足し算になっていた。ここでは足りない分をポータル読み込み時に
+# まとめてスレッドプールへ投げ、各タブは自分の結果を待つだけにする（待ち時間は一番遅い1本分になる）。
+# プールのスレッドには Streamlit の実行コンテキストが無いので、投げる関数の中では st.* を呼ばないこと。
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="llm")
+    return _executor
+
+
+def start_generation(key, fn, *args):
+    # key は (LINE_ID, 機能, 期間キー)。同じ key の生成が（別のセッションも含めて）走っていれば、その Future を返す。
+    # 生成中にウィジェットを触って再実行されたり、同じポータルを2つの画面で開いたりしても、同じ生成をもう1本投げないため
+    from llm.single_flight import get_single_flight
+    return get_single_flight().submit(key, fn, *args)
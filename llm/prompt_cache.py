@@ -0,0 +1,49 @@
+# ==========================================
+# プロンプトキャッシュ（Anthropic の cache_control）と使用トークンの集計
+# ==========================================
+# デイリーのシステムプロンプト・極秘レポートのHTML書式・レーダーの出力ルール・トリアージのスキル一覧（全90種）は
+# 毎回ほぼ同じ文章なのに、呼び出しのたびに最初から読ませていた。ここでは「変わらない前半」と「毎回変わる後半」に分け、
+# 前半の最後にキャッシュの区切り（cache_control）を置く。2回目以降は前半がキャッシュから読まれ、
+# 最初のトークンが出るまでの時間と入力トークンの料金が下がる。
+# ※前半がモデルの最小キャッシュ長（Sonnet は 1024 トークン）に満たない場合、API 側で区切りは無視される。
+import threading
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+_usage_lock = threading.Lock()
+USAGE_METRICS = {}
+
+
+def cached_block(text):
+    return {"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}
+
+
+def cached_system(static, dynamic=None):
+    # system= にそのまま渡せる形。static の末尾までがキャッシュされ、dynamic は毎回読まれる
+    blocks = [cached_block(static)]
+    if dynamic:
+        blocks.append({"type": "text", "text": dynamic})
+    return blocks
+
+
+def record_usage(label, usage):
+    # messages.create / stream の usage を呼び出し元（label）ごとに足し込む
+    if usage is None:
+        return
+    read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    with _usage_lock:
+        m = USAGE_METRICS.setdefault(label, {
+            "calls": 0, "input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0,
+        })
+        m["calls"] += 1
+        m["input_tokens"] += usage.input_tokens or 0
+        m["output_tokens"] += usage.output_tokens or 0
+        m["cache_read_tokens"] += read
+        m["cache_write_tokens"] += written
+    print(f"[LLM] {label}: 入力 {usage.input_tokens}（キャッシュ読込 {read}・書込 {written}）/ 出力 {usage.output_tokens} トークン")
+
+
+def usage_metrics():
+    with _usage_lock:
+        return {label: dict(m) for label, m in USAGE_METRICS.items()}
@@ -0,0 +1,156 @@
+# ==========================================
+# LLM の応答キャッシュ（入力の内容から決まるキーで、ローカルの SQLite に保存する）
+# ==========================================
+# 月間解説・年間ロードマップの判定キャッシュは str(current_year) をキーにユーザー行へ入れているだけなので、
+# 日干支から出るスコアの並び・職業・悩み・Big5 が同じでもユーザーごとに、また状況アップデートで消すたびに生成し直していた。
+# ここではモデル・パラメーター・（空白を整えた）プロンプトのハッシュをキーに、応答の全体を SQLite に保存する。
+# 古いもの（max_age_sec 超え）と、合計サイズが max_bytes を超えた分（最後に使われたのが古い順）は消していく。
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = "llm_cache.db"
+DEFAULT_MAX_MB = 200
+DEFAULT_MAX_AGE_DAYS = 30
+# サイズ・期限の掃除をする最短間隔
+EVICT_INTERVAL_SEC = 300
+# サイズ超過で消す時は、上限のこの割合まで減らす（毎回の put で少しずつ消さないため）
+EVICT_TARGET_RATIO = 0.9
+
+# キーに含めない引数（応答の中身を変えないもの）
+_IGNORED_PARAMS = {"stream", "timeout", "extra_headers", "metadata"}
+
+
+def normalize_prompt(text):
+    # 行ごとの前後の空白と空行の増減だけでキーが変わらないようにする（三重引用符の字下げなど）
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return normalize_prompt(value)
+    if isinstance(value, dict):
+        # cache_control はプロンプトキャッシュの区切りで、応答の中身は変えない
+        return {k: _normalize(v) for k, v in value.items() if k != "cache_control"}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(provider, endpoint, params):
+    payload = {
+        "provider": provider,
+        "endpoint": endpoint,
+        "params": _normalize({k: v for k, v in params.items() if k not in _IGNORED_PARAMS}),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    DDL = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        model TEXT,
+        body TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+    CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at);
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, max_age_sec=DEFAULT_MAX_AGE_DAYS * 86400):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.DDL)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.max_age_sec:
+                self.stats["misses"] += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.stats["hits"] += 1
+            return row[0]
+
+    def put(self, key, body, model=None):
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO responses (key, model, body, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET body = excluded.body, size = excluded.size, "
+                    "created_at = excluded.created_at, last_used = excluded.last_used",
+                    (key, model, body, len(body.encode("utf-8")), now, now),
+                )
+            self.stats["stores"] += 1
+            due = now - self._last_evict > EVICT_INTERVAL_SEC
+        if due:
+            self.evict()
+
+    def evict(self):
+        # 期限切れを消し、それでも合計サイズが上限を超えていれば最後に使われたのが古い順に消す。戻り値は消した件数
+        now = time.time()
+        with self._lock, self._conn:
+            self._last_evict = now
+            removed = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_sec,)).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                target = self.max_bytes * EVICT_TARGET_RATIO
+                doomed = []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                    if total <= target:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                removed += len(doomed)
+            self.stats["evicted"] += removed
+        return removed
+
+    def cache_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"], stats["bytes"] = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    # 設定は環境変数 → secrets の順（storage の設定と同じ読み方）。TAKE_PLAN_LLM_CACHE_MAX_MB=0 でキャッシュ自体を使わない
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from storage.backend import _setting
+                max_mb = float(_setting("TAKE_PLAN_LLM_CACHE_MAX_MB", "llm_cache_max_mb", DEFAULT_MAX_MB))
+                if max_mb <= 0:
+                    return None
+                _cache = ResponseCache(
+                    _setting("TAKE_PLAN_LLM_CACHE_PATH", "llm_cache_path", DEFAULT_CACHE_PATH),
+                    max_bytes=int(max_mb * 1024 * 1024),
+                    max_age_sec=float(_setting("TAKE_PLAN_LLM_CACHE_MAX_AGE_DAYS", "llm_cache_max_age_days", DEFAULT_MAX_AGE_DAYS)) * 86400,
+                )
+    return _cache
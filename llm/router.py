@@ -0,0 +1,173 @@
+# ==========================================
+# モデルの振り分け（遅い・落ちているプロバイダーを待ち続けない：ヘッジとフェイルオーバー）
+# ==========================================
+# 今日の運勢は claude-sonnet-4-6、月間解説・年間ロードマップは gpt-4o-mini に固定されていたため、
+# 片方のプロバイダーが遅い・エラーを返している時は、タイムアウトまで待たされた上で「エラーが発生しました」になっていた。
+# ここでは機能ごとに「主のモデル → 別プロバイダーの代わりのモデル」の順番と、待ってよい時間の上限を決め、
+#   ・主が最近の p90（llm.telemetry の記録。件数が少ない間は HEDGE_DEFAULT_SEC）を過ぎても返らなければ、
+#     代わりのモデルにも同じ依頼を出し（ヘッジ）、先に返った方を使う
+#   ・主がエラーなら、すぐ代わりのモデルに切り替える（フェイルオーバー）
+#   ・上限（LATENCY_BUDGET_SEC）を過ぎたら RouteFailed
+# とする。負けた方は止める。Anthropic はストリームで受けているので、次のイベントで接続を閉じる。
+# OpenAI は応答キャッシュに残せるよう一括で受けていて途中では止められないので、結果を捨て、
+# timeout（上限までの残り）で打ち切らせる。
+# どちらのプロバイダーも llm.structured のスキーマ付き出力（ツール入力 / json_schema）で受けるので、
+# 返る dict の形は同じになる。
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from llm.structured import openai_structured, stream_structured
+from llm.telemetry import get_telemetry_store
+
+ANTHROPIC = "anthropic"
+OPENAI = "openai"
+
+# 機能 → 試す順の (プロバイダー, モデル)
+ROUTES = {
+    "daily": [(ANTHROPIC, "claude-sonnet-4-6"), (OPENAI, "gpt-4o")],
+    "monthly": [(OPENAI, "gpt-4o-mini"), (ANTHROPIC, "claude-haiku-4-5")],
+    "yearly": [(OPENAI, "gpt-4o-mini"), (ANTHROPIC, "claude-haiku-4-5")],
+}
+# 機能ごとに待ってよい時間の上限（ヘッジした分も含めた全体）
+LATENCY_BUDGET_SEC = {"daily": 60, "monthly": 75, "yearly": 45}
+# 計測がまだ少ない間にヘッジするまでの時間
+HEDGE_DEFAULT_SEC = {"daily": 25, "monthly": 35, "yearly": 20}
+HEDGE_PERCENTILE = 90
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW_SEC = 86400
+# ヘッジするまでの時間の範囲（代わりのモデルにも上限内に返せる時間を残す）
+HEDGE_MIN_SEC = 2.0
+HEDGE_MAX_BUDGET_RATIO = 0.5
+
+MAX_WORKERS = 16
+
+_metrics_lock = threading.Lock()
+ROUTER_METRICS = {"calls": 0, "hedged": 0, "failover": 0, "alternate_wins": 0, "failed": 0}
+
+
+def _count(key):
+    with _metrics_lock:
+        ROUTER_METRICS[key] += 1
+
+
+def router_metrics():
+    with _metrics_lock:
+        return dict(ROUTER_METRICS)
+
+
+class RouteFailed(Exception):
+    pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # llm.parallel のプール（ポータルの生成そのもの）の中から呼ばれるので、同じプールで待ち合わせないよう別に持つ
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="llm-route")
+    return _executor
+
+
+def hedge_delay(feature, model):
+    budget = LATENCY_BUDGET_SEC[feature]
+    delay = None
+    store = get_telemetry_store()
+    if store is not None:
+        try:
+            delay = store.latency_percentile(feature, model, HEDGE_PERCENTILE, HEDGE_WINDOW_SEC, HEDGE_MIN_SAMPLES)
+        except Exception as e:
+            print(f"[Router] 計測の読み込みエラー: {e}")
+    if delay is None:
+        delay = HEDGE_DEFAULT_SEC[feature]
+    return min(max(delay, HEDGE_MIN_SEC), budget * HEDGE_MAX_BUDGET_RATIO)
+
+
+def _client_for(provider, clients):
+    if clients and clients.get(provider) is not None:
+        return clients[provider]
+    from llm.gateway import get_anthropic_client, get_openai_client
+    return get_anthropic_client() if provider == ANTHROPIC else get_openai_client()
+
+
+def _system_text(system):
+    # cached_system() のブロックのリストも、ただの文字列も受ける
+    if isinstance(system, list):
+        return "\n\n".join(block["text"] for block in system)
+    return system
+
+
+def _call(provider, model, client, feature, name, schema, system, messages, description, cancel, timeout, params):
+    # 1つのプロバイダーへの依頼。どちらも schema の形の dict を返す
+    if provider == ANTHROPIC:
+        if system:
+            params = dict(params, system=system)
+        return stream_structured(
+            client, name, schema, label=feature, description=description, cancel=cancel,
+            model=model, messages=messages, timeout=timeout, **params,
+        )
+    if system:
+        messages = [{"role": "system", "content": _system_text(system)}] + list(messages)
+    return openai_structured(client, name, schema, label=feature, model=model, messages=messages, timeout=timeout, **params)
+
+
+def route_structured(feature, name, schema, system, messages, description="", clients=None, **params):
+    # ROUTES[feature] の順にヘッジ・フェイルオーバーしながら、schema の形の dict を返す。
+    # clients: {"anthropic": ..., "openai": ...}。無いものは llm.gateway の共有クライアントを使う
+    routes = ROUTES[feature]
+    deadline = time.monotonic() + LATENCY_BUDGET_SEC[feature]
+    pending = {}  # Future → (プロバイダー, モデル, 止める合図)
+    errors = []
+    next_route = 0
+    hedge_at = None
+    _count("calls")
+
+    def launch():
+        nonlocal next_route, hedge_at
+        provider, model = routes[next_route]
+        next_route += 1
+        cancel = threading.Event()
+        timeout = max(1.0, deadline - time.monotonic())
+        future = _get_executor().submit(
+            _call, provider, model, _client_for(provider, clients), feature,
+            name, schema, system, messages, description, cancel, timeout, params,
+        )
+        pending[future] = (provider, model, cancel)
+        hedge_at = time.monotonic() + hedge_delay(feature, model) if next_route < len(routes) else None
+
+    launch()
+    try:
+        while pending:
+            wake = deadline if hedge_at is None else min(hedge_at, deadline)
+            done, _ = wait(list(pending), timeout=max(0.0, wake - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                provider, model, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(f"{provider}/{model}: {e}")
+                    print(f"[Router] {feature}: {provider}/{model} が失敗しました: {e}")
+                    continue
+                if (provider, model) != routes[0]:
+                    _count("alternate_wins")
+                return result
+
+            now = time.monotonic()
+            if now >= deadline:
+                errors.append(f"{LATENCY_BUDGET_SEC[feature]}秒の上限を超えました")
+                break
+            if next_route < len(routes) and (not pending or now >= hedge_at):
+                _count("hedged" if pending else "failover")
+                print(f"[Router] {feature}: {routes[next_route][0]}/{routes[next_route][1]} に{'ヘッジ' if pending else '切り替え'}します")
+                launch()
+    finally:
+        # 負けた・間に合わなかった呼び出しを止める
+        for _, _, cancel in pending.values():
+            cancel.set()
+    _count("failed")
+    raise RouteFailed(f"{feature} の生成に失敗しました（{' / '.join(errors)}）")
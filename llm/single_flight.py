@@ -0,0 +1,113 @@
+# ==========================================
+# 同じ生成の相乗り（シングルフライト）
+# ==========================================
+# 「戦略的ブリーフィングを開始する」の二度押し、「今日」の生成中の再読み込み、LINE の2つの画面で同じポータルを
+# 開いている場合などに、セッションごとに同じ日次・月次・年次・戦略会議の文章を生成し、同じセルへ書き込み合っていた。
+# ここではプロセス全体で (LINE_ID, 機能, 期間キー) ごとに走っている生成を1本だけ持ち、後から来た呼び出しは
+# その結果（例外も含む）を待つ。終わった結果は KEEP_RESULT_SEC だけ残し、書き込みより先にキャッシュを読んだ
+# 呼び出しが作り直さないようにする。失敗した生成は残さない（次の呼び出しで作り直す）。
+import threading
+import time
+from concurrent.futures import Future
+
+from llm.parallel import get_executor
+
+# 相乗りした側が待つ最長時間（超えたら concurrent.futures.TimeoutError）
+WAIT_TIMEOUT_SEC = 180
+# 終わった生成の結果を残しておく時間
+KEEP_RESULT_SEC = 120
+
+
+class GenerationAborted(Exception):
+    # 生成していたスクリプトが再実行などで途中で止められた（相乗りした側が生成を引き継ぐ）
+    pass
+
+
+class SingleFlight:
+    def __init__(self, keep_sec=KEEP_RESULT_SEC):
+        self.keep_sec = keep_sec
+        self._lock = threading.Lock()
+        self._calls = {}  # key → (Future, 残しておく期限)
+        self.stats = {"started": 0, "joined": 0}
+
+    def _claim(self, key):
+        # 戻り値: (Future, 自分が生成する側か)
+        now = time.monotonic()
+        with self._lock:
+            for k in [k for k, (f, expires) in self._calls.items() if f.done() and expires <= now]:
+                del self._calls[k]
+            entry = self._calls.get(key)
+            if entry is not None:
+                self.stats["joined"] += 1
+                return entry[0], False
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self._calls[key] = (future, float("inf"))
+            self.stats["started"] += 1
+            return future, True
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._calls.get(key, (None,))[0] is future:
+                del self._calls[key]
+
+    def _settle(self, key, future, fn, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._forget(key, future)
+            future.set_exception(e)
+        except BaseException:
+            # Streamlit の再実行・停止（st.rerun や二度押し）で止められた。止めた側の制御はそのまま上へ返す
+            self._forget(key, future)
+            future.set_exception(GenerationAborted(f"{key} の生成が途中で止められました"))
+            raise
+        else:
+            with self._lock:
+                if self._calls.get(key, (None,))[0] is future:
+                    self._calls[key] = (future, time.monotonic() + self.keep_sec)
+            future.set_result(result)
+
+    def run(self, key, fn, *args, timeout=WAIT_TIMEOUT_SEC, **kwargs):
+        # 呼び出したスレッドで生成する（st.* を使う生成用）。相乗りした側は timeout まで結果を待つ
+        while True:
+            future, leader = self._claim(key)
+            if leader:
+                self._settle(key, future, fn, args, kwargs)
+                return future.result()
+            try:
+                return future.result(timeout=timeout)
+            except GenerationAborted:
+                # 生成していた側が止められたので、こちらで作り直す
+                continue
+
+    def submit(self, key, fn, *args, **kwargs):
+        # スレッドプールで生成し、Future を返す（st.* を使わない生成用）
+        future, leader = self._claim(key)
+        if leader:
+            get_executor().submit(self._settle, key, future, fn, args, kwargs)
+        return future
+
+    def in_flight(self, key):
+        with self._lock:
+            entry = self._calls.get(key)
+        return entry is not None and not entry[0].done()
+
+    def forget_user(self, line_id):
+        # 職業・悩みの更新などで、そのユーザーの残している結果を使わないようにする（key の先頭が LINE_ID の前提）
+        with self._lock:
+            for k in [k for k in self._calls if k[0] == line_id]:
+                del self._calls[k]
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,51 @@
+# ==========================================
+# 長い生成のストリーミング表示（トークンが届いた端から画面に出す）
+# ==========================================
+# 極秘レポート（max_tokens 8000）・対人レーダー・月次戦略会議は messages.create で全文が返るまで何も表示されず、
+# その間は time.sleep の演出でつないでいた。ここでは messages.stream で受け取った文字を st.empty() の枠へ順に書き、
+# 全文がそろったら呼び出し元へ返す（保存は従来どおり全文で行う）。
+# 枠の書き換えは Streamlit へのメッセージ送信になるので、RENDER_INTERVAL_SEC ごとにまとめて行う。
+import time
+
+from llm.prompt_cache import record_usage
+from llm.telemetry import track
+
+RENDER_INTERVAL_SEC = 0.15
+
+
+def trim_partial_html(text):
+    # 書きかけのタグ（"<div cla" など）が生の文字として見えないよう、閉じていない末尾の "<" 以降を落とす
+    last_open = text.rfind("<")
+    if last_open != -1 and text.rfind(">") < last_open:
+        return text[:last_open]
+    return text
+
+
+def render_html(placeholder, text):
+    placeholder.markdown(trim_partial_html(text), unsafe_allow_html=True)
+
+
+def stream_text(client, placeholder=None, render=render_html, label="stream", **params):
+    # client.messages.stream(**params) の本文を返す。placeholder があれば render(placeholder, 途中の全文) で随時描画する。
+    # 使用トークンは label ごとに record_usage で集計し、1回ごとの計測は label を機能名として llm.telemetry に残す
+    chunks = []
+    last_render = 0.0
+    with track(label, params.get("model")) as call:
+        with client.messages.stream(**params) as stream:
+            for delta in stream.text_stream:
+                call.first_token()
+                chunks.append(delta)
+                now = time.monotonic()
+                if placeholder is not None and now - last_render >= RENDER_INTERVAL_SEC:
+                    render(placeholder, "".join(chunks))
+                    last_render = now
+            message = stream.get_final_message()
+        call.usage(message.usage)
+    record_usage(label, message.usage)
+
+    text = "".join(chunks)
+    if placeholder is not None and text:
+        render(placeholder, text)
+    if message.stop_reason == "max_tokens":
+        print(f"[LLM] max_tokens（{params.get('max_tokens')}）で出力が打ち切られました")
+    return text
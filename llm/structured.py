@@ -0,0 +1,206 @@
+# ==========================================
+# 構造化出力（Anthropic はツール呼び出し、OpenAI は json_schema で、決めた形の JSON だけを返させる）
+# ==========================================
+# 今日の運勢・トリアージ・月次戦略・年間ロードマップは「必ずJSON形式のみで出力し…」と文章で頼み、
+# 月間解説は「■年月」で区切った文章を split して読んでいたため、崩れた出力の読み直しや作り直しが起きていた。
+# ここでは機能ごとにスキーマを宣言し、その形の入力を持つツールを必ず呼ばせる（OpenAI は strict な json_schema）。
+# 文字列の maxLength（目安の文字数）から max_tokens も決める。
+import time
+
+from llm.json_stream import IncrementalJSONParser, LLMJSONError, parse_llm_json
+from llm.prompt_cache import record_usage
+from llm.streaming import RENDER_INTERVAL_SEC
+from llm.telemetry import track
+
+# 日本語は1文字あたり1トークン前後。目安の文字数を少し超えて書くことがあるので5割多めに見る
+TOKENS_PER_CHAR = 1.5
+# キー名・括弧・ツール呼び出しそのものの分
+TOKEN_OVERHEAD = 200
+TOKENS_PER_KEY = 10
+
+
+def text_field(description, max_chars, enum=None):
+    schema = {"type": "string", "description": description, "maxLength": max_chars}
+    if enum is not None:
+        schema["enum"] = list(enum)
+    return schema
+
+
+def list_field(description, items, max_items):
+    return {"type": "array", "description": description, "items": items, "maxItems": max_items}
+
+
+def object_field(properties, description=None):
+    # 全部のキーを必須にし、余計なキーは許さない（OpenAI の strict モードの条件でもある）
+    schema = {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+    if description:
+        schema["description"] = description
+    return schema
+
+
+def _output_tokens(schema):
+    kind = schema.get("type")
+    if kind == "object":
+        return sum(TOKENS_PER_KEY + _output_tokens(s) for s in schema["properties"].values())
+    if kind == "array":
+        return schema.get("maxItems", 1) * _output_tokens(schema["items"])
+    if kind == "string":
+        return schema.get("maxLength", 100) * TOKENS_PER_CHAR
+    return TOKENS_PER_KEY
+
+
+def max_tokens_for(schema):
+    return int(_output_tokens(schema)) + TOKEN_OVERHEAD
+
+
+def empty_value(schema):
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: empty_value(s) for key, s in schema["properties"].items()}
+    if kind == "array":
+        return []
+    return ""
+
+
+def fill_missing(data, schema):
+    # 途中で切れた応答などで足りないキーを空の値で埋める（入れ子のオブジェクトも）
+    if not isinstance(data, dict):
+        return empty_value(schema)
+    for key, sub in schema["properties"].items():
+        if key not in data:
+            data[key] = empty_value(sub)
+        elif sub.get("type") == "object":
+            data[key] = fill_missing(data[key], sub)
+    return data
+
+
+def is_complete(data, schema):
+    # 全部のキーがそろい、文字列が空でないか（fill_missing で埋めた空の値が残っていないか）
+    kind = schema.get("type")
+    if kind == "object":
+        return isinstance(data, dict) and all(k in data and is_complete(data[k], s) for k, s in schema["properties"].items())
+    if kind == "string":
+        return isinstance(data, str) and data.strip() != ""
+    return data is not None
+
+
+def _tool_params(name, schema, description, params):
+    params = dict(params)
+    params.setdefault("max_tokens", max_tokens_for(schema))
+    params["tools"] = [{"name": name, "description": description or name, "input_schema": schema}]
+    params["tool_choice"] = {"type": "tool", "name": name}
+    return params
+
+
+def _tool_input(message, name):
+    for block in message.content:
+        if block.type == "tool_use" and block.name == name:
+            return block.input
+    return None
+
+
+def _warn_truncated(stop_reason, params):
+    if stop_reason in ("max_tokens", "length"):
+        print(f"[LLM] max_tokens（{params.get('max_tokens')}）で出力が打ち切られました")
+
+
+def create_structured(client, name, schema, label, description="", **params):
+    # messages.create でツール name を必ず呼ばせ、その入力（dict）を返す
+    params = _tool_params(name, schema, description, params)
+    with track(label, params.get("model")) as call:
+        message = client.messages.create(**params)
+        call.usage(message.usage)
+        record_usage(label, message.usage)
+        _warn_truncated(message.stop_reason, params)
+        data = _tool_input(message, name)
+        if data is None:
+            call.parse_failure()
+            raise LLMJSONError(f"{name} の出力がありません（stop_reason={message.stop_reason}）")
+    return fill_missing(data, schema)
+
+
+class RequestCancelled(Exception):
+    # cancel（threading.Event）が立ったので受け取りを止めた
+    pass
+
+
+def stream_structured(client, name, schema, placeholder=None, render=None, label="stream", description="", cancel=None, partial_ok=True, **params):
+    # create_structured のストリーミング版。ツールの入力を受け取りながら読み、placeholder があれば
+    # render(placeholder, 書き終わった一番外側のキーの dict) で随時描画する。
+    # cancel が立ったら次のイベントで接続を閉じて RequestCancelled にする（llm.router のヘッジで負けた方）
+    # partial_ok=False なら、打ち切られた・読めなかった出力を使わずに LLMJSONError にする（保存して使い回す結果用）
+    params = _tool_params(name, schema, description, params)
+    parser = IncrementalJSONParser()
+    last_render = 0.0
+    with track(label, params.get("model")) as call:
+        with client.messages.stream(**params) as stream:
+            for event in stream:
+                if cancel is not None and cancel.is_set():
+                    call.mark_cancelled()
+                    raise RequestCancelled(f"{name} の生成を止めました")
+                if event.type != "input_json":
+                    continue
+                call.first_token()
+                parser.feed(event.partial_json)
+                now = time.monotonic()
+                if placeholder is not None and render is not None and now - last_render >= RENDER_INTERVAL_SEC:
+                    render(placeholder, dict(parser.completed))
+                    last_render = now
+            message = stream.get_final_message()
+        call.usage(message.usage)
+        record_usage(label, message.usage)
+        _warn_truncated(message.stop_reason, params)
+        if not partial_ok and message.stop_reason == "max_tokens":
+            call.parse_failure()
+            raise LLMJSONError(f"{name} の出力が途中で打ち切られました")
+
+        data = _tool_input(message, name)
+        if not data and parser.text:
+            if not partial_ok:
+                call.parse_failure()
+                raise LLMJSONError(f"{name} の出力を読み取れませんでした（stop_reason={message.stop_reason}）")
+            # 打ち切られた時は、受け取れた所までを閉じて使う
+            call.parse_failure()
+            data = parser.result()
+        if data is None:
+            call.parse_failure()
+            raise LLMJSONError(f"{name} の出力がありません（stop_reason={message.stop_reason}）")
+    data = fill_missing(data, schema)
+    if placeholder is not None and render is not None:
+        render(placeholder, data)
+    return data
+
+
+def _strict_schema(schema):
+    # OpenAI の strict モードが受け付けない目安（maxLength / maxItems）を外す
+    if isinstance(schema, dict):
+        return {k: _strict_schema(v) for k, v in schema.items() if k not in ("maxLength", "maxItems")}
+    if isinstance(schema, list):
+        return [_strict_schema(v) for v in schema]
+    return schema
+
+
+def openai_structured(client, name, schema, label=None, partial_ok=True, **params):
+    # chat.completions.create を json_schema（strict）で呼び、dict を返す。label は計測の機能名（省略時は name）
+    # partial_ok は stream_structured と同じ
+    params.setdefault("max_tokens", max_tokens_for(schema))
+    with track(label or name, params.get("model"), "openai") as call:
+        response = client.chat.completions.create(
+            response_format={"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": _strict_schema(schema)}},
+            **params,
+        )
+        call.usage(response.usage)
+        choice = response.choices[0]
+        if getattr(choice.message, "refusal", None):
+            call.parse_failure()
+            raise LLMJSONError(f"{name} の生成が拒否されました: {choice.message.refusal}")
+        _warn_truncated(choice.finish_reason, params)
+        if not partial_ok and choice.finish_reason == "length":
+            call.parse_failure()
+            raise LLMJSONError(f"{name} の出力が途中で打ち切られました")
+        try:
+            data = parse_llm_json(choice.message.content or "")
+        except LLMJSONError:
+            call.parse_failure()
+            raise
+    return fill_missing(data, schema)
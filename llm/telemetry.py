@@ -0,0 +1,333 @@
+# ==========================================
+# LLM 呼び出しの計測（機能ごとの待ち時間・トークン・料金）
+# ==========================================
+# 今日の運勢・極秘レポート・デイリーアドバイス・月間解説・年間ロードマップ・対人レーダー・トリアージ・戦略会議の
+# どれが待ち時間と料金の大半を占めているのかが分からなかった（record_usage はプロセス内の合計だけ）。
+# ここでは1回の呼び出しごとに
+#   機能名・モデル・入力／出力／キャッシュ読込のトークン・最初のトークンまでの時間・全体の時間・SDK の再試行回数・JSON の読み取り失敗
+# をローカルの SQLite に1行ずつ残し、機能ごとの p50 / p95 を集計できるようにする。
+#
+#   with track("daily_advice", "gpt-4o", "openai") as call:
+#       response = openai_client.chat.completions.create(...)
+#       call.usage(response.usage)
+#
+#   python -m llm.telemetry --hours 24     # 機能ごとの集計を表示
+#
+# 応答キャッシュから返した呼び出しは件数だけ数え、待ち時間の p50 / p95 には入れない。
+import argparse
+import contextlib
+import contextvars
+import logging
+import sqlite3
+import threading
+import time
+
+DEFAULT_TELEMETRY_PATH = "llm_telemetry.db"
+DEFAULT_KEEP_DAYS = 30
+# 古い行の掃除をする最短間隔
+PRUNE_INTERVAL_SEC = 3600
+
+# 100万トークンあたりの料金（USD）: (入力, 出力, キャッシュ読込, キャッシュ書込)。集計の目安用
+PRICE_PER_MTOK = {
+    "claude-sonnet-4-6": (3.00, 15.00, 0.30, 3.75),
+    "claude-haiku-4-5": (1.00, 5.00, 0.10, 1.25),
+    "gpt-4o": (2.50, 10.00, 1.25, 0.0),
+    "gpt-4o-mini": (0.15, 0.60, 0.075, 0.0),
+}
+
+# SDK（anthropic / openai）が自分で再送する時に出すログ。これを数えて再試行回数にする
+_SDK_LOGGERS = ("anthropic._base_client", "openai._base_client")
+_RETRY_MESSAGE = "Retrying request"
+
+# 別のモデルが先に返ったので途中で止めた呼び出し（llm.router のヘッジ）。エラーには数えない
+CANCELLED = "cancelled"
+
+_current = contextvars.ContextVar("llm_call", default=None)
+
+
+class CallRecord:
+    def __init__(self, feature, model, provider):
+        self.feature = feature
+        self.model = model
+        self.provider = provider
+        self.started_at = time.time()
+        self._start = time.monotonic()
+        self.ttft = None
+        self.latency = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.retries = 0
+        self.parse_failures = 0
+        self.cache_hit = False
+        self.status = "ok"
+
+    def first_token(self):
+        # ストリームで最初の文字（ツール入力）が届いた時に呼ぶ。2回目以降は何もしない
+        if self.ttft is None:
+            self.ttft = time.monotonic() - self._start
+
+    def usage(self, usage):
+        # Anthropic の usage（input_tokens はキャッシュ分を含まない）と OpenAI の usage（prompt_tokens は含む）の両方を受ける
+        if usage is None:
+            return
+        if hasattr(usage, "prompt_tokens"):
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+            self.input_tokens += (usage.prompt_tokens or 0) - cached
+            self.output_tokens += usage.completion_tokens or 0
+            self.cache_read_tokens += cached
+            return
+        self.input_tokens += usage.input_tokens or 0
+        self.output_tokens += usage.output_tokens or 0
+        self.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.cache_write_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+    def parse_failure(self):
+        self.parse_failures += 1
+
+    def mark_cancelled(self):
+        self.status = CANCELLED
+
+    def cost_usd(self):
+        price = PRICE_PER_MTOK.get(self.model)
+        if price is None:
+            return None
+        tokens = (self.input_tokens, self.output_tokens, self.cache_read_tokens, self.cache_write_tokens)
+        return sum(t * p for t, p in zip(tokens, price)) / 1_000_000
+
+
+class _RetryCounter(logging.Handler):
+    def emit(self, record):
+        call = _current.get()
+        if call is not None and record.getMessage().startswith(_RETRY_MESSAGE):
+            call.retries += 1
+
+
+_retry_counter = None
+_retry_counter_lock = threading.Lock()
+
+
+def _watch_sdk_retries():
+    global _retry_counter
+    if _retry_counter is not None:
+        return
+    with _retry_counter_lock:
+        if _retry_counter is None:
+            _retry_counter = _RetryCounter(logging.INFO)
+            for name in _SDK_LOGGERS:
+                logger = logging.getLogger(name)
+                logger.addHandler(_retry_counter)
+                if logger.getEffectiveLevel() > logging.INFO:
+                    logger.setLevel(logging.INFO)
+
+
+def current_call():
+    return _current.get()
+
+
+def note_cache_hit():
+    # 応答キャッシュから返した（llm.gateway から呼ぶ）
+    call = _current.get()
+    if call is not None:
+        call.cache_hit = True
+
+
+@contextlib.contextmanager
+def track(feature, model, provider="anthropic"):
+    _watch_sdk_retries()
+    call = CallRecord(feature, model, provider)
+    token = _current.set(call)
+    try:
+        yield call
+    except Exception as e:
+        if call.status == "ok":
+            call.status = type(e).__name__
+        raise
+    except BaseException:
+        # Streamlit の再実行などで途中で止められた
+        call.status = "aborted"
+        raise
+    finally:
+        _current.reset(token)
+        call.latency = time.monotonic() - call._start
+        store = get_telemetry_store()
+        if store is not None:
+            try:
+                store.record(call)
+            except Exception as e:
+                print(f"[LLM] 計測の保存エラー: {e}")
+
+
+def _percentile(values, p):
+    # 最近順位法（件数が少なくても実際に測った値のどれかを返す）
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+class TelemetryStore:
+    DDL = """
+    CREATE TABLE IF NOT EXISTS llm_calls (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at REAL NOT NULL,
+        feature TEXT NOT NULL,
+        provider TEXT,
+        model TEXT,
+        status TEXT NOT NULL,
+        input_tokens INTEGER NOT NULL,
+        output_tokens INTEGER NOT NULL,
+        cache_read_tokens INTEGER NOT NULL,
+        cache_write_tokens INTEGER NOT NULL,
+        ttft_ms REAL,
+        latency_ms REAL NOT NULL,
+        retries INTEGER NOT NULL,
+        parse_failures INTEGER NOT NULL,
+        cache_hit INTEGER NOT NULL,
+        cost_usd REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_llm_calls_feature ON llm_calls (feature, started_at);
+    CREATE INDEX IF NOT EXISTS idx_llm_calls_started_at ON llm_calls (started_at);
+    """
+
+    def __init__(self, path=DEFAULT_TELEMETRY_PATH, keep_sec=DEFAULT_KEEP_DAYS * 86400):
+        self.path = path
+        self.keep_sec = keep_sec
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.DDL)
+
+    def record(self, call):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO llm_calls (started_at, feature, provider, model, status, input_tokens, output_tokens, "
+                "cache_read_tokens, cache_write_tokens, ttft_ms, latency_ms, retries, parse_failures, cache_hit, cost_usd) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    call.started_at, call.feature, call.provider, call.model, call.status,
+                    call.input_tokens, call.output_tokens, call.cache_read_tokens, call.cache_write_tokens,
+                    call.ttft * 1000 if call.ttft is not None else None, call.latency * 1000,
+                    call.retries, call.parse_failures, int(call.cache_hit), call.cost_usd(),
+                ),
+            )
+            if now - self._last_prune > PRUNE_INTERVAL_SEC:
+                self._last_prune = now
+                self._conn.execute("DELETE FROM llm_calls WHERE started_at < ?", (now - self.keep_sec,))
+
+    def summary(self, since_sec=None, feature=None):
+        # 機能ごとの集計。待ち時間の p50 / p95 は API まで行った（キャッシュでない）成功した呼び出しだけで出す
+        query = ("SELECT feature, status, input_tokens, output_tokens, cache_read_tokens, ttft_ms, latency_ms, "
+                 "retries, parse_failures, cache_hit, cost_usd FROM llm_calls WHERE started_at >= ?")
+        args = [time.time() - since_sec if since_sec else 0]
+        if feature:
+            query += " AND feature = ?"
+            args.append(feature)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+
+        result = {}
+        samples = {}
+        for name, status, inp, out, cached, ttft, latency, retries, failures, hit, cost in rows:
+            m = result.setdefault(name, {
+                "calls": 0, "errors": 0, "cancelled": 0, "cache_hits": 0, "retries": 0, "parse_failures": 0,
+                "input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cost_usd": 0.0,
+            })
+            s = samples.setdefault(name, {"ttft": [], "latency": []})
+            m["calls"] += 1
+            m["errors"] += status not in ("ok", CANCELLED)
+            m["cancelled"] += status == CANCELLED
+            m["cache_hits"] += hit
+            m["retries"] += retries
+            m["parse_failures"] += failures
+            m["input_tokens"] += inp
+            m["output_tokens"] += out
+            m["cache_read_tokens"] += cached
+            m["cost_usd"] += cost or 0.0
+            if status == "ok" and not hit:
+                s["latency"].append(latency)
+                if ttft is not None:
+                    s["ttft"].append(ttft)
+        for name, m in result.items():
+            for metric in ("ttft", "latency"):
+                m[f"{metric}_p50_ms"] = _percentile(samples[name][metric], 50)
+                m[f"{metric}_p95_ms"] = _percentile(samples[name][metric], 95)
+        return result
+
+    def latency_percentile(self, feature, model, p, since_sec, min_samples=1):
+        # API まで行った呼び出しの全体の時間（秒）の p パーセンタイル。min_samples 件に満たなければ None。
+        # ヘッジで負けて止めた呼び出し（CANCELLED）も数に入れる。成功した分だけで測ると速く返った分しか残らず、
+        # p90 が下がってヘッジがどんどん早くなるので、止めた分は「止めた時点より遅い（どの成功より遅い）」として扱う
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT latency_ms, status FROM llm_calls WHERE feature = ? AND model = ? AND started_at >= ? "
+                "AND status IN ('ok', ?) AND cache_hit = 0",
+                (feature, model, time.time() - since_sec, CANCELLED),
+            ).fetchall()
+        if len(rows) < min_samples:
+            return None
+        ok = sorted(latency for latency, status in rows if status == "ok")
+        rank = max(1, -(-len(rows) * p // 100))
+        if len(ok) >= rank:
+            return ok[int(rank) - 1] / 1000
+        # p パーセンタイルが止めた分の中にある時は、分かっている一番長い時間を下限として返す
+        return max(latency for latency, _ in rows) / 1000
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_telemetry_store():
+    # 設定は環境変数 → secrets の順（storage の設定と同じ読み方）。TAKE_PLAN_LLM_TELEMETRY_KEEP_DAYS=0 で記録しない
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from storage.backend import _setting
+                keep_days = float(_setting("TAKE_PLAN_LLM_TELEMETRY_KEEP_DAYS", "llm_telemetry_keep_days", DEFAULT_KEEP_DAYS))
+                if keep_days <= 0:
+                    return None
+                _store = TelemetryStore(
+                    _setting("TAKE_PLAN_LLM_TELEMETRY_PATH", "llm_telemetry_path", DEFAULT_TELEMETRY_PATH),
+                    keep_sec=keep_days * 86400,
+                )
+    return _store
+
+
+def _fmt_ms(value):
+    return "-" if value is None else f"{value / 1000:.1f}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM 呼び出しの機能ごとの集計")
+    parser.add_argument("--hours", type=float, default=24, help="直近何時間分を集計するか（0 で全期間）")
+    parser.add_argument("--feature", default=None, help="この機能だけ集計する")
+    args = parser.parse_args(argv)
+
+    store = get_telemetry_store()
+    if store is None:
+        print("計測は無効です（TAKE_PLAN_LLM_TELEMETRY_KEEP_DAYS=0）")
+        return
+    summary = store.summary(args.hours * 3600 if args.hours else None, args.feature)
+    print(f"{'feature':<14}{'calls':>6}{'err':>5}{'hit':>5}{'retry':>6}{'parse':>6}"
+          f"{'TTFT p50':>10}{'p95':>8}{'total p50':>11}{'p95':>8}{'in':>10}{'out':>9}{'cached':>9}{'USD':>9}")
+    for name, m in sorted(summary.items(), key=lambda kv: -kv[1]["cost_usd"]):
+        print(f"{name:<14}{m['calls']:>6}{m['errors']:>5}{m['cache_hits']:>5}{m['retries']:>6}{m['parse_failures']:>6}"
+              f"{_fmt_ms(m['ttft_p50_ms']):>10}{_fmt_ms(m['ttft_p95_ms']):>8}"
+              f"{_fmt_ms(m['latency_p50_ms']):>11}{_fmt_ms(m['latency_p95_ms']):>8}"
+              f"{m['input_tokens']:>10}{m['output_tokens']:>9}{m['cache_read_tokens']:>9}{m['cost_usd']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
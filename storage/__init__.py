@@ -0,0 +1,9 @@
+from storage.sheets_client import SheetsClientPool, get_sheets_pool, get_worksheet
+from storage.row_index import RowIndex, get_row_index, fetch_user_row
+from storage.write_buffer import WriteBuffer, write_metrics
+from storage.schema import SheetSchema, UserRow, get_schema, invalidate_schema, ensure_columns, column_letter
+from storage.backend import StorageBackend, SheetsBackend, SQLiteBackend, create_backend, get_storage
+from storage.event_log import InsightLogger, get_insight_logger
+from storage.row_cache import CachingBackend
+from storage.blob_store import SheetsBlobStore, get_blob_store, BLOB_FIELDS
+from storage.rate_limit import RateLimitedSession, TokenBucket, request_priority, rate_limit_metrics, INTERACTIVE, BACKGROUND
@@ -0,0 +1,705 @@
+# ==========================================
+# ストレージバックエンド（Google Sheets / SQLite の切り替え）
+# ==========================================
+# 画面側はユーザー行・判定キャッシュ・戦略会議・スキル履歴・残回数・EXP・ログを
+# すべてここのメソッド経由で読み書きする。実装は2つ:
+#   SheetsBackend … 今まで通りのスプレッドシート（本番）
+#   SQLiteBackend … ローカルのSQLiteファイル（オフラインでの動作確認・ベンチマーク・ホットデータの退避先）
+# どちらを使うかは環境変数 TAKE_PLAN_STORAGE か secrets の storage_backend で選ぶ（既定は sheets）。
+# 各操作の所要時間はバックエンドごとに記録し、latency_summary() で比較できる。
+import collections
+import functools
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+import gspread
+import streamlit as st
+
+from storage.blob_store import BLOB_FIELDS, get_blob_store
+from storage.row_index import fetch_user_row, get_row_index
+from storage.schema import CANONICAL_HEADERS, SheetSchema, ensure_columns, get_schema
+from storage.sheets_client import get_or_create_worksheet, get_worksheet
+from storage.write_buffer import WriteBuffer
+
+LOG_SHEET = "Logs"
+META_SHEET = "Meta"
+META_HEADERS = ["key", "value"]
+DEFAULT_RADAR_LIMIT = 3
+DEFAULT_SQLITE_PATH = "take_plan.db"
+# 操作ごとに保持する所要時間の件数（古いものから捨てる）
+LATENCY_SAMPLES = 1000
+
+# Sheets の increment（compare-and-set）の設定
+CAS_TOKEN_FIELD = "更新トークン"
+# トークンの列に残す直近の書き込みの数（確認までにこれより多く書き込まれると、自分の分を見失って再試行する）
+CAS_TOKEN_HISTORY = 16
+# 書き込んでから確かめるまで待つ時間（同じ値を読んだ別プロセスの書き込みが先に届くのを待つ）
+CAS_SETTLE_SEC = 0.5
+CAS_MAX_ATTEMPTS = 5
+CAS_BACKOFF_SEC = 0.2
+
+# 判定キャッシュの種類 → (判定日の列, 判定結果の列)
+PERIOD_CACHE_COLUMNS = {
+    "daily": ("日次判定日", "日次判定結果"),
+    "monthly": ("月次判定日", "月次判定結果"),
+    "yearly": ("年次判定日", "年次判定結果"),
+}
+# 夜間バッチ（fortune.pregenerate）が前日に作っておく分の置き場 → (対象日の列, 判定結果の列)。
+# 当日の分と同じ列に先に書くと、日付が変わるまでの利用で今日の分が作り直されてしまうので分けておく
+STAGED_PERIOD_COLUMNS = {
+    "daily": ("翌日判定日", "翌日判定結果"),
+}
+
+
+def timed(op):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                self._record_latency(op, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class StorageBackend:
+    name = "base"
+
+    def __init__(self):
+        self._latency = {}
+        self._latency_lock = threading.Lock()
+        self._key_locks = collections.defaultdict(threading.Lock)
+        self._submission_locks = collections.defaultdict(threading.Lock)
+        self._key_locks_lock = threading.Lock()
+
+    # --- 計測 ---
+    def _record_latency(self, op, elapsed):
+        with self._latency_lock:
+            self._latency.setdefault(op, collections.deque(maxlen=LATENCY_SAMPLES)).append(elapsed)
+
+    def latency_summary(self):
+        # {操作名: {"count", "mean_ms", "p50_ms", "p95_ms"}}
+        with self._latency_lock:
+            samples = {op: sorted(v) for op, v in self._latency.items()}
+        return {
+            op: {
+                "count": len(v),
+                "mean_ms": round(sum(v) / len(v) * 1000, 2),
+                "p50_ms": round(_percentile(v, 0.50) * 1000, 2),
+                "p95_ms": round(_percentile(v, 0.95) * 1000, 2),
+            }
+            for op, v in samples.items() if v
+        }
+
+    def _user_lock(self, line_id):
+        # 同じユーザーへの読み→計算→書き込みを、このプロセス内で直列化する
+        with self._key_locks_lock:
+            return self._key_locks[line_id]
+
+    # --- 各バックエンドが実装する操作 ---
+    def schema(self):
+        raise NotImplementedError
+
+    def ensure_fields(self, names):
+        # 名前付き列が無ければ用意して、最新のスキーマを返す
+        raise NotImplementedError
+
+    def get_user(self, line_id, fields=None, exclude=None):
+        # 最新のユーザー行を UserRow で返す。fields / exclude で読む列を絞れる。見つからなければ None
+        raise NotImplementedError
+
+    def append_user(self, values, named=None):
+        # 診断結果の1行（save_to_spreadsheet の並び）を追加する。同じ LINE_ID は新しい行が優先
+        # named の {列名: 値} は同じ行の右端の名前付き列に入れる
+        raise NotImplementedError
+
+    def update_user(self, line_id, values):
+        # {列名: 値} をまとめて書き込む。ユーザーが見つからなければ False
+        raise NotImplementedError
+
+    def list_users(self, fields):
+        # 全ユーザーの最新行を fields の列だけ読んで UserRow のリストで返す（夜間バッチ用。画面からは呼ばない）
+        raise NotImplementedError
+
+    @timed("increment")
+    def increment(self, line_id, field, delta, default=0, minimum=None, read=(), guard=None, also=None):
+        # カウンター列を delta だけ増減する。読み→判定→書き込みを他の更新と混ざらないよう1つの単位で行う。
+        #   minimum: 結果がこれを下回るなら書き込まない（残回数が0の時の消費など）
+        #   read   : guard / also の判定用に一緒に読む列
+        #   guard  : guard(user) が False なら書き込まない（本日クリア済みなど）
+        #   also   : also(user) が返す {列名: 値} も同じ書き込みに含める
+        # 戻り値: (新しい値, 読んだユーザー行)。ユーザーが居なければ (None, None)、条件で弾いたら (None, user)
+        with self._user_lock(line_id):
+            return self._increment(line_id, field, delta, default, minimum, read, guard, also)
+
+    def _increment(self, line_id, field, delta, default, minimum, read, guard, also):
+        user = self.get_user(line_id, fields=[field, *read])
+        values = _counter_values(user, field, delta, default, minimum, guard, also)
+        if values is None:
+            return None, user
+        self.update_user(line_id, values)
+        return values[field], user
+
+    def get_radar_limit(self, line_id):
+        user = self.get_user(line_id, fields=["残回数"])
+        return user.int("残回数", DEFAULT_RADAR_LIMIT) if user is not None else 0
+
+    def consume_radar_limit(self, line_id):
+        new_limit, _ = self.increment(line_id, "残回数", -1, default=DEFAULT_RADAR_LIMIT, minimum=0)
+        return new_limit is not None
+
+    def log_events(self, rows):
+        # [line_id, 日時, 機能, 操作, 詳細] の行をまとめて追記する
+        raise NotImplementedError
+
+    # --- マイグレーション（storage.migrations から呼ばれる） ---
+    def schema_version(self):
+        raise NotImplementedError
+
+    def set_schema_version(self, version):
+        raise NotImplementedError
+
+    def apply_migration(self, columns, sheets):
+        # columns: ユーザー行に足す列名、sheets: {シート名: ヘッダー} の補助シート
+        raise NotImplementedError
+
+    def _get_blobs(self, line_id, names):
+        # 置き場にある分だけ {列名: 本文} で返す
+        raise NotImplementedError
+
+    def _put_blobs(self, line_id, values):
+        raise NotImplementedError
+
+    # --- 大きなテキスト（ユーザー行とは別に置き、使う時だけ読む） ---
+    def get_blobs(self, line_id, names):
+        found = self._get_blobs(line_id, names)
+        missing = [n for n in names if n not in found]
+        if missing:
+            # 置き場に移す前のデータはユーザー行の列に残っているので、そこから読んで置き場へ写しておく
+            user = self.get_user(line_id, fields=missing)
+            legacy = {n: user.get(n) for n in missing if user is not None and user.get(n)}
+            if legacy:
+                self._put_blobs(line_id, legacy)
+            found.update(legacy)
+        return {n: found.get(n, "") for n in names}
+
+    def get_blob(self, line_id, name):
+        return self.get_blobs(line_id, [name])[name]
+
+    def put_blobs(self, line_id, values):
+        self._put_blobs(line_id, {n: "" if v is None else str(v) for n, v in values.items()})
+
+    def _append_with_blobs(self, values, named, append_row):
+        # 診断結果の行のうち大きなテキスト（極秘レポート）は置き場へ。シートで新しい行を足した時と同じく、
+        # 以前の診断の判定結果・戦略会議・スキル履歴は引き継がない。
+        # 行（診断キー入り）が見えた時点でレポートも読めるよう、置き場→行の順で書く
+        values = list(values)
+        blobs = {n: "" for n in BLOB_FIELDS}
+        idx = CANONICAL_HEADERS.index("極秘レポート")
+        if len(values) > idx:
+            blobs["極秘レポート"] = values[idx]
+            values[idx] = ""
+        self.put_blobs(values[0], blobs)
+        append_row(values, named or {})
+
+    # --- 診断結果の保存を1回にする（再実行・二度押しで二重に追加しない） ---
+    def submission_lock(self, key):
+        with self._key_locks_lock:
+            return self._submission_locks[key]
+
+    def find_diagnosis(self, line_id, key):
+        # 同じ診断キーで保存済みなら、その時の極秘レポートを返す。未保存なら None
+        user = self.get_user(line_id, fields=["診断キー"])
+        if user is None or not key or user.get("診断キー") != key:
+            return None
+        return self.get_blob(line_id, "極秘レポート") or None
+
+    def compact(self, delete_rows=False):
+        # 同じ LINE_ID の古い行を片付ける。戻り値は件数の集計
+        return {"users": 0, "superseded": 0, "archived": 0, "removed": 0}
+
+    # --- 上の操作の組み合わせ（バックエンド共通） ---
+    def add_exp(self, line_id, amount, read=(), guard=None, also=None):
+        return self.increment(line_id, "EXP", amount, default=0, read=read, guard=guard, also=also)
+
+    def cached_period(self, user, kind, key):
+        # 取得済みのユーザー行の判定日が key と一致する時だけ、判定結果を置き場から読む。無ければ None
+        date_col, text_col = PERIOD_CACHE_COLUMNS[kind]
+        if user is None:
+            return None
+        if user.get(date_col) == key:
+            text = self.get_blob(user.get("LINE_ID"), text_col)
+            if text.strip():
+                return text
+        staged = STAGED_PERIOD_COLUMNS.get(kind)
+        if staged and user.get(staged[0]) == key:
+            # 夜間バッチが前日に作っておいた分があれば、当日の置き場へ移してから返す
+            text = self.get_blob(user.get("LINE_ID"), staged[1])
+            if text.strip():
+                self.put_blobs(user.get("LINE_ID"), {text_col: text})
+                self.update_user(user.get("LINE_ID"), {date_col: key})
+                return text
+        return None
+
+    def put_period_cache(self, line_id, kind, key, payload):
+        date_col, text_col = PERIOD_CACHE_COLUMNS[kind]
+        # 判定日が本文より先に入ると古い本文を読んでしまうので、本文→判定日の順で書く
+        self.put_blobs(line_id, {text_col: json.dumps(payload, ensure_ascii=False)})
+        return self.update_user(line_id, {date_col: key})
+
+    def stage_period_cache(self, line_id, kind, key, payload):
+        # key の日に使う判定結果を前もって置いておく（当日の分はそのまま残る）
+        date_col, text_col = STAGED_PERIOD_COLUMNS[kind]
+        self.put_blobs(line_id, {text_col: json.dumps(payload, ensure_ascii=False)})
+        return self.update_user(line_id, {date_col: key})
+
+    def clear_period_caches(self, line_id):
+        date_cols = [date_col for date_col, _ in PERIOD_CACHE_COLUMNS.values()]
+        date_cols += [date_col for date_col, _ in STAGED_PERIOD_COLUMNS.values()]
+        return self.update_user(line_id, {date_col: "" for date_col in date_cols})
+
+    def get_skill_history(self, line_id):
+        raw = self.get_blob(line_id, "スキル習得履歴")
+        if not raw.strip():
+            return {}
+        try: return json.loads(raw)
+        except ValueError: return {}
+
+    def put_strategy(self, line_id, month, report, skill=None):
+        values = {"戦略会議実施月": month}
+        if skill:
+            values["今月の処方スキル"] = skill
+        self.put_blobs(line_id, {"戦略会議レポート本体": report})
+        return self.update_user(line_id, values)
+
+    def add_skill_history(self, line_id, skill, manual):
+        # スキル図鑑（スキル習得履歴）に1件足す。戦略の保存とは別に書き、こちらの失敗で戦略を失わないようにする
+        history = self.get_skill_history(line_id)
+        history[skill] = manual
+        self.put_blobs(line_id, {"スキル習得履歴": json.dumps(history, ensure_ascii=False)})
+
+
+def _counter_values(user, field, delta, default, minimum, guard, also):
+    # increment の判定部分（バックエンド共通）。書き込む {列名: 値}、書き込まないなら None
+    if user is None or (guard is not None and not guard(user)):
+        return None
+    new_value = user.int(field, default) + delta
+    if minimum is not None and new_value < minimum:
+        return None
+    values = dict(also(user)) if also is not None else {}
+    values[field] = new_value
+    return values
+
+
+class SheetsBackend(StorageBackend):
+    name = "sheets"
+
+    def __init__(self, title=None):
+        super().__init__()
+        self.title = title
+
+    def schema(self):
+        return get_schema(self.title)
+
+    @timed("ensure_fields")
+    def ensure_fields(self, names):
+        return ensure_columns(names, self.title)
+
+    def _schema_for_write(self, names):
+        # 列はマイグレーションで用意済みのはず。足りない時だけ（未適用のまま起動した等）その場で足す
+        schema = self.schema()
+        missing = schema.missing(names)
+        if missing:
+            print(f"[Migration] 未適用の列があるため追加します: {missing}")
+            schema = ensure_columns(names, self.title)
+        return schema
+
+    @timed("get_user")
+    def get_user(self, line_id, fields=None, exclude=None):
+        schema = self.schema()
+        columns = None
+        if fields is not None:
+            columns = [schema.index(n) for n in fields]
+        elif exclude is not None:
+            # ヘッダー名が空の列も位置で読めるよう、全列から除外分を引く
+            skip = {schema.index(n) for n in exclude}
+            columns = [i for i in range(len(schema.headers)) if i not in skip]
+        row_num, row = fetch_user_row(line_id, self.title, columns=columns)
+        if row is None:
+            return None
+        return schema.row(row, row_num)
+
+    @timed("append_user")
+    def append_user(self, values, named=None):
+        def append_row(row, named):
+            if named:
+                schema = self._schema_for_write(list(named))
+                row = row + [""] * (len(schema.headers) - len(row))
+                for name, value in named.items():
+                    row[schema.index(name)] = value
+            append_result = get_worksheet(self.title).append_row(row)
+            get_row_index(self.title).register_append(row[0], append_result)
+        self._append_with_blobs(values, named, append_row)
+
+    def compact(self, delete_rows=False):
+        from storage.compaction import compact_sheet_rows
+        return compact_sheet_rows(self.title, delete_rows=delete_rows)
+
+    @timed("list_users")
+    def list_users(self, fields):
+        # 必要な列だけを列ごとの範囲で1回の batch_get にまとめて読み、LINE_ID ごとに一番下の行を残す
+        schema = self.schema()
+        names = ["LINE_ID"] + [n for n in fields if n != "LINE_ID" and schema.has(n)]
+        columns = get_worksheet(self.title).batch_get([f"{schema.letter(n)}2:{schema.letter(n)}" for n in names])
+        height = max((len(c) for c in columns), default=0)
+        latest = {}
+        for offset in range(height):
+            cells = [c[offset][0] if offset < len(c) and c[offset] else "" for c in columns]
+            if cells[0]:
+                latest[cells[0]] = (offset + 2, cells)
+        users = []
+        for row_num, cells in latest.values():
+            values = [""] * len(schema.headers)
+            for name, value in zip(names, cells):
+                values[schema.index(name)] = value
+            users.append(schema.row(values, row_num))
+        return users
+
+    @timed("update_user")
+    def update_user(self, line_id, values):
+        schema = self._schema_for_write(list(values))
+        # インデックスの行番号をそのまま使うと、行の削除・手での編集・別プロセスの追加でずれた時に
+        # 別人の行を上書きしてしまうので、A列（LINE_ID）を読んで本人の行か確かめてから書く。
+        # ずれていれば fetch_user_row がインデックスを作り直して1回だけ引き直し、それでも違えば書かない
+        row_num, _ = fetch_user_row(line_id, self.title, columns=[0])
+        if row_num is None:
+            print(f"[Storage] {line_id} の行が見つからないため書き込みませんでした")
+            return False
+        with WriteBuffer() as wb:
+            for name, value in values.items():
+                wb.update_cell(row_num, schema.col(name), value, self.title)
+        return True
+
+    # Sheets にはトランザクションも条件付き書き込みも無いので、increment は楽観的な compare-and-set で行う。
+    # 同じプロセス内は基底クラスのユーザー単位ロックで直列化し、別のレプリカや夜間バッチとの競合は
+    # 「更新トークン」の列で見分ける。書き込みのたびに新しいトークンを、読んだ時点のトークンの履歴の先頭に足して
+    # カウンターと同じ batch_update で書き、少し待ってから読み直す。
+    #   - 自分のトークンが履歴に残っている → 今の値は自分の書き込みの上に積まれているので成功
+    #   - 残っていない → 同じ古い値を読んだ別の書き込みに上書きされたので、読み直して判定からやり直す
+    # 上書きした側の書き込みが CAS_SETTLE_SEC より遅れて届き、こちらの確認の後になった場合だけは見逃す
+    # （Sheets で完全に防ぐ手段は無い）。回数や EXP を厳密に扱う運用では SQLite バックエンドを使う。
+    def _increment(self, line_id, field, delta, default, minimum, read, guard, also):
+        for attempt in range(CAS_MAX_ATTEMPTS):
+            user = self.get_user(line_id, fields=[field, CAS_TOKEN_FIELD, *read])
+            values = _counter_values(user, field, delta, default, minimum, guard, also)
+            if values is None:
+                return None, user
+
+            token = uuid.uuid4().hex[:12]
+            history = [token, *user.get(CAS_TOKEN_FIELD).split()][:CAS_TOKEN_HISTORY]
+            values[CAS_TOKEN_FIELD] = " ".join(history)
+            if not self.update_user(line_id, values):
+                return None, None
+
+            time.sleep(CAS_SETTLE_SEC)
+            check = self.get_user(line_id, fields=[CAS_TOKEN_FIELD])
+            if check is not None and token in check.get(CAS_TOKEN_FIELD).split():
+                return values[field], user
+            print(f"[Storage] {line_id} の {field} の更新が別の書き込みと競合したため再試行します（{attempt + 1}回目）")
+            time.sleep(CAS_BACKOFF_SEC * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+        # 最後の書き込みも上書きされているので、反映されなかったものとして扱う
+        print(f"[Storage] {line_id} の {field} の更新が競合し続けたため中止しました")
+        return None, user
+
+    @timed("log_events")
+    def log_events(self, rows):
+        get_worksheet(LOG_SHEET).append_rows(rows)
+
+    @timed("get_blobs")
+    def _get_blobs(self, line_id, names):
+        return get_blob_store().get(line_id, names)
+
+    def _meta_rows(self):
+        try:
+            return get_worksheet(META_SHEET).get("A2:B")
+        except gspread.WorksheetNotFound:
+            return []
+
+    def schema_version(self):
+        for row in self._meta_rows():
+            if len(row) >= 2 and row[0] == "schema_version":
+                try: return int(row[1])
+                except ValueError: return 0
+        return 0
+
+    def set_schema_version(self, version):
+        ws = get_or_create_worksheet(META_SHEET, META_HEADERS)
+        for row_num, row in enumerate(self._meta_rows(), start=2):
+            if row and row[0] == "schema_version":
+                ws.update(f"B{row_num}", [[version]])
+                return
+        ws.append_row(["schema_version", version])
+
+    def apply_migration(self, columns, sheets):
+        for title, headers in sheets.items():
+            get_or_create_worksheet(title, headers)
+        if columns:
+            # 足りない列のヘッダーは1回の範囲書き込みでまとめて足す
+            ensure_columns(columns, self.title)
+
+    @timed("put_blobs")
+    def _put_blobs(self, line_id, values):
+        get_blob_store().put(line_id, values)
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+
+    # ユーザーの値は (line_id, 列名) ごとに1行で持つ。シートに列を足すのと同じく、新しい列名もそのまま入る
+    DDL = """
+    CREATE TABLE IF NOT EXISTS users (
+        line_id TEXT PRIMARY KEY,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS user_fields (
+        line_id TEXT NOT NULL REFERENCES users(line_id) ON DELETE CASCADE,
+        name TEXT NOT NULL,
+        value TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (line_id, name)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        line_id TEXT,
+        logged_at TEXT,
+        feature TEXT,
+        action TEXT,
+        detail TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_logs_line_id ON logs (line_id, logged_at);
+    CREATE INDEX IF NOT EXISTS idx_logs_feature ON logs (feature, action, logged_at);
+    CREATE TABLE IF NOT EXISTS blobs (
+        line_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL DEFAULT '',
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (line_id, kind)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        super().__init__()
+        self.path = path
+        # Streamlit のセッションスレッドから共有するので、接続は1本にしてロックで直列化する
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(self.DDL)
+            extra = [r[0] for r in self._conn.execute("SELECT DISTINCT name FROM user_fields")]
+        self._schema = SheetSchema(CANONICAL_HEADERS + [n for n in extra if n not in CANONICAL_HEADERS])
+
+    def schema(self):
+        return self._schema
+
+    def ensure_fields(self, names):
+        missing = [n for n in names if not self._schema.has(n)]
+        if missing:
+            self._schema = SheetSchema(self._schema.headers + missing)
+        return self._schema
+
+    @timed("get_user")
+    def get_user(self, line_id, fields=None, exclude=None):
+        with self._lock:
+            return self._get_user(line_id, fields, exclude)
+
+    def _get_user(self, line_id, fields=None, exclude=None):
+        sql = "SELECT f.name, f.value FROM users u LEFT JOIN user_fields f ON f.line_id = u.line_id"
+        params = []
+        if fields is not None:
+            sql += f" AND f.name IN ({','.join('?' * len(fields))})"
+            params.extend(fields)
+        sql += " WHERE u.line_id = ?"
+        params.append(line_id)
+        rows = self._conn.execute(sql, params).fetchall()
+        if not rows:
+            return None
+
+        schema = self.ensure_fields([name for name, _ in rows if name])
+        skip = set(exclude or [])
+        values = [""] * len(schema.headers)
+        for name, value in rows:
+            if name and name not in skip:
+                values[schema.index(name)] = value
+        return schema.row(values)
+
+    def append_user(self, values, named=None):
+        self._append_with_blobs(values, named, self._append_row)
+
+    @timed("list_users")
+    def list_users(self, fields):
+        names = ["LINE_ID", *[n for n in fields if n != "LINE_ID"]]
+        sql = f"SELECT line_id, name, value FROM user_fields WHERE name IN ({','.join('?' * len(names))}) ORDER BY line_id"
+        with self._lock:
+            rows = self._conn.execute(sql, names).fetchall()
+        schema = self.ensure_fields(names)
+        users = {}
+        for line_id, name, value in rows:
+            values = users.setdefault(line_id, [""] * len(schema.headers))
+            values[schema.index(name)] = value
+        return [schema.row(values) for values in users.values()]
+
+    @timed("append_user")
+    def _append_row(self, values, named):
+        line_id = values[0]
+        now = time.time()
+        fields = [(line_id, name, str(v)) for name, v in zip(CANONICAL_HEADERS, values) if name and v not in ("", None)]
+        fields += [(line_id, name, str(v)) for name, v in named.items()]
+        self.ensure_fields(list(named))
+        with self._lock, self._conn:
+            # シートで新しい行を足した時と同じく、以前の診断の値は引き継がない
+            self._conn.execute("DELETE FROM user_fields WHERE line_id = ?", (line_id,))
+            self._conn.execute(
+                "INSERT INTO users (line_id, created_at, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(line_id) DO UPDATE SET created_at = excluded.created_at, updated_at = excluded.updated_at",
+                (line_id, now, now),
+            )
+            self._conn.executemany("INSERT INTO user_fields (line_id, name, value) VALUES (?, ?, ?)", fields)
+
+    @timed("update_user")
+    def update_user(self, line_id, values):
+        with self._lock, self._conn:
+            return self._update_user(line_id, values)
+
+    def _update_user(self, line_id, values):
+        self.ensure_fields(list(values))
+        cur = self._conn.execute("UPDATE users SET updated_at = ? WHERE line_id = ?", (time.time(), line_id))
+        if cur.rowcount == 0:
+            return False
+        self._conn.executemany(
+            "INSERT INTO user_fields (line_id, name, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(line_id, name) DO UPDATE SET value = excluded.value",
+            [(line_id, name, "" if v is None else str(v)) for name, v in values.items()],
+        )
+        return True
+
+    def _increment(self, line_id, field, delta, default, minimum, read, guard, also):
+        # BEGIN IMMEDIATE で書き込みロックを先に取るので、別プロセスが同じファイルを更新していても
+        # 読んでから書くまでの間に割り込まれない
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                user = self._get_user(line_id, [field, *read])
+                values = _counter_values(user, field, delta, default, minimum, guard, also)
+                if values is not None:
+                    self._update_user(line_id, values)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return (values[field] if values is not None else None), user
+
+    @timed("log_events")
+    def log_events(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO logs (line_id, logged_at, feature, action, detail) VALUES (?, ?, ?, ?, ?)",
+                [tuple(list(r) + [""] * (5 - len(r)))[:5] for r in rows],
+            )
+
+    def schema_version(self):
+        with self._lock:
+            return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def set_schema_version(self, version):
+        with self._lock:
+            self._conn.execute(f"PRAGMA user_version = {int(version)}")
+
+    def apply_migration(self, columns, sheets):
+        # テーブルは DDL で作成済み。列は (line_id, 列名) の行なので名前を登録するだけでよい
+        self.ensure_fields(columns)
+
+    @timed("get_blobs")
+    def _get_blobs(self, line_id, names):
+        sql = f"SELECT kind, value FROM blobs WHERE line_id = ? AND kind IN ({','.join('?' * len(names))})"
+        with self._lock:
+            return dict(self._conn.execute(sql, [line_id, *names]).fetchall())
+
+    @timed("put_blobs")
+    def _put_blobs(self, line_id, values):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO blobs (line_id, kind, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(line_id, kind) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                [(line_id, kind, value, now) for kind, value in values.items()],
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _setting(env_name, secret_name, default):
+    if os.environ.get(env_name):
+        return os.environ[env_name]
+    try:
+        return st.secrets.get(secret_name, default)
+    except Exception:
+        # secrets.toml が無い環境（オフライン実行など）
+        return default
+
+
+def create_backend(kind=None, cache=True, migrate=True):
+    kind = kind or _setting("TAKE_PLAN_STORAGE", "storage_backend", "sheets")
+    if kind == "sqlite":
+        backend = SQLiteBackend(_setting("TAKE_PLAN_SQLITE_PATH", "sqlite_path", DEFAULT_SQLITE_PATH))
+    elif kind == "sheets":
+        backend = SheetsBackend()
+    else:
+        raise ValueError(f"未対応のストレージ: {kind}")
+
+    if migrate:
+        from storage.migrations import run_migrations
+        try:
+            run_migrations(backend)
+        except Exception as e:
+            # 起動は止めない（足りない列は書き込み時に補う）
+            print(f"マイグレーションエラー: {e}")
+
+    if not cache:
+        return backend
+
+    from storage.row_cache import ROW_CACHE_TTL_SEC, CachingBackend
+    ttl = float(_setting("TAKE_PLAN_ROW_CACHE_TTL", "row_cache_ttl", ROW_CACHE_TTL_SEC))
+    return CachingBackend(backend, ttl=ttl) if ttl > 0 else backend
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_storage():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
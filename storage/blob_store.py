@@ -0,0 +1,125 @@
+# ==========================================
+# 大きなテキストの置き場（Blobs シート）
+# ==========================================
+# 極秘レポート本体・戦略会議レポート・スキル習得履歴・日次/月次/年次の判定結果は数千〜数万文字あり、
+# ユーザー行に入れておくと行を読むたびに一緒に運ばれていた。ここでは (LINE_ID, 種類) ごとに
+# Blobs シートの1行（A:LINE_ID, B:種類, C:本文, D:更新日時）に分けて置き、タブが実際に描画する時だけ読む。
+# 行番号は A:B 列だけを読んで作るインデックスで引く（考え方は row_index と同じ）。
+import datetime
+import re
+import threading
+import time
+
+from storage.sheets_client import get_or_create_worksheet
+
+BLOB_SHEET = "Blobs"
+BLOB_HEADERS = ["LINE_ID", "種類", "本文", "更新日時"]
+# ユーザー行から分けて置く列
+BLOB_FIELDS = ["極秘レポート", "戦略会議レポート本体", "スキル習得履歴", "日次判定結果", "月次判定結果", "年次判定結果", "翌日判定結果"]
+# インデックスに無いキーを引かれた時に作り直す最短間隔
+MISS_REBUILD_INTERVAL_SEC = 30
+
+_UPDATED_RANGE_ROWS = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?")
+
+
+def _blob_worksheet():
+    # 通常はマイグレーションで作成済み
+    return get_or_create_worksheet(BLOB_SHEET, BLOB_HEADERS)
+
+
+class SheetsBlobStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._rows = {}
+        self._built_at = 0.0
+        self._loaded = False
+
+    def rebuild(self):
+        keys = _blob_worksheet().get("A2:B")
+        rows = {}
+        for row_num, key in enumerate(keys, start=2):
+            if len(key) >= 2 and key[0]:
+                rows[(key[0], key[1])] = row_num
+        with self._lock:
+            self._rows = rows
+            self._built_at = time.monotonic()
+            self._loaded = True
+
+    def _lookup(self, keys):
+        with self._lock:
+            loaded = self._loaded
+            found = {k: self._rows.get(k) for k in keys}
+            stale = time.monotonic() - self._built_at > MISS_REBUILD_INTERVAL_SEC
+        if not loaded or (None in found.values() and stale):
+            self.rebuild()
+            with self._lock:
+                found = {k: self._rows.get(k) for k in keys}
+        return found
+
+    def get(self, line_id, kinds):
+        # 戻り値: {種類: 本文}。Blobs シートに無い種類は含めない
+        ws = _blob_worksheet()
+        for attempt in range(2):
+            rows = {k: r for k, r in self._lookup([(line_id, kind) for kind in kinds]).items() if r}
+            if not rows:
+                return {}
+            keys = list(rows)
+            results = ws.batch_get([f"A{rows[k]}:C{rows[k]}" for k in keys])
+            found = {}
+            for key, value_range in zip(keys, results):
+                values = value_range[0] if value_range else []
+                if values[:2] != list(key):
+                    break
+                found[key[1]] = values[2] if len(values) > 2 else ""
+            else:
+                return found
+            # 行の削除等で位置がずれていたら作り直して1回だけ再試行
+            self.rebuild()
+        return {}
+
+    def put(self, line_id, values):
+        if not values:
+            return
+        ws = _blob_worksheet()
+        now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._write_lock:
+            rows = self._lookup([(line_id, kind) for kind in values])
+            updates = []
+            appends = []
+            for (_, kind), row_num in rows.items():
+                if row_num:
+                    updates.append({"range": f"C{row_num}:D{row_num}", "values": [[values[kind], now_str]]})
+                else:
+                    appends.append([line_id, kind, values[kind], now_str])
+
+            # HTMLやJSONが数式として解釈されないよう RAW で書く
+            if updates:
+                ws.batch_update(updates, value_input_option="RAW")
+            if appends:
+                result = ws.append_rows(appends, value_input_option="RAW")
+                self._register_append(appends, result)
+
+    def _register_append(self, appends, append_response):
+        updated_range = (append_response or {}).get("updates", {}).get("updatedRange", "")
+        match = _UPDATED_RANGE_ROWS.search(updated_range)
+        with self._lock:
+            if not match:
+                self._loaded = False
+                return
+            first = int(match.group(1))
+            for offset, row in enumerate(appends):
+                self._rows[(row[0], row[1])] = first + offset
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SheetsBlobStore()
+    return _store
@@ -0,0 +1,107 @@
+# ==========================================
+# 重複行の片付け（同じ LINE_ID の古い診断行を Archive シートへ移す）
+# ==========================================
+# 診断をやり直すと save_to_spreadsheet が新しい行を足すため、同じユーザーの古い行が残り続け、
+# シートのセル数上限と全件読み込みの量を圧迫していた。アプリは一番下の行を最新として扱うので、
+# それより上にある同じ LINE_ID の行を Archive シートへ append_rows 1回でまとめて写し、元の行を片付ける。
+#
+# 片付け方は2通り:
+#   既定         … 古い行の中身を batch_clear 1回で消す。行番号が変わらないので、アプリを動かしたままでも安全
+#   delete_rows  … 古い行そのものを batchUpdate（deleteDimension）1回で削除する。セル数も減るが行番号がずれるため、
+#                  アプリの行インデックスが古いまま書き込まないよう、利用の少ない時間帯に実行してアプリを再起動すること
+#
+#   python -m storage.compaction            # 中身を消す
+#   python -m storage.compaction --delete   # 行ごと削除する
+#   python -m storage.compaction --dry-run  # 件数だけ確認する
+import argparse
+import datetime
+
+from storage.rate_limit import BACKGROUND, request_priority
+from storage.row_index import get_row_index
+from storage.schema import column_letter
+from storage.sheets_client import get_or_create_worksheet, get_worksheet
+
+ARCHIVE_SHEET = "Archive"
+
+
+def _archive_worksheet(headers):
+    ws = get_or_create_worksheet(ARCHIVE_SHEET, headers)
+    if ws.col_count < len(headers):
+        ws.add_cols(len(headers) - ws.col_count)
+    return ws
+
+
+def _row_runs(row_nums):
+    # 行番号を連続区間 (開始, 終了) にまとめる（削除リクエストの数を減らすため）
+    runs = []
+    for r in sorted(row_nums):
+        if runs and r == runs[-1][1] + 1:
+            runs[-1][1] = r
+        else:
+            runs.append([r, r])
+    return runs
+
+
+def find_superseded_rows(values):
+    # 各 LINE_ID の一番下の行だけを残し、それより上の行番号（1始まり）を返す
+    latest = {}
+    for row_num, row in enumerate(values[1:], start=2):
+        if row and row[0]:
+            latest[row[0]] = row_num
+    superseded = [
+        row_num for row_num, row in enumerate(values[1:], start=2)
+        if row and row[0] and latest[row[0]] != row_num
+    ]
+    return latest, superseded
+
+
+def compact_sheet_rows(title=None, delete_rows=False, dry_run=False):
+    ws = get_worksheet(title)
+    values = ws.get_all_values()
+    if not values:
+        return {"users": 0, "superseded": 0, "archived": 0, "removed": 0}
+
+    latest, superseded = find_superseded_rows(values)
+    stats = {"users": len(latest), "superseded": len(superseded), "archived": 0, "removed": 0}
+    if not superseded or dry_run:
+        return stats
+
+    # 1. 古い行を Archive シートへまとめて写す（片付けた日時を末尾に付ける）
+    headers = values[0] + ["アーカイブ日時"]
+    width = len(headers) - 1
+    now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    archive_rows = [(values[r - 1] + [""] * width)[:width] + [now_str] for r in superseded]
+    _archive_worksheet(headers).append_rows(archive_rows, value_input_option="RAW")
+    stats["archived"] = len(archive_rows)
+
+    # 2. 元の行を片付ける（どちらも API 呼び出しは1回）
+    runs = _row_runs(superseded)
+    if delete_rows:
+        # 下の行から消すと、上の行の位置がずれない
+        requests = [
+            {"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end}}}
+            for start, end in reversed(runs)
+        ]
+        ws.spreadsheet.batch_update({"requests": requests})
+    else:
+        last_col = column_letter(max(width, 1))
+        ws.batch_clear([f"A{start}:{last_col}{end}" for start, end in runs])
+    stats["removed"] = len(superseded)
+
+    get_row_index(title).rebuild()
+    print(f"[Compaction] {stats['users']}人分のうち古い行{stats['removed']}行を{ARCHIVE_SHEET}へ移しました")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="同じ LINE_ID の古い診断行を Archive シートへ移して片付ける")
+    parser.add_argument("--delete", action="store_true", help="中身を消すだけでなく行ごと削除する（アプリの再起動が必要）")
+    parser.add_argument("--dry-run", action="store_true", help="対象の件数だけ表示する")
+    args = parser.parse_args()
+    with request_priority(BACKGROUND):
+        stats = compact_sheet_rows(delete_rows=args.delete, dry_run=args.dry_run)
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
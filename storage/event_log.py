@@ -0,0 +1,119 @@
+# ==========================================
+# 行動ログの非同期書き込み（ログの追記をバックグラウンドでまとめて行う）
+# ==========================================
+# 以前は track_insight のたびにリクエスト処理の中で append_row を1回呼んでいたため、
+# ポータル表示やミッション達成のたびにログ1件分の往復を待っていた。
+# ここではイベントをメモリ上のキューに積むだけで即座に戻り、バックグラウンドのスレッドが
+# FLUSH_BATCH_SIZE 件たまるか FLUSH_INTERVAL_SEC 秒経つごとに 1回の追記（Sheets なら append_rows）で書き出す。
+# キューには上限を設け、溢れた分は古いものから捨てる（分析用ログのためにメモリや応答時間を使わない）。
+import atexit
+import collections
+import threading
+import time
+
+from storage.backend import get_storage
+from storage.rate_limit import BACKGROUND, request_priority
+
+FLUSH_BATCH_SIZE = 50
+FLUSH_INTERVAL_SEC = 5
+MAX_BUFFERED_EVENTS = 5000
+# 書き込み失敗時に次回へ持ち越す回数（それ以上失敗したバッチは捨てる）
+MAX_RETRIES = 3
+
+
+class InsightLogger:
+    def __init__(self, batch_size=FLUSH_BATCH_SIZE, interval=FLUSH_INTERVAL_SEC, max_events=MAX_BUFFERED_EVENTS):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._events = collections.deque(maxlen=max_events)
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stop = False
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "errors": 0}
+
+        self._worker = threading.Thread(target=self._run, name="insight-log-writer", daemon=True)
+        self._worker.start()
+
+    def log(self, row):
+        with self._cond:
+            if len(self._events) == self._events.maxlen:
+                self.stats["dropped"] += 1
+            self._events.append((row, 0))
+            self.stats["queued"] += 1
+            if len(self._events) >= self.batch_size:
+                self._cond.notify()
+
+    def _take_batch(self):
+        with self._cond:
+            batch = list(self._events)
+            self._events.clear()
+        return batch
+
+    def flush(self):
+        # 溜まっているイベントを全て書き出す（ワーカーと終了処理の両方から呼ばれる）。失敗時は None
+        with self._flush_lock:
+            batch = self._take_batch()
+            if not batch:
+                return 0
+            try:
+                get_storage().log_events([row for row, _ in batch])
+            except Exception as e:
+                print(f"Tracking Error: {e}")
+                retry = [(row, tries + 1) for row, tries in batch if tries + 1 < MAX_RETRIES]
+                with self._cond:
+                    # 失敗分は新しいイベントより前に戻す。extendleft は溢れると右（新しい方）から捨てるので、
+                    # 空きに入る分だけを残し、入らない失敗分は古い方から捨てる
+                    free = self._events.maxlen - len(self._events)
+                    kept = retry[len(retry) - free:] if free > 0 else []
+                    self.stats["errors"] += 1
+                    self.stats["dropped"] += len(batch) - len(kept)
+                    self._events.extendleft(reversed(kept))
+                return None
+            with self._cond:
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+            return len(batch)
+
+    def _run(self):
+        # ログの追記は画面表示のための読み書きより後回しにする
+        with request_priority(BACKGROUND):
+            self._loop()
+
+    def _loop(self):
+        failed = False
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.interval
+                # 直前の書き込みが失敗していたら、件数に関係なく1周期待ってから再試行する
+                while not self._stop and (failed or len(self._events) < self.batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                stop = self._stop
+            failed = self.flush() is None
+            if stop:
+                return
+
+    def close(self, timeout=10):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._worker.join(timeout)
+        with request_priority(BACKGROUND):
+            self.flush()
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_insight_logger():
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = InsightLogger()
+                # プロセス終了時に残っているログを書き出す
+                atexit.register(_logger.close)
+    return _logger
@@ -0,0 +1,98 @@
+# ==========================================
+# スキーマのマイグレーション（列・シートの追加をプロセス起動時に1回だけ行う）
+# ==========================================
+# 以前はポータル表示や状況アップデートのたびに required_cols とヘッダー行を突き合わせ、
+# 足りなければ add_cols と update_cell(1, …) を列の数だけ呼んでいた。
+# ここでは変更を番号付きで並べておき、適用済みの番号（Sheets は Meta シート、SQLite は PRAGMA user_version）より
+# 新しいものだけを、まとめて1回で適用する。リクエスト処理の中ではヘッダー行を書き換えない。
+#
+#   python -m storage.migrations           # 未適用のマイグレーションを適用する（デプロイ時）
+#   python -m storage.migrations --status  # 適用済みの番号と未適用の一覧を表示する
+import argparse
+import threading
+
+from storage.blob_store import BLOB_HEADERS, BLOB_SHEET
+
+# version は増やす一方。既存の番号の中身は書き換えず、変更は新しい番号で足す
+MIGRATIONS = [
+    {
+        "version": 1,
+        "description": "EXP・判定キャッシュ・状況アップデート・戦略会議・スキルの列",
+        "columns": [
+            "EXP", "最終EXP獲得日", "次週のテーマ",
+            "日次判定日", "日次判定結果", "月次判定日", "月次判定結果", "年次判定日", "年次判定結果",
+            "ステータス更新月", "ステータス更新回数",
+            "戦略会議実施月", "戦略会議レポート本体", "解放済みスキル", "今月の処方スキル", "スキル習得履歴",
+        ],
+    },
+    {
+        "version": 2,
+        "description": "大きなテキストの置き場（Blobs シート）",
+        "sheets": {BLOB_SHEET: BLOB_HEADERS},
+    },
+    {
+        "version": 3,
+        "description": "診断結果の保存キーの列",
+        "columns": ["診断キー"],
+    },
+    {
+        "version": 4,
+        "description": "夜間バッチで作る翌日分の判定日の列（本文は Blobs シート）",
+        "columns": ["翌日判定日"],
+    },
+    {
+        "version": 5,
+        "description": "カウンター更新の compare-and-set 用のトークンの列",
+        "columns": ["更新トークン"],
+    },
+]
+
+LATEST_VERSION = MIGRATIONS[-1]["version"]
+
+_run_lock = threading.Lock()
+
+
+def pending_migrations(current_version):
+    return [m for m in MIGRATIONS if m["version"] > current_version]
+
+
+def run_migrations(backend):
+    # 未適用の分の列とシートを1つにまとめて適用し、最後の番号を記録する。戻り値は適用後の番号
+    with _run_lock:
+        current = backend.schema_version()
+        pending = pending_migrations(current)
+        if not pending:
+            return current
+
+        columns = []
+        sheets = {}
+        for m in pending:
+            columns += [c for c in m.get("columns", []) if c not in columns]
+            sheets.update(m.get("sheets", {}))
+        backend.apply_migration(columns, sheets)
+        backend.set_schema_version(pending[-1]["version"])
+
+        print(f"[Migration] {backend.name}: v{current} → v{pending[-1]['version']}（{', '.join(m['description'] for m in pending)}）")
+        return pending[-1]["version"]
+
+
+def main():
+    from storage.backend import create_backend
+
+    parser = argparse.ArgumentParser(description="ストレージのスキーマを最新にする")
+    parser.add_argument("--status", action="store_true", help="適用状況だけを表示する")
+    parser.add_argument("--backend", choices=["sheets", "sqlite"], help="対象のバックエンド（省略時は設定に従う）")
+    args = parser.parse_args()
+
+    backend = create_backend(args.backend, cache=False, migrate=False)
+    if args.status:
+        current = backend.schema_version()
+        print(f"{backend.name}: v{current}（最新 v{LATEST_VERSION}）")
+        for m in pending_migrations(current):
+            print(f"  未適用 v{m['version']}: {m['description']}")
+        return
+    run_migrations(backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# ==========================================
+# Sheets API のレート制御（トークンバケット＋優先度＋429/5xx の再試行）
+# ==========================================
+# 同時セッションが増えると Sheets API の「1分あたりの読み取り・書き込み回数」の上限に当たり、
+# 429 がそのまま「データベース通信エラー」や、残回数 0 扱いの print だけの失敗になっていた。
+# ここではプロセス全体で読み取り用・書き込み用のトークンバケットを1つずつ共有し、上限を超えそうな呼び出しは
+# 送る前に待たせる。待っている呼び出しは優先度順（画面表示のための読み書き → ログ追記などの裏方）に通す。
+# それでも 429 / 5xx が返った場合は、Retry-After か指数バックオフ（ジッター付き）で待って再送する（行が増えてしまう追記は 429 の時だけ）。
+import contextlib
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from google.auth.transport.requests import AuthorizedSession
+
+# Sheets API の既定クォータ（1プロジェクト・1ユーザーあたり毎分60回）。サービスアカウント1つで動かしているのでこれが上限
+READS_PER_MINUTE = 60
+WRITES_PER_MINUTE = 60
+# 空いている時に一度に通してよい回数（毎分の上限の 1/6 = 10秒分）
+BURST_FRACTION = 1 / 6
+
+# 優先度（小さいほど先に通す）
+INTERACTIVE = 0
+BACKGROUND = 1
+# 優先度ごとの最長待ち時間。これを超えたら送らずに諦める（裏方の処理は画面を待たせてまで送らない）
+MAX_WAIT_SEC = {INTERACTIVE: 30.0, BACKGROUND: 120.0}
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SEC = 1.0
+BACKOFF_MAX_SEC = 32.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 追記（values.append）は同じ依頼を送り直すと行が増える。5xx はサーバー側で書き込み済みのこともあるので、
+# 処理前に断られたことが確かな 429 だけ再送する
+APPEND_RETRY_STATUS = {429}
+
+_priority = contextvars.ContextVar("sheets_request_priority", default=INTERACTIVE)
+
+_metrics_lock = threading.Lock()
+RATE_LIMIT_METRICS = {
+    "requests": 0, "queued": 0, "wait_sec": 0.0, "retried": 0, "dropped": 0,
+    "status_429": 0, "status_5xx": 0,
+}
+
+
+def _count(key, amount=1):
+    with _metrics_lock:
+        RATE_LIMIT_METRICS[key] += amount
+
+
+def rate_limit_metrics():
+    with _metrics_lock:
+        return dict(RATE_LIMIT_METRICS)
+
+
+class RateLimitDropped(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def request_priority(priority):
+    # with request_priority(BACKGROUND): の中で行う Sheets への呼び出しを、その優先度で待たせる
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, burst if burst is not None else per_minute * BURST_FRACTION)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=INTERACTIVE, max_wait=None):
+        # トークンを1つ取るまで待つ。戻り値は待った秒数。max_wait を超えたら RateLimitDropped
+        start = time.monotonic()
+        deadline = start + max_wait if max_wait is not None else None
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            queued = False
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == entry and self._tokens >= 1:
+                        self._tokens -= 1
+                        return time.monotonic() - start
+                    if not queued:
+                        queued = True
+                        _count("queued")
+                    wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.05
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitDropped(f"Sheets API の待ち時間が {max_wait} 秒を超えました")
+                        wait = min(wait, remaining)
+                    self._cond.wait(max(wait, 0.01))
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+
+def _is_write(method):
+    # values.batchGet などは GET、書き込み（update / append / batchUpdate / clear）は POST・PUT
+    return method.upper() not in ("GET", "HEAD")
+
+
+def _is_append(method, url):
+    # append_row / append_rows は POST .../values/{範囲}:append
+    return method.upper() == "POST" and ":append" in url.split("?", 1)[0]
+
+
+def _backoff_delay(attempt, response):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try: return min(float(retry_after), BACKOFF_MAX_SEC)
+        except ValueError: pass
+    # フルジッター: 0〜(基準 × 2^試行回数) の一様乱数
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** attempt)))
+
+
+class RateLimitedSession(AuthorizedSession):
+    def __init__(self, credentials, read_bucket=None, write_bucket=None, **kwargs):
+        super().__init__(credentials, **kwargs)
+        self.read_bucket = read_bucket or TokenBucket(READS_PER_MINUTE)
+        self.write_bucket = write_bucket or TokenBucket(WRITES_PER_MINUTE)
+
+    def request(self, method, url, *args, **kwargs):
+        priority = _priority.get()
+        bucket = self.write_bucket if _is_write(method) else self.read_bucket
+        retry_status = APPEND_RETRY_STATUS if _is_append(method, url) else RETRY_STATUS
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                waited = bucket.acquire(priority, MAX_WAIT_SEC.get(priority))
+            except RateLimitDropped:
+                _count("dropped")
+                raise
+            _count("requests")
+            _count("wait_sec", waited)
+
+            response = super().request(method, url, *args, **kwargs)
+            if response.status_code not in retry_status or attempt == MAX_RETRIES:
+                return response
+
+            _count("status_429" if response.status_code == 429 else "status_5xx")
+            _count("retried")
+            delay = _backoff_delay(attempt, response)
+            print(f"[RateLimit] Sheets API {response.status_code}、{delay:.1f}秒後に再試行します（{attempt + 1}/{MAX_RETRIES}）")
+            time.sleep(delay)
+        return response
@@ -0,0 +1,207 @@
+# ==========================================
+# ユーザー行キャッシュ（Streamlit の再実行をまたいで使い回す）
+# ==========================================
+# Streamlit はウィジェットを触るたびにスクリプト全体を再実行するため、ポータルの読み込み・
+# 極秘レポートのタブ・レーダーの残回数チェックがそれぞれ毎回同じユーザーの行を取りに行っていた。
+# ここでは読み込んだ列をユーザーごとに ROW_CACHE_TTL_SEC 秒だけ保持し、同じ再実行内でも次の再実行でも使い回す。
+# Blobs に分けた大きなテキストも (LINE_ID, 種類) ごとに同じTTLで持つ。
+# 書き込みは中身のバックエンドに渡したうえでキャッシュにも反映（書き込めない形なら捨てる）するので、
+# 自分の書いた値が古い値で隠れることはない。読み込みの途中に書き込み・破棄があった時は、その読み込みの値は
+# キャッシュに入れない（ユーザーごとの世代番号で見分ける）。
+import threading
+import time
+
+from storage.backend import StorageBackend
+
+ROW_CACHE_TTL_SEC = 60
+
+
+class _Entry:
+    def __init__(self, user, loaded):
+        self.user = user
+        self.loaded = set(loaded)
+        self.fetched_at = time.monotonic()
+
+
+class CachingBackend(StorageBackend):
+    def __init__(self, inner, ttl=ROW_CACHE_TTL_SEC):
+        super().__init__()
+        self.inner = inner
+        self.name = inner.name
+        self.ttl = ttl
+        self._entries = {}
+        self._blobs = {}
+        self._generations = {}  # LINE_ID → 書き込み・破棄のたびに増える番号
+        self._epoch = 0  # 全体を捨てるたびに増える番号
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "write_through": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def cache_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def latency_summary(self):
+        return self.inner.latency_summary()
+
+    def _bump(self, line_id):
+        # self._lock を持って呼ぶ
+        self._generations[line_id] = self._generations.get(line_id, 0) + 1
+
+    def _generation(self, line_id):
+        # self._lock を持って呼ぶ
+        return self._epoch, self._generations.get(line_id, 0)
+
+    def invalidate(self, line_id=None, blobs=True):
+        with self._lock:
+            if line_id is None:
+                self._epoch += 1
+                self._entries.clear()
+                if blobs:
+                    self._blobs.clear()
+            else:
+                self._bump(line_id)
+                self._entries.pop(line_id, None)
+                for key in [k for k in self._blobs if blobs and k[0] == line_id]:
+                    del self._blobs[key]
+            self.stats["invalidations"] += 1
+
+    # --- 読み込み ---
+    def schema(self):
+        return self.inner.schema()
+
+    def ensure_fields(self, names):
+        return self.inner.ensure_fields(names)
+
+    def _wanted(self, schema, fields, exclude):
+        if fields is not None:
+            return set(fields)
+        names = {h for h in schema.headers if h}
+        return names - set(exclude or [])
+
+    def _fresh_entry(self, line_id, schema):
+        with self._lock:
+            entry = self._entries.get(line_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.fetched_at > self.ttl or entry.user.schema.revision != schema.revision:
+                del self._entries[line_id]
+                return None
+            return entry
+
+    def get_user(self, line_id, fields=None, exclude=None):
+        schema = self.schema()
+        wanted = self._wanted(schema, fields, exclude)
+
+        # 同じユーザーの取得が重なった時は1回だけ取りに行く
+        with self._user_lock(line_id):
+            entry = self._fresh_entry(line_id, schema)
+            if entry is not None and wanted <= entry.loaded:
+                self._count("hits")
+                return schema.row(entry.user.values, entry.user.row_num)
+
+            self._count("misses")
+            with self._lock:
+                generation = self._generation(line_id)
+            user = self.inner.get_user(line_id, fields=fields, exclude=exclude)
+            if user is None:
+                self.invalidate(line_id)
+                return None
+
+            with self._lock:
+                if self._generation(line_id) != generation:
+                    # 読んでいる間に別のスレッドが書き込んだ・捨てたので、古いかもしれない値はキャッシュに入れない
+                    return user
+                current = self._entries.get(line_id)
+                if current is not None and current is entry:
+                    # 既にある列と今回読んだ列を1つにまとめる（取得時刻は古い方に合わせる）
+                    for name in wanted:
+                        current.user.set(name, user.get(name))
+                    current.loaded |= wanted
+                else:
+                    self._entries[line_id] = _Entry(schema.row(user.values, user.row_num), wanted)
+            return user
+
+    # --- 書き込み（中身に渡してからキャッシュへ反映） ---
+    def append_user(self, values, named=None):
+        self.inner.append_user(values, named)
+        self.invalidate(values[0])
+
+    def compact(self, delete_rows=False):
+        try:
+            return self.inner.compact(delete_rows)
+        finally:
+            self.invalidate()
+
+    def update_user(self, line_id, values):
+        ok = self.inner.update_user(line_id, values)
+        with self._lock:
+            self._bump(line_id)
+            entry = self._entries.get(line_id)
+            if entry is not None:
+                if ok and all(entry.user.schema.has(name) for name in values):
+                    for name, value in values.items():
+                        entry.user.set(name, "" if value is None else str(value))
+                    entry.loaded |= set(values)
+                    self.stats["write_through"] += 1
+                else:
+                    del self._entries[line_id]
+                    self.stats["invalidations"] += 1
+        return ok
+
+    def increment(self, line_id, field, delta, default=0, minimum=None, read=(), guard=None, also=None):
+        # 判定は必ず最新の値で行いたいので、キャッシュを通さずに中身で実行する
+        try:
+            return self.inner.increment(line_id, field, delta, default, minimum, read, guard, also)
+        finally:
+            # カウンターはユーザー行の列なので、大きなテキストのキャッシュはそのまま残す
+            self.invalidate(line_id, blobs=False)
+
+    def list_users(self, fields):
+        # 夜間バッチ用の一括読み込みなのでキャッシュは通さない
+        return self.inner.list_users(fields)
+
+    def log_events(self, rows):
+        return self.inner.log_events(rows)
+
+    def schema_version(self):
+        return self.inner.schema_version()
+
+    def set_schema_version(self, version):
+        return self.inner.set_schema_version(version)
+
+    def apply_migration(self, columns, sheets):
+        return self.inner.apply_migration(columns, sheets)
+
+    # --- 大きなテキスト（タブは毎回の再実行で描画されるので、こちらも同じTTLで持っておく） ---
+    def get_blobs(self, line_id, names):
+        now = time.monotonic()
+        with self._lock:
+            found = {}
+            for name in names:
+                cached = self._blobs.get((line_id, name))
+                if cached is not None and now - cached[1] <= self.ttl:
+                    found[name] = cached[0]
+            missing = [n for n in names if n not in found]
+            self.stats["hits" if not missing else "misses"] += 1
+        if missing:
+            fetched = super().get_blobs(line_id, missing)
+            with self._lock:
+                for name, value in fetched.items():
+                    self._blobs[(line_id, name)] = (value, now)
+            found.update(fetched)
+        return {n: found[n] for n in names}
+
+    def _get_blobs(self, line_id, names):
+        return self.inner._get_blobs(line_id, names)
+
+    def _put_blobs(self, line_id, values):
+        self.inner._put_blobs(line_id, values)
+        now = time.monotonic()
+        with self._lock:
+            for name, value in values.items():
+                self._blobs[(line_id, name)] = (value, now)
+            self.stats["write_through"] += 1
@@ -0,0 +1,140 @@
+# ==========================================
+# LINE_ID → 最新行番号 のインデックス
+# ==========================================
+# 以前は get_all_values() で全行×全列を落としてから後ろ向きに LINE_ID を探していた。
+# ここでは A列（LINE_ID）だけを1回読んでインデックスを作り、以降は行番号を引いて
+# 対象の1行だけを読み書きする。append_row で追加した行はレスポンスの範囲から行番号を拾って反映する。
+import re
+import threading
+import time
+
+from gspread.utils import rowcol_to_a1
+
+from storage.sheets_client import get_worksheet
+
+# インデックスに無いIDを引かれた時、別プロセス等での追加を拾うために再構築する最短間隔
+MISS_REBUILD_INTERVAL_SEC = 30
+# 見つかったIDでも、別プロセスでの再診断（下に新しい行が増える）を拾うため、これより古いインデックスは作り直す
+MAX_AGE_SEC = 120
+
+_UPDATED_RANGE_ROW = re.compile(r"![A-Z]+(\d+)")
+
+
+class RowIndex:
+    def __init__(self, worksheet):
+        self._ws = worksheet
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._rows = {}
+        self._built_at = 0.0
+        self._loaded = False
+
+    def rebuild(self):
+        with self._build_lock:
+            ids = self._ws.col_values(1)
+            rows = {}
+            # 1行目はヘッダー。下の行ほど新しいので、同じIDは後勝ちで最新行になる
+            for row_num, line_id in enumerate(ids[1:], start=2):
+                if line_id:
+                    rows[line_id] = row_num
+            with self._lock:
+                self._rows = rows
+                self._built_at = time.monotonic()
+                self._loaded = True
+
+    def lookup(self, line_id):
+        with self._lock:
+            loaded = self._loaded
+            row_num = self._rows.get(line_id)
+            age = time.monotonic() - self._built_at
+
+        if not loaded or age > MAX_AGE_SEC or (row_num is None and age > MISS_REBUILD_INTERVAL_SEC):
+            self.rebuild()
+            with self._lock:
+                row_num = self._rows.get(line_id)
+        return row_num
+
+    def register(self, line_id, row_num):
+        with self._lock:
+            if row_num >= self._rows.get(line_id, 0):
+                self._rows[line_id] = row_num
+
+    def register_append(self, line_id, append_response):
+        # append_row のレスポンス {"updates": {"updatedRange": "シート1!A123:CB123"}} から行番号を拾う
+        updated_range = (append_response or {}).get("updates", {}).get("updatedRange", "")
+        match = _UPDATED_RANGE_ROW.search(updated_range)
+        if match:
+            self.register(line_id, int(match.group(1)))
+        else:
+            self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._rows)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_row_index(title=None):
+    # None と実際のシート名のように、同じシートを別の名前で指しても1つのインデックスを使う（シートIDで引く）
+    worksheet = get_worksheet(title)
+    with _indexes_lock:
+        index = _indexes.get(worksheet.id)
+        if index is None:
+            index = _indexes[worksheet.id] = RowIndex(worksheet)
+        return index
+
+
+def _column_runs(columns):
+    # 読みたい列（0始まり）を連続区間にまとめる。本人確認のためA列は必ず含める
+    cols = sorted({c for c in columns if c >= 0} | {0})
+    runs = []
+    start = prev = cols[0]
+    for c in cols[1:]:
+        if c != prev + 1:
+            runs.append((start, prev))
+            start = c
+        prev = c
+    runs.append((start, prev))
+    return runs
+
+
+def _read_row(sheet, row_num, columns):
+    if columns is None:
+        return sheet.row_values(row_num)
+
+    runs = _column_runs(columns)
+    ranges = [f"{rowcol_to_a1(row_num, s + 1)}:{rowcol_to_a1(row_num, e + 1)}" for s, e in runs]
+    results = sheet.batch_get(ranges)
+
+    # 呼び出し側が今まで通り row[列番号] で読めるよう、読まなかった列は "" で埋めた1行に組み立てる
+    row = [""] * (runs[-1][1] + 1)
+    for (s, e), value_range in zip(runs, results):
+        values = value_range[0] if value_range else []
+        for offset, v in enumerate(values[:e - s + 1]):
+            row[s + offset] = v
+    return row
+
+
+def fetch_user_row(line_id, title=None, columns=None):
+    # 戻り値: (行番号, その行の値リスト)。見つからなければ (None, None)
+    # columns に列番号（0始まり）を渡すと、その列だけを1回の batch_get で読む
+    index = get_row_index(title)
+    sheet = get_worksheet(title)
+
+    for attempt in range(2):
+        row_num = index.lookup(line_id)
+        if row_num is None:
+            return None, None
+        row = _read_row(sheet, row_num, columns)
+        if row and row[0] == line_id:
+            return row_num, row
+        # 行の削除・並び替え等でインデックスがずれていたら、作り直して1回だけ再試行
+        index.rebuild()
+    return None, None
@@ -0,0 +1,213 @@
+# ==========================================
+# 列スキーマのレジストリ（ヘッダー名 → 列番号を1回だけ解決して使い回す）
+# ==========================================
+# 以前は呼び出しのたびに headers.index('EXP') を探し直したり、user_row[64] のような
+# 決め打ちの番号で読んでいた。ここで全ての列名をまとめて定義し、ヘッダー行が変わった時だけ解決し直す。
+import json
+import threading
+import time
+
+from storage.sheets_client import get_worksheet
+
+# save_to_spreadsheet が append する並び順で位置が決まっている列（0始まり）
+FIXED_COLUMNS = {
+    "LINE_ID": 0, "Stripe_ID": 1, "User_ID": 2, "DOB": 3, "Birth_Time": 4, "Gender": 5,
+    "日干支": 6, "天中殺": 7, "主星": 8, "初年": 9, "中年": 10, "晩年": 11, "時干支": 12, "最晩年": 13,
+    "O": 64, "C": 65, "E": 66, "A": 67, "N": 68,
+    "診断日": 69, "残回数": 72, "極秘レポート": 73,
+    "Job": 74, "Pains": 75, "Free_Text": 76,
+}
+# 50問の回答（Q1〜Q50）
+ANSWER_COLUMNS = range(14, 64)
+ANSWER_NAMES = [f"Q{i}" for i in range(1, 51)]
+# 固定列のうち、昔からヘッダー名で探していた列（ヘッダーに同名があればそちらを優先）
+HEADER_FIRST_COLUMNS = {"残回数"}
+
+# 後から右端に追加してきた列。位置はシートごとに違うのでヘッダー名で引く
+NAMED_COLUMNS = [
+    "EXP", "最終EXP獲得日", "次週のテーマ",
+    "日次判定日", "日次判定結果", "月次判定日", "月次判定結果", "年次判定日", "年次判定結果",
+    "ステータス更新月", "ステータス更新回数",
+    "戦略会議実施月", "戦略会議レポート本体", "解放済みスキル", "今月の処方スキル", "スキル習得履歴",
+    "診断キー", "翌日判定日", "更新トークン",
+]
+
+BIG5_KEYS = ["O", "C", "E", "A", "N"]
+
+
+def _canonical_headers():
+    # シート以外のバックエンドで使う列の並び（save_to_spreadsheet の並び＋右端の名前付き列）
+    headers = [""] * (max(FIXED_COLUMNS.values()) + 1)
+    for name, pos in FIXED_COLUMNS.items():
+        headers[pos] = name
+    for name, pos in zip(ANSWER_NAMES, ANSWER_COLUMNS):
+        headers[pos] = name
+    return headers + NAMED_COLUMNS
+
+
+CANONICAL_HEADERS = _canonical_headers()
+
+# ヘッダー行を読み直して変更が無いか確かめる間隔（変更が無ければ解決済みのマップをそのまま使う）
+HEADER_CHECK_INTERVAL_SEC = 300
+
+
+def column_letter(col):
+    # 1始まりの列番号 → "A", "Z", "AA", "BU", "AAA" ...
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class SheetSchema:
+    def __init__(self, headers):
+        self.headers = list(headers)
+        self.revision = hash(tuple(self.headers))
+        positions = {h: i for i, h in enumerate(self.headers) if h}
+
+        self._index = {}
+        for name, pos in FIXED_COLUMNS.items():
+            if name in HEADER_FIRST_COLUMNS and name in positions:
+                pos = positions[name]
+            self._index[name] = pos
+        for name, pos in zip(ANSWER_NAMES, ANSWER_COLUMNS):
+            self._index[name] = pos
+        for name in NAMED_COLUMNS:
+            self._index[name] = positions.get(name, -1)
+
+    def has(self, name):
+        return self.index(name) != -1
+
+    def index(self, name):
+        # 0始まりの位置。ヘッダーに無い列は -1
+        if name in self._index:
+            return self._index[name]
+        return self.headers.index(name) if name in self.headers else -1
+
+    def col(self, name):
+        # 1始まりの列番号（update_cell 用）。ヘッダーに無い列は None
+        idx = self.index(name)
+        return idx + 1 if idx != -1 else None
+
+    def letter(self, name):
+        col = self.col(name)
+        return column_letter(col) if col else None
+
+    def a1(self, name, row_num):
+        letter = self.letter(name)
+        return f"{letter}{row_num}" if letter else None
+
+    def missing(self, names):
+        return [n for n in names if not self.has(n)]
+
+    def row(self, values, row_num=None):
+        return UserRow(self, values, row_num)
+
+
+class UserRow:
+    # 1ユーザー分の行を列名で読むためのラッパー
+    def __init__(self, schema, values, row_num=None):
+        self.schema = schema
+        self.row_num = row_num
+        self.values = list(values)
+        while len(self.values) < len(schema.headers):
+            self.values.append("")
+
+    def get(self, name, default=""):
+        idx = self.schema.index(name)
+        if idx == -1 or idx >= len(self.values):
+            return default
+        value = self.values[idx]
+        return value if value != "" else default
+
+    def int(self, name, default=0):
+        try: return int(self.get(name, default))
+        except (TypeError, ValueError): return default
+
+    def float(self, name, default=0.0):
+        try: return float(self.get(name, default))
+        except (TypeError, ValueError): return default
+
+    def json(self, name, default=None):
+        raw = self.get(name, "")
+        if not raw or not str(raw).strip():
+            return default
+        try: return json.loads(raw)
+        except ValueError: return default
+
+    def big5(self, default=3.0):
+        return {k: self.float(k, default) for k in BIG5_KEYS}
+
+    def set(self, name, value):
+        idx = self.schema.index(name)
+        if idx == -1:
+            return
+        while len(self.values) <= idx:
+            self.values.append("")
+        self.values[idx] = value
+
+
+class SchemaRegistry:
+    def __init__(self, title=None):
+        self.title = title
+        self._lock = threading.Lock()
+        self._schema = None
+        self._checked_at = 0.0
+
+    def get(self):
+        with self._lock:
+            schema, checked_at = self._schema, self._checked_at
+        if schema is not None and time.monotonic() - checked_at < HEADER_CHECK_INTERVAL_SEC:
+            return schema
+
+        headers = get_worksheet(self.title).row_values(1)
+        with self._lock:
+            if self._schema is None or hash(tuple(headers)) != self._schema.revision:
+                self._schema = SheetSchema(headers)
+            self._checked_at = time.monotonic()
+            return self._schema
+
+    def invalidate(self):
+        with self._lock:
+            self._schema = None
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def _registry(title=None):
+    with _registries_lock:
+        reg = _registries.get(title)
+        if reg is None:
+            reg = _registries[title] = SchemaRegistry(title)
+        return reg
+
+
+def get_schema(title=None):
+    return _registry(title).get()
+
+
+def invalidate_schema(title=None):
+    _registry(title).invalidate()
+
+
+def ensure_columns(names, title=None):
+    # ヘッダーに無い列を右端に追加し、ヘッダー名をまとめて1回で書き込む
+    schema = get_schema(title)
+    missing = schema.missing(names)
+    if not missing:
+        return schema
+
+    sheet = get_worksheet(title)
+    start_col = len(schema.headers) + 1
+    try:
+        if sheet.col_count < start_col - 1 + len(missing):
+            sheet.add_cols(start_col - 1 + len(missing) - sheet.col_count) # シートの右側に足りない分の列を物理的に追加
+    except Exception as e:
+        print(f"列の追加に失敗しました: {e}")
+    end_letter = column_letter(start_col + len(missing) - 1)
+    sheet.update(f"{column_letter(start_col)}1:{end_letter}1", [missing])
+    invalidate_schema(title)
+    return get_schema(title)
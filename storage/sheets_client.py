@@ -0,0 +1,142 @@
+# ==========================================
+# Google Sheets 共有クライアント（プロセス全体で1つだけ生成）
+# ==========================================
+# 以前は関数ごとに認証 → open_by_url を行っていたため、毎回 OAuth のトークン交換と
+# メタデータ取得の往復が発生していた。ここでは認証情報・HTTPコネクションプール・
+# ワークシートのハンドルをプロセス内で使い回す。
+# Streamlit はセッションごとに別スレッドでスクリプトを実行するため、共有状態はすべてロックで保護する。
+import datetime
+import threading
+
+import gspread
+import streamlit as st
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+from cassette import cassette_session, get_cassette
+from storage.rate_limit import RateLimitedSession
+
+SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+# 同時に張りっぱなしにするHTTPS接続の上限（Streamlitの同時セッション数の目安）
+POOL_SIZE = 20
+# トークンの有効期限が残りこの秒数を切ったら、バックグラウンドで先回りして更新する
+REFRESH_MARGIN_SEC = 600
+REFRESH_CHECK_INTERVAL_SEC = 60
+
+
+class SheetsClientPool:
+    def __init__(self, creds_info, spreadsheet_url, pool_size=POOL_SIZE, cassette=None):
+        # creds_info=None はカセットの再生用（認証せず、記録した応答だけを返す）
+        self.spreadsheet_url = spreadsheet_url
+        self._creds = Credentials.from_service_account_info(dict(creds_info), scopes=SCOPES) if creds_info is not None else None
+        self._cred_lock = threading.Lock()
+
+        # 全ての API 呼び出しはクォータに合わせたレート制御と 429/5xx の再試行を通る
+        session = None
+        if self._creds is not None:
+            session = RateLimitedSession(self._creds)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+        if cassette is not None:
+            session = cassette_session(session, cassette)
+        self.client = gspread.Client(auth=self._creds, session=session)
+
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._ws_lock = threading.Lock()
+
+        self._stop = threading.Event()
+        if self._creds is None:
+            return
+        # 最初のリクエストがトークン交換を待たないよう、生成時に一度だけ同期で取得しておく
+        self.refresh_token(force=True)
+        self._refresher = threading.Thread(target=self._refresh_loop, name="sheets-token-refresher", daemon=True)
+        self._refresher.start()
+
+    # --- トークン管理 ---
+    def refresh_token(self, force=False):
+        with self._cred_lock:
+            expiry = self._creds.expiry
+            remaining = (expiry - datetime.datetime.utcnow()).total_seconds() if expiry else 0
+            if force or not self._creds.valid or remaining < REFRESH_MARGIN_SEC:
+                self._creds.refresh(Request())
+
+    def _refresh_loop(self):
+        while not self._stop.wait(REFRESH_CHECK_INTERVAL_SEC):
+            try:
+                self.refresh_token()
+            except Exception as e:
+                print(f"トークン更新エラー: {e}")
+
+    # --- ハンドル管理 ---
+    def spreadsheet(self):
+        with self._ws_lock:
+            if self._spreadsheet is None:
+                self._spreadsheet = self.client.open_by_url(self.spreadsheet_url)
+            return self._spreadsheet
+
+    def worksheet(self, title=None):
+        # title=None は先頭シート（sheet1）
+        key = title or ""
+        with self._ws_lock:
+            ws = self._worksheets.get(key)
+        if ws is not None:
+            return ws
+
+        book = self.spreadsheet()
+        ws = book.worksheet(title) if title else book.sheet1
+        with self._ws_lock:
+            # 他スレッドが先に取得していればそちらを優先（ハンドルを1つに揃える）
+            return self._worksheets.setdefault(key, ws)
+
+    def invalidate(self, title=None):
+        # シート名の変更や削除があった場合に、キャッシュしたハンドルを捨てる
+        with self._ws_lock:
+            if title is None:
+                self._worksheets.clear()
+                self._spreadsheet = None
+            else:
+                self._worksheets.pop(title, None)
+
+    def close(self):
+        self._stop.set()
+        self.client.session.close()
+
+
+# Streamlit の再実行ではモジュールは読み込み直されないため、モジュール変数に持てばプロセスで1つになる。
+# （st.cache_resource は streamlit run 以外＝バッチ等では効かないので使わない）
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_sheets_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                cassette = get_cassette()
+                if cassette.replaying:
+                    # 再生時は記録した時のスプレッドシートの URL を使い、鍵（st.secrets）は読まない
+                    _pool = SheetsClientPool(None, cassette.meta.get("spreadsheet_url", ""), cassette=cassette)
+                else:
+                    cassette.set_meta("spreadsheet_url", st.secrets["spreadsheet_url"])
+                    _pool = SheetsClientPool(st.secrets["gcp_service_account"], st.secrets["spreadsheet_url"], cassette=cassette)
+    return _pool
+
+
+def get_worksheet(title=None):
+    return get_sheets_pool().worksheet(title)
+
+
+def get_or_create_worksheet(title, headers, rows=1000):
+    # 無ければシートを作り、1行目にヘッダーを書く（Blobs / Archive / Meta などの補助シート用）
+    try:
+        return get_worksheet(title)
+    except gspread.WorksheetNotFound:
+        pool = get_sheets_pool()
+        ws = pool.spreadsheet().add_worksheet(title=title, rows=rows, cols=len(headers))
+        ws.update("A1", [headers])
+        pool.invalidate(title)
+        return get_worksheet(title)
@@ -0,0 +1,2 @@
+from triage.index import BM25Index, tokenize
+from triage.engine import TriageEngine, get_triage_engine
@@ -0,0 +1,135 @@
+# ==========================================
+# 悩みのトリアージ（痛みの正体 ID と処方スキルの選定）をローカルで行う
+# ==========================================
+# 月次戦略会議の STEP 1 は、30 の痛みの正体（INTENT_ROUTING_DB）と 90 の極秘スキル（SECRET_SKILLS）から
+# 1つずつ選ぶためだけに Sonnet を1回呼んでいて、STEP 2 の生成が始まるまで数秒〜十数秒待たせていた。
+# ここでは辞書にすでにある文章（痛みの正体は名前・一言ラベル・原因ロジック・メタスキル、スキルは名前・説明・理論）から
+# triage.index の BM25 索引を作り、悩みの文章との近さで
+#   ・痛みの正体を順位付けし（1位が intent_id）
+#   ・スキルは「悩みとの近さ」に「上位の痛みの正体と同じルート（A〜F）か」を足して順位付けし、
+#     選んだ痛みの正体と同じルートのスキルだけから選ぶ（上位3つが候補）
+# 索引はプロセスで1回だけ作り、1回の判定は数ミリ秒で終わる。
+# 1位と2位の差が小さい・一致が少ない時は confident=False を返すので、呼び出し側は LLM の判定に回してよい。
+# 漢字・カタカナでの一致がほとんど無い時（ひらがなだけの悩み等）は signal=False を返すので、呼び出し側は
+# 設定に関わらず LLM の判定に回す。ひらがなでも全く当たらなければ intent_id は None になる。
+import threading
+
+from triage.index import BM25Index
+
+# 索引に入れる各欄の重み（名前・一言ラベルは本文より強く見る）
+INTENT_FIELD_WEIGHTS = {"label": 2.0, "name": 2.0, "logic": 1.0, "meta_skill": 0.5}
+SKILL_FIELD_WEIGHTS = {"name": 2.0, "desc": 1.0, "theory": 0.5}
+# スキルの点数に足す「上位の痛みの正体と同じルート」の重み（悩みとの近さは 1 位を 1 に正規化する）
+ROUTE_WEIGHT = 0.5
+# ルートの重みを決める上位の痛みの正体の数
+ROUTE_TOP_INTENTS = 5
+TOP_SKILLS = 3
+# ひらがなを除いた一致がこれより弱い、または 1 位と 2 位の差（1 位に対する割合）がこれより小さい時は自信なしとする
+# （短い悩み「締め切りに間に合わない」の 5 前後では、別の痛みの正体に当たっていることが多かった）
+MIN_INTENT_SCORE = 8.0
+MIN_INTENT_MARGIN = 0.1
+# ひらがなを除いた一致がこれより弱い時は、手掛かりが無いもの（signal=False）とする
+MIN_SIGNAL_SCORE = 1.0
+
+
+def _fields(data, weights, extra=None):
+    fields = [(data.get(name, ""), weight) for name, weight in weights.items() if data.get(name)]
+    if extra:
+        fields.append(extra)
+    return fields
+
+
+class TriageEngine:
+    def __init__(self, intents, skills, skill_routes=None, intent_labels=None):
+        # intents: INTENT_ROUTING_DB、skills: SECRET_SKILLS
+        # skill_routes: {スキルID: ルート記号}（痛みの正体 ID の先頭 "A-1" → "A" と同じ記号）
+        # intent_labels: {痛みの正体ID: 一言ラベル}（トリアージのプロンプトの選択肢と同じもの）
+        self.intent_ids = list(intents)
+        self.skill_ids = list(skills)
+        self.skill_routes = skill_routes or {}
+        intent_labels = intent_labels or {}
+        self._intents = BM25Index({
+            iid: _fields(data, INTENT_FIELD_WEIGHTS, (intent_labels.get(iid, ""), INTENT_FIELD_WEIGHTS["label"]))
+            for iid, data in intents.items()
+        })
+        self._skills = BM25Index({sid: _fields(data, SKILL_FIELD_WEIGHTS) for sid, data in skills.items()})
+
+    def rank_intents(self, text):
+        return self._intents.rank(text)
+
+    def _route_weights(self, ranked_intents):
+        # 上位の痛みの正体の点数を、ルートごとの割合（合計 1）にする
+        top = [(iid, score) for iid, score in ranked_intents[:ROUTE_TOP_INTENTS] if score > 0]
+        total = sum(score for _, score in top)
+        weights = {}
+        for iid, score in top:
+            route = _route(iid)
+            weights[route] = weights.get(route, 0.0) + score / total
+        return weights
+
+    def rank_skills(self, text, ranked_intents=None, exclude=(), route=None):
+        # route を渡すと、そのルートのスキルだけを順位付けする（そのルートに選べるスキルが無ければ全ルートから）
+        ranked_intents = ranked_intents if ranked_intents is not None else self.rank_intents(text)
+        route_weights = self._route_weights(ranked_intents)
+        raw = self._skills.scores(text)
+        best = max(raw.values(), default=0.0) or 1.0
+        allowed = [sid for sid in self.skill_ids if sid not in exclude]
+        if route is not None:
+            allowed = [sid for sid in allowed if self.skill_routes.get(sid) == route] or allowed
+        scored = [
+            (sid, raw[sid] / best + ROUTE_WEIGHT * route_weights.get(self.skill_routes.get(sid), 0.0))
+            for sid in allowed
+        ]
+        return sorted(scored, key=lambda kv: (-kv[1], kv[0]))
+
+    def pick_skill(self, text, intent_id, exclude=()):
+        # 痛みの正体（LLM の判定で決めた時など）と同じルートの中で、悩みに一番近いスキル
+        skills = self.rank_skills(text, exclude=exclude, route=_route(intent_id))
+        return skills[0][0] if skills else None
+
+    def classify(self, text, exclude_skills=()):
+        # exclude_skills: 選べないスキル（習得済み）。全部選べない時は呼び出し側で空にして渡す
+        intents = self.rank_intents(text)
+        top_score = intents[0][1] if intents else 0.0
+        second = intents[1][1] if len(intents) > 1 else 0.0
+        margin = (top_score - second) / top_score if top_score > 0 else 0.0
+        # 手掛かりの強さは、ひらがなの語（助詞・語尾に当たりやすい）を除いた一致で測る
+        content = self._intents.rank(text, hiragana_weight=0)
+        content_score = content[0][1] if content else 0.0
+        signal = content_score >= MIN_SIGNAL_SCORE
+        intent_id = intents[0][0] if intents and top_score >= MIN_SIGNAL_SCORE else None
+        skills = self.rank_skills(text, intents, exclude_skills, route=_route(intent_id))
+        candidates = [sid for sid, _ in skills[:TOP_SKILLS]]
+        return {
+            "intent_id": intent_id,
+            "selected_skill_id": candidates[0] if candidates else None,
+            "top3_candidates": candidates,
+            "intents": intents,
+            "skills": skills[:TOP_SKILLS],
+            "intent_margin": margin,
+            "signal": signal,
+            "content_score": content_score,
+            "confident": (
+                signal and content[0][0] == intent_id
+                and content_score >= MIN_INTENT_SCORE and margin >= MIN_INTENT_MARGIN
+            ),
+        }
+
+
+def _route(intent_id):
+    # 痛みの正体 ID "A-1" → ルート記号 "A"
+    return intent_id.split("-", 1)[0] if intent_id else None
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_triage_engine(intents, skills, skill_routes=None, intent_labels=None):
+    # 索引はプロセスで1回だけ作る（辞書は app.py の定数なので、実行中に変わらない）
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TriageEngine(intents, skills, skill_routes, intent_labels)
+    return _engine
@@ -0,0 +1,105 @@
+# ==========================================
+# 日本語の文字 n-gram による BM25 検索
+# ==========================================
+# 日本語は単語の区切りが無く、形態素解析の辞書も入れたくないので、文字 n-gram を語として数える。
+# 漢字・カタカナ・ひらがなはそれぞれのひと続きの中で n-gram を作る（漢字は 1〜3、カタカナ・ひらがなは 2〜3）。
+# ひらがなの n-gram は助詞・語尾でどの文書にも当たりやすいので、検索文の側で重みを下げて数える
+# （ひらがなだけで書かれた悩み「かれしからのれんらくがこない」等にも手掛かりを残すため）。英数字はひと続きを1語として扱う。
+import collections
+import math
+import re
+import unicodedata
+
+# 文字の種類ごとの n-gram の長さ
+KANJI_NGRAMS = (1, 2, 3)
+KATAKANA_NGRAMS = (2, 3)
+HIRAGANA_NGRAMS = (2, 3)
+# BM25 のパラメーター（一般的な既定値）。K3 は検索文の中で同じ語が何度も出た時の伸びを抑える
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_K3 = 8.0
+# 検索文のひらがなの語の重み（漢字・カタカナ・英数字は 1）
+HIRAGANA_QUERY_WEIGHT = 0.3
+
+_KANJI_RUN = re.compile(r"[一-鿿㐀-䶿々]+")
+_KATAKANA_RUN = re.compile(r"[゠-ヿー]+")
+_HIRAGANA_RUN = re.compile(r"[ぁ-ゟ]+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    # 全角英数・半角カナのゆれをそろえ、小文字にする
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def _ngrams(run, sizes):
+    grams = [run[i:i + n] for n in sizes for i in range(len(run) - n + 1)]
+    # 短いひと続き（「ー」だけ等）でも1語は残す
+    return grams or [run]
+
+
+def is_hiragana(token):
+    return bool(_HIRAGANA_RUN.fullmatch(token))
+
+
+def tokenize(text):
+    text = normalize(text)
+    tokens = []
+    for run in _KANJI_RUN.findall(text):
+        tokens.extend(_ngrams(run, KANJI_NGRAMS))
+    for run in _KATAKANA_RUN.findall(text):
+        tokens.extend(_ngrams(run, KATAKANA_NGRAMS))
+    for run in _HIRAGANA_RUN.findall(text):
+        tokens.extend(_ngrams(run, HIRAGANA_NGRAMS))
+    tokens.extend(_WORD.findall(text))
+    return tokens
+
+
+class BM25Index:
+    def __init__(self, docs, k1=BM25_K1, b=BM25_B, k3=BM25_K3):
+        # docs: {文書ID: 文字列 または (文字列, 重み) のリスト}。重みは語の出現回数に掛ける（名前を本文より重く見る等）
+        self.k1 = k1
+        self.b = b
+        self.k3 = k3
+        self._tf = {}
+        self._length = {}
+        df = collections.Counter()
+        for doc_id, fields in docs.items():
+            if isinstance(fields, str):
+                fields = [(fields, 1.0)]
+            tf = collections.Counter()
+            for text, weight in fields:
+                for token in tokenize(text):
+                    tf[token] += weight
+            self._tf[doc_id] = tf
+            self._length[doc_id] = sum(tf.values())
+            df.update(tf.keys())
+        n = len(docs)
+        self._avg_length = (sum(self._length.values()) / n) if n else 0.0
+        self._idf = {t: math.log(1 + (n - c + 0.5) / (c + 0.5)) for t, c in df.items()}
+        self._postings = collections.defaultdict(list)
+        for doc_id, tf in self._tf.items():
+            for token, count in tf.items():
+                self._postings[token].append((doc_id, count))
+
+    def scores(self, query, hiragana_weight=HIRAGANA_QUERY_WEIGHT):
+        # 全文書のスコア {文書ID: スコア}（一致が無い文書は 0）。hiragana_weight=0 ならひらがなの語を数えない
+        result = dict.fromkeys(self._tf, 0.0)
+        for token, qtf in collections.Counter(tokenize(query)).items():
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            query_weight = qtf * (self.k3 + 1) / (qtf + self.k3)
+            if is_hiragana(token):
+                if not hiragana_weight:
+                    continue
+                query_weight *= hiragana_weight
+            for doc_id, tf in self._postings[token]:
+                norm = self.k1 * (1 - self.b + self.b * self._length[doc_id] / (self._avg_length or 1))
+                result[doc_id] += idf * query_weight * tf * (self.k1 + 1) / (tf + norm)
+        return result
+
+    def rank(self, query, limit=None, hiragana_weight=HIRAGANA_QUERY_WEIGHT):
+        # スコアの高い順の [(文書ID, スコア)]。同点は ID 順
+        ranked = sorted(self.scores(query, hiragana_weight).items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:limit] if limit else ranked